@@ -1,150 +1,135 @@
 """
 리뷰 데이터 분석 스크립트
+
+reviews 테이블을 Parquet 데이터셋으로 증분 export한 뒤(export_reviews.py와 동일),
+삭제/재분석으로 DB와 달라진 데이터셋은 전체 재export해 DB 기준으로 맞추고
+컬럼 단위 스트리밍 분석 엔진(app/services/review_analytics.py)으로 한 번의 스캔에 집계합니다.
+리뷰가 수백만 개여도 메모리는 영화/기간 수에만 비례합니다.
+
+실행 방법:
+python analyze_reviews.py
+python analyze_reviews.py --freq week --start 2024-01-01 --end 2024-07-01
+python analyze_reviews.py --movie 1 --movie 2 --no-export
 """
-import sqlite3
-import json
+
+import argparse
+import os
+import sys
+import time
 from pathlib import Path
-from collections import Counter
-
-# 데이터베이스 연결
-db_path = Path("backend/movie_reviews.db")
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
-
-# 리뷰 데이터 가져오기
-query = """
-SELECT 
-    r.id,
-    r.movie_id,
-    m.title as movie_title,
-    r.author_name,
-    r.content,
-    r.sentiment_score,
-    r.sentiment_label,
-    r.confidence,
-    r.aspect_sentiments,
-    r.emotions,
-    r.created_at
-FROM reviews r
-LEFT JOIN movies m ON r.movie_id = m.id
-ORDER BY r.created_at DESC
-"""
 
-cursor.execute(query)
-reviews = cursor.fetchall()
-columns = [desc[0] for desc in cursor.description]
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)  # 상대 경로 설정(DATABASE_URL, REVIEW_EXPORT_PATH)을 백엔드 기준으로
 
-# 딕셔너리 리스트로 변환
-data = [dict(zip(columns, row)) for row in reviews]
+from app.database import SessionLocal, init_db
+from app.services.review_analytics import ReviewAnalytics, build_filter
+from app.services.review_export import ReviewExporter
 
-print("=" * 80)
-print("📊 영화 리뷰 분석 리포트")
-print("=" * 80)
 
-print(f"\n📝 총 리뷰 개수: {len(data)}개")
+def format_stats(stats):
+    return (
+        f"  - 평균: {stats['mean']:.3f}\n"
+        f"  - 표준편차: {stats['std']:.3f}\n"
+        f"  - 최대: {stats['max']:.3f}\n"
+        f"  - 최소: {stats['min']:.3f}\n"
+        f"  - 백분위수: " + ", ".join(f"{name}={value:.3f}" for name, value in stats["percentiles"].items())
+    )
+
+
+def print_report(report, freq):
+    summary = report["summary"]
+    total = summary["count"]
+
+    print("=" * 80)
+    print("📊 영화 리뷰 분석 리포트")
+    print("=" * 80)
+
+    print(f"\n📝 총 리뷰 개수: {total:,}개")
+
+    if total == 0:
+        print("\n⚠️ 아직 작성된 리뷰가 없습니다.")
+        print("💡 Streamlit 앱에서 '리뷰 작성' 페이지를 통해 리뷰를 작성해보세요!")
+        return
 
-if len(data) > 0:
     print("\n" + "=" * 80)
     print("1️⃣ 감성 분석 통계")
     print("=" * 80)
-    
-    # 감성 라벨 분포
+
     print("\n🏷️ 감성 분류 분포:")
-    sentiment_labels = [r['sentiment_label'] for r in data]
-    sentiment_counts = Counter(sentiment_labels)
-    for label, count in sentiment_counts.most_common():
-        percentage = (count / len(data)) * 100
-        print(f"  - {label}: {count}개 ({percentage:.1f}%)")
-    
-    # 감성 점수 통계
-    scores = [r['sentiment_score'] for r in data]
-    print("\n📈 감성 점수 통계 (-1.0 ~ 1.0):")
-    print(f"  - 평균: {sum(scores)/len(scores):.3f}")
-    print(f"  - 최대: {max(scores):.3f}")
-    print(f"  - 최소: {min(scores):.3f}")
-    
-    # 표준편차 계산
-    mean_score = sum(scores) / len(scores)
-    variance = sum((x - mean_score) ** 2 for x in scores) / len(scores)
-    std_dev = variance ** 0.5
-    print(f"  - 표준편차: {std_dev:.3f}")
-    
-    # 신뢰도 통계
-    confidences = [r['confidence'] for r in data]
-    print("\n🎯 AI 분석 신뢰도:")
-    print(f"  - 평균 신뢰도: {sum(confidences)/len(confidences):.3f}")
-    print(f"  - 최고 신뢰도: {max(confidences):.3f}")
-    print(f"  - 최저 신뢰도: {min(confidences):.3f}")
-    
+    for label, count in summary["labels"].items():
+        print(f"  - {label}: {count:,}개 ({count / total * 100:.1f}%)")
+
+    if summary["sentiment_score"]["count"]:
+        print("\n📈 감성 점수 통계 (-1.0 ~ 1.0):")
+        print(format_stats(summary["sentiment_score"]))
+
+    if summary["confidence"]["count"]:
+        print("\n🎯 AI 분석 신뢰도:")
+        print(format_stats(summary["confidence"]))
+
     print("\n" + "=" * 80)
     print("2️⃣ 영화별 리뷰 통계")
     print("=" * 80)
-    
-    # 영화별 통계 계산
-    movie_stats = {}
-    for review in data:
-        title = review['movie_title']
-        if title not in movie_stats:
-            movie_stats[title] = {
-                'count': 0,
-                'scores': [],
-                'confidences': []
-            }
-        movie_stats[title]['count'] += 1
-        movie_stats[title]['scores'].append(review['sentiment_score'])
-        movie_stats[title]['confidences'].append(review['confidence'])
-    
+
     print("\n🎬 영화별 요약:")
-    print(f"{'영화 제목':<30} {'리뷰 수':>8} {'평균 감성점수':>15} {'평균 신뢰도':>12}")
-    print("-" * 70)
-    
-    # 리뷰 수로 정렬
-    sorted_movies = sorted(movie_stats.items(), key=lambda x: x[1]['count'], reverse=True)
-    for title, stats in sorted_movies:
-        avg_score = sum(stats['scores']) / len(stats['scores'])
-        avg_conf = sum(stats['confidences']) / len(stats['confidences'])
-        print(f"{title:<30} {stats['count']:>8} {avg_score:>15.3f} {avg_conf:>12.3f}")
+    print(f"{'영화 제목':<30} {'리뷰 수':>8} {'평균 감성점수':>15} {'표준편차':>10} {'평균 신뢰도':>12} {'긍정 비율':>10}")
+    print("-" * 92)
+    for row in report["movies"].itertuples():
+        print(
+            f"{str(row.title):<30} {row.reviews:>8,} {row.avg_sentiment:>15.3f} "
+            f"{row.std_sentiment:>10.3f} {row.avg_confidence:>12.3f} {row.positive_ratio:>10.1%}"
+        )
 
-    
     print("\n" + "=" * 80)
-    print("3️⃣ 샘플 리뷰 (최근 5개)")
+    print("3️⃣ 측면별 / 감정별 분포")
     print("=" * 80)
-    
-    for row in data[:5]:
+
+    aspects = report["aspects"][report["aspects"]["count"] > 0]
+    if not aspects.empty:
+        print("\n🔍 측면별 감성 (ABSA):")
+        for row in aspects.itertuples():
+            print(f"  - {row.name:<15} {row.count:>10,}개  평균 {row.mean:+.3f}  중앙값 {row.p50:+.3f}  (p5 {row.p5:+.3f} ~ p95 {row.p95:+.3f})")
+
+    emotions = report["emotions"][report["emotions"]["count"] > 0]
+    if not emotions.empty:
+        print("\n😊 감정 분석:")
+        for row in emotions.itertuples():
+            print(f"  - {row.name:<10} 평균 {row.mean:.3f}  중앙값 {row.p50:.3f}  대표 감정 {row.dominant:>8,}개")
+
+    print("\n" + "=" * 80)
+    print(f"4️⃣ 기간별 추이 ({freq})")
+    print("=" * 80)
+
+    print(f"\n{'기간':<12} {'리뷰 수':>10} {'평균 감성점수':>15} {'긍정':>8} {'부정':>8} {'중립':>8}")
+    print("-" * 66)
+    for row in report["timeseries"].itertuples():
+        print(f"{row.period:<12} {row.reviews:>10,} {row.avg_sentiment:>15.3f} {row.positive:>8,} {row.negative:>8,} {row.neutral:>8,}")
+
+    print("\n" + "=" * 80)
+    print("5️⃣ 샘플 리뷰 (최근 5개)")
+    print("=" * 80)
+
+    for row in report["latest"].to_dict("records"):
+        content = row["content"] or ""
         print(f"\n[리뷰 #{row['id']}]")
         print(f"영화: {row['movie_title']}")
         print(f"작성자: {row['author_name']}")
-        print(f"내용: {row['content'][:100]}{'...' if len(row['content']) > 100 else ''}")
+        print(f"내용: {content[:100]}{'...' if len(content) > 100 else ''}")
         print(f"감성: {row['sentiment_label']} (점수: {row['sentiment_score']:.3f}, 신뢰도: {row['confidence']:.3f})")
-        
-        # Aspect sentiments 파싱
-        if row['aspect_sentiments']:
-            try:
-                aspects = json.loads(row['aspect_sentiments'])
-                if aspects:
-                    print("측면별 감성:", end=" ")
-                    for aspect, score in aspects.items():
-                        if score != 0.0:
-                            print(f"{aspect}={score:.2f}", end=" ")
-                    print()
-            except:
-                pass
-        
-        # Emotions 파싱
-        if row['emotions']:
-            try:
-                emotions = json.loads(row['emotions'])
-                if emotions:
-                    print("감정 분석:", end=" ")
-                    for emotion, score in emotions.items():
-                        if score > 0.1:
-                            print(f"{emotion}={score:.2f}", end=" ")
-                    print()
-            except:
-                pass
-    
+
+        aspects = {k: v for k, v in (row["aspects"] or {}).items() if v is not None and v != 0.0}
+        if aspects:
+            print("측면별 감성:", " ".join(f"{k}={v:.2f}" for k, v in aspects.items()))
+
+        emotions = {k: v for k, v in (row["emotions"] or {}).items() if v is not None and v > 0.1}
+        if emotions:
+            print("감정 분석:", " ".join(f"{k}={v:.2f}" for k, v in emotions.items()))
+
     print("\n" + "=" * 80)
-    print("4️⃣ AI 분석 방식 설명")
+    print("6️⃣ AI 분석 방식 설명")
     print("=" * 80)
     
     print("""
@@ -171,12 +156,62 @@ if len(data) > 0:
   → 사용자가 필요에 따라 선택적으로 활성화 가능
 """)
 
-else:
-    print("\n⚠️ 아직 작성된 리뷰가 없습니다.")
-    print("💡 Streamlit 앱에서 '리뷰 작성' 페이지를 통해 리뷰를 작성해보세요!")
 
-conn.close()
+def check_export(exporter, db):
+    """--no-export: 기존 Parquet가 reviews 테이블과 다르면 경고"""
+    from sqlalchemy import func, select
+    from app.models import Review
+
+    manifest = exporter.load_manifest()
+    if manifest is None:
+        print("⚠️ export된 데이터셋이 없거나 스키마가 바뀌었습니다. --no-export 없이 실행하세요.\n")
+        return
+
+    drift = exporter.detect_drift(db, manifest)
+    newer = db.execute(select(func.count(Review.id)).where(Review.id > manifest["last_review_id"])).scalar()
+    if drift or newer:
+        print("⚠️ Parquet 데이터셋이 DB와 다릅니다 (리포트가 오래된 데이터 기준):")
+        if drift:
+            print(f"  - {drift}")
+        if newer:
+            print(f"  - export 안 된 새 리뷰 {newer:,}개")
+        print("💡 --no-export 없이 실행하면 DB 기준으로 다시 맞춥니다.\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영화 리뷰 분석 리포트")
+    parser.add_argument("--freq", choices=["day", "week", "month"], default="month", help="기간별 추이 단위")
+    parser.add_argument("--movie", type=int, action="append", help="특정 영화만 (여러 번 지정 가능)")
+    parser.add_argument("--start", help="시작일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--end", help="종료일 (YYYY-MM-DD, 미포함)")
+    parser.add_argument("--no-export", action="store_true", help="DB에서 새 리뷰를 export하지 않고 기존 Parquet만 분석")
+    args = parser.parse_args()
+
+    exporter = ReviewExporter()
+    init_db()
+    db = SessionLocal()
+    try:
+        if args.no_export:
+            check_export(exporter, db)
+        else:
+            exported = exporter.export(db)
+            if exported["drift"]:
+                print(f"🔄 DB와 달라져 전체 재export: {exported['drift']}")
+            print(f"📤 새 리뷰 {exported['reviews']:,}개 export ({exported['seconds']:.2f}초)\n")
+    finally:
+        db.close()
+
+    start = time.time()
+    analytics = ReviewAnalytics(exporter.reviews_path)
+    report = analytics.report(freq=args.freq, filter=build_filter(args.movie, args.start, args.end))
+    elapsed = time.time() - start
+
+    print_report(report, args.freq)
+
+    print("\n" + "=" * 80)
+    print(f"✅ 분석 완료! ({report['summary']['count']:,}개 리뷰, {elapsed:.2f}초)")
+    print("=" * 80)
+
 
-print("\n" + "=" * 80)
-print("✅ 분석 완료!")
-print("=" * 80)
+if __name__ == "__main__":
+    main()
@@ -2,26 +2,211 @@
 데이터베이스 연결 및 세션 관리
 """
 
-from sqlalchemy import create_engine
+import random
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
 
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    import greenlet  # noqa: F401  (SQLAlchemy asyncio 필수 의존성)
+    ASYNC_DB_AVAILABLE = True
+except ImportError:
+    ASYNC_DB_AVAILABLE = False
+
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+# 인메모리 DB는 연결마다 별도 DB라 읽기 전용 엔진을 따로 둘 수 없음
+IS_FILE_SQLITE = IS_SQLITE and ":memory:" not in settings.DATABASE_URL and settings.DATABASE_URL not in ("sqlite://", "sqlite:///")
+
 # 데이터베이스 엔진 생성
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
     pool_pre_ping=True,
     echo=settings.DEBUG
 )
 
+
+def apply_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    """SQLite 성능 프로필 (WAL, synchronous, busy_timeout, cache, mmap, temp_store)"""
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL and IS_FILE_SQLITE:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _sqlite_on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection)
+
+
+# 읽기 엔진 (GET 라우트용 별도 연결 풀)
+# - DATABASE_REPLICA_URLS가 있으면 복제본마다 엔진 하나 (요청마다 무작위 선택)
+# - 없으면 primary 파일을 query_only 연결로 읽음
+#   (SQLite WAL에서는 쓰기 트랜잭션이 진행 중이어도 이 풀의 연결로 바로 읽을 수 있음)
+REPLICA_URLS = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+
+def _sqlite_read_on_connect(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection, read_only=True)
+
+
+def create_read_engine(url: str):
+    """읽기 전용 엔진 (SQLite면 query_only 연결)"""
+    is_sqlite = url.startswith("sqlite")
+    new_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        pool_size=settings.DB_READ_POOL_SIZE,
+        pool_pre_ping=True,
+        echo=settings.DEBUG
+    )
+    if is_sqlite:
+        event.listen(new_engine, "connect", _sqlite_read_on_connect)
+    return new_engine
+
+
+if REPLICA_URLS:
+    read_engines = [create_read_engine(url) for url in REPLICA_URLS]
+elif IS_FILE_SQLITE:
+    read_engines = [create_read_engine(settings.DATABASE_URL)]
+else:
+    read_engines = [engine]
+read_engine = read_engines[0]
+
+
+class RoutingSession(Session):
+    """
+    읽기는 복제본, 쓰기는 primary로 보내는 세션
+    
+    복제본은 세션에서 처음 읽을 때 하나를 골라 끝까지 같은 것을 씁니다.
+    flush나 INSERT/UPDATE/DELETE가 한 번이라도 일어나면 세션이 끝날 때까지 primary에 고정되어
+    같은 세션에서 방금 쓴 데이터를 (복제 지연 없이) 다시 읽을 수 있습니다.
+    info["primary"] = True로 처음부터 고정할 수도 있습니다 (쓰기 직후 요청, is_primary_pinned).
+    """
+    primary_engine = engine
+    replica_engines = read_engines
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("primary") or self._flushing or getattr(clause, "is_dml", False):
+            self.info["primary"] = True
+            return self.primary_engine
+        # 복제본은 세션마다 한 번만 고름 (ETag 버전과 본문을 같은 복제본에서 읽도록)
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = random.choice(self.replica_engines)
+        return replica
+
+
 # 세션 팩토리
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=RoutingSession)
+
+
+def async_database_url(url: str) -> str:
+    """동기 URL → 비동기 드라이버 URL (sqlite → aiosqlite, postgresql → asyncpg)"""
+    scheme, sep, rest = url.partition("://")
+    driver = {
+        "sqlite": "sqlite+aiosqlite",
+        "postgres": "postgresql+asyncpg",
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+    }.get(scheme, scheme)
+    return f"{driver}{sep}{rest}"
+
+
+class AsyncBridgeSession(RoutingSession):
+    """AsyncSession 내부의 동기 세션 (복제본 라우팅은 비동기 엔진의 sync_engine으로)"""
+
+
+# 비동기 엔진 (async def 라우트용 - 쿼리 중에 이벤트 루프를 막지 않음)
+# 드라이버(aiosqlite / asyncpg)가 없으면 None이고 get_async_db 사용 시 오류
+async_engine = None
+AsyncSessionLocal = None
+if ASYNC_DB_AVAILABLE:
+    try:
+        async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL),
+            pool_pre_ping=True,
+            echo=settings.DEBUG,
+            **({"pool_size": settings.DB_ASYNC_POOL_SIZE, "max_overflow": settings.DB_ASYNC_POOL_SIZE} if IS_FILE_SQLITE or not IS_SQLITE else {})
+        )
+    except ImportError as e:
+        print(f"⚠️ Async DB driver not installed ({e}). Async routes disabled.")
+    else:
+        if IS_SQLITE:
+            @event.listens_for(async_engine.sync_engine, "connect")
+            def _sqlite_async_on_connect(dbapi_connection, connection_record):
+                apply_sqlite_pragmas(dbapi_connection)
+
+        # 복제본: 비동기 읽기 엔진 (없으면 primary 비동기 엔진에서 읽음)
+        async_read_engines = []
+        for url in REPLICA_URLS:
+            async_read_engine = create_async_engine(
+                async_database_url(url),
+                pool_size=settings.DB_ASYNC_POOL_SIZE,
+                max_overflow=settings.DB_ASYNC_POOL_SIZE,
+                pool_pre_ping=True,
+                echo=settings.DEBUG
+            )
+            if url.startswith("sqlite"):
+                event.listen(async_read_engine.sync_engine, "connect", _sqlite_read_on_connect)
+            async_read_engines.append(async_read_engine)
+
+        AsyncBridgeSession.primary_engine = async_engine.sync_engine
+        AsyncBridgeSession.replica_engines = [e.sync_engine for e in async_read_engines] or [async_engine.sync_engine]
+
+        AsyncSessionLocal = async_sessionmaker(
+            autoflush=False,
+            expire_on_commit=False,
+            sync_session_class=AsyncBridgeSession
+        )
 
 # Base 클래스
 Base = declarative_base()
 
 
+# 테이블 변경 시 커밋 후 table_versions 증가 (HTTP ETag 계산용, services/http_cache)
+@event.listens_for(SessionLocal, "after_flush")
+@event.listens_for(RoutingSession, "after_flush")
+def _bump_table_versions(session, flush_context):
+    from .services.http_cache import on_after_flush
+    on_after_flush(session, flush_context)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _bump_table_versions_dml(orm_execute_state):
+    from .services.http_cache import on_orm_execute
+    return on_orm_execute(orm_execute_state)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(RoutingSession, "after_commit")
+def _bump_table_versions_commit(session):
+    from .services.http_cache import on_after_commit
+    on_after_commit(session)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _discard_table_versions(session, transaction):
+    from .services.http_cache import on_after_transaction_end
+    on_after_transaction_end(session, transaction)
+
+
 # 의존성: DB 세션 가져오기
 def get_db():
     """
@@ -41,10 +226,77 @@ def get_db():
         db.close()
 
 
+# Read-your-writes: 쓰기 요청 응답에 쿠키를 남겨 REPLICA_PIN_SECONDS 동안 그 클라이언트의 읽기를 primary로
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+
+def pin_primary(response: Response):
+    """쓰기 직후 응답에 primary 고정 쿠키 설정 (복제본이 있을 때만, main.py 미들웨어에서 호출)"""
+    if REPLICA_URLS:
+        until = time.time() + settings.REPLICA_PIN_SECONDS
+        response.set_cookie(PRIMARY_PIN_COOKIE, f"{until:.3f}", max_age=int(settings.REPLICA_PIN_SECONDS) + 1, httponly=True)
+
+
+def is_primary_pinned(request: Request) -> bool:
+    """이 요청이 최근 쓰기를 한 클라이언트에서 왔는지 (복제 지연 동안 primary에서 읽어야 함)"""
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_db(request: Request):
+    """
+    읽기 전용 DB 세션 (GET 라우트용)
+    
+    쓰기용 연결 풀과 분리되어 있어 대량 쓰기 중에도 읽기 요청이 연결을 기다리지 않습니다.
+    복제본이 설정되어 있으면 복제본에서 읽고, 최근 쓰기를 한 클라이언트는 primary에서 읽습니다.
+    SQLite에서는 query_only 연결이라 실수로 쓰기를 시도하면 오류가 납니다.
+    """
+    db = ReadSessionLocal()
+    if is_primary_pinned(request):
+        db.info["primary"] = True
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    비동기 DB 세션 (async def 라우트용)
+    
+    읽기는 복제본, 쓰기는 primary (RoutingSession). 최근 쓰기를 한 클라이언트는 처음부터 primary.
+    
+    사용 예시:
+    ```python
+    @app.get("/movies")
+    async def get_movies(db: AsyncSession = Depends(get_async_db)):
+        return (await db.scalars(select(Movie))).all()
+    ```
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database driver is not installed (pip install aiosqlite asyncpg greenlet)")
+    async with AsyncSessionLocal() as db:
+        if is_primary_pinned(request):
+            db.sync_session.info["primary"] = True
+        yield db
+
+
 # 데이터베이스 초기화
 def init_db():
     """
-    애플리케이션 시작 시 테이블 생성
+    애플리케이션 시작 시 테이블 생성 + 미적용 마이그레이션 실행
+    
+    RUN_MIGRATIONS_ON_STARTUP=False면 테이블만 만들고 마이그레이션은 migrate.py에 맡깁니다.
     """
+    from .migrations import migration_status, run_migrations
+    
     Base.metadata.create_all(bind=engine)
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        run_migrations(engine)
+    else:
+        pending = [m["version"] for m in migration_status(engine) if m["applied_at"] is None]
+        if pending:
+            print(f"⚠️  Pending migrations {pending} (run: python migrate.py)")
     print("✅ Database initialized")
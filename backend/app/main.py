@@ -6,15 +6,16 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import time
+import asyncio
 
 from .config import settings, print_config
-from .database import init_db
+from .database import init_db, pin_primary
 
 # Routers (추후 생성)
 # from .routers import movies, reviews, ratings, recommendations
 
 # 라우터 import
-from .routers import movies, reviews, recommendations
+from .routers import movies, reviews, recommendations, interactions, stats
 from .routers import settings as settings_router
 
 
@@ -49,12 +50,30 @@ async def startup_event():
     # 데이터베이스 초기화
     init_db()
     
+    # 추천 캐시 예열 (백그라운드)
+    if settings.ENABLE_RECOMMENDATION_CACHE:
+        asyncio.create_task(warm_recommendation_cache())
+    
     # AI 모델 로딩 (lazy loading - 첫 요청 시)
     print("\n✅ Application started successfully!")
     print(f"📚 API Docs: http://localhost:8000/docs")
     print("=" * 70 + "\n")
 
 
+async def warm_recommendation_cache():
+    """활성 사용자 추천 캐시를 주기적으로 예열"""
+    from .services.recommendation_cache import warm_active_users
+    
+    while True:
+        try:
+            warmed = await asyncio.to_thread(warm_active_users)
+            if warmed:
+                print(f"🔥 Recommendation cache warmed for {warmed} users")
+        except Exception as e:
+            print(f"⚠️  Recommendation cache warm-up failed: {e}")
+        await asyncio.sleep(settings.RECOMMENDATION_CACHE_WARM_INTERVAL)
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시"""
@@ -71,6 +90,15 @@ async def add_process_time_header(request, call_next):
     return response
 
 
+# Middleware: 쓰기 후 읽기 복제본 대신 primary에서 읽도록 고정 (read-your-writes)
+@app.middleware("http")
+async def pin_primary_after_write(request, call_next):
+    response = await call_next(request)
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        pin_primary(response)
+    return response
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -111,6 +139,8 @@ async def get_config():
 app.include_router(movies.router, prefix="/api/movies", tags=["Movies"])
 app.include_router(reviews.router, prefix="/api/reviews", tags=["Reviews"])
 app.include_router(recommendations.router, prefix="/api/recommendations", tags=["Recommendations"])
+app.include_router(interactions.router, prefix="/api/interactions", tags=["Interactions"])
+app.include_router(stats.router, prefix="/api/stats", tags=["Stats"])
 app.include_router(settings_router.router, prefix="/api/settings", tags=["Settings"])
 
 
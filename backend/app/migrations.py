@@ -0,0 +1,223 @@
+"""
+스키마/데이터 마이그레이션
+
+create_all()은 기존 테이블에 컬럼을 추가하거나 데이터를 변환하지 않으므로,
+변경 사항을 버전 번호가 붙은 함수로 작성해 순서대로 한 번씩 적용합니다.
+적용 기록은 schema_migrations 테이블에 남습니다.
+
+새 마이그레이션은 MIGRATIONS 끝에 (다음 버전, 이름, 함수)로 추가하세요.
+함수는 중간에 실패해도 다시 실행할 수 있어야 합니다.
+
+대량 데이터 변환은 backfill()로 작성합니다:
+- id 순서로 MIGRATION_BATCH_SIZE개씩 읽어 변환 → 배치마다 커밋 (한 번에 테이블 전체를 잠그지 않음)
+- 배치와 같은 트랜잭션에 체크포인트(migration_checkpoints) 저장 → 중단되면 다음 실행 때 이어서
+- MIGRATION_BATCH_PAUSE_MS만큼 배치 사이에 쉬어 운영 중인 서버의 쓰기에 양보
+
+수백만 행 백필은 RUN_MIGRATIONS_ON_STARTUP=False로 두고 migrate.py로 따로 실행하세요.
+"""
+
+import time
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import bindparam, func, insert, inspect, null, select, text, update
+
+from .config import settings
+from .database import engine as default_engine
+from .models import GraphNode, Interaction, MigrationCheckpoint, Rating, Review, SchemaMigration, User
+from .services.embedding_store import encode_embedding
+
+PROGRESS_INTERVAL = 5.0  # 백필 진행 상황 출력 간격 (초)
+
+
+def add_column(conn, model, column_name: str):
+    """모델에 정의된 컬럼이 테이블에 없으면 추가"""
+    table = model.__table__
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    if column_name in existing:
+        return
+
+    column_type = table.c[column_name].type.compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_name} {column_type}"))
+    conn.commit()
+
+
+def add_index(conn, model, index_name: str):
+    """모델에 정의된 인덱스가 테이블에 없으면 생성"""
+    index = next(index for index in model.__table__.indexes if index.name == index_name)
+    index.create(conn, checkfirst=True)
+    conn.commit()
+
+
+def backfill(
+    conn,
+    name: str,
+    table,
+    columns: List,
+    apply: Callable[[object, List], int],
+    where=None,
+    batch_size: int = None
+) -> int:
+    """
+    배치 백필 (id 키셋 페이지네이션 + 배치별 커밋 + 체크포인트)
+
+    Args:
+        name: 체크포인트 이름 (마이그레이션 안에서 고유하게, 예: "embedding_blobs:users")
+        table: 대상 테이블 (정수 id 기본 키)
+        columns: id와 함께 읽을 컬럼
+        apply: apply(conn, rows) → 이번 배치에서 변환한 행 수 (커밋은 backfill이 함)
+        where: 추가 조건 (변환이 필요한 행만)
+
+    Returns:
+        변환한 행 수 (이전 실행에서 처리한 행 포함)
+    """
+    batch_size = batch_size or settings.MIGRATION_BATCH_SIZE
+    pause = settings.MIGRATION_BATCH_PAUSE_MS / 1000
+    checkpoints = MigrationCheckpoint.__table__
+
+    checkpoint = conn.execute(select(checkpoints).where(checkpoints.c.name == name)).first()
+    if checkpoint is None:
+        conn.execute(insert(checkpoints).values(name=name, last_id=0, rows_done=0))
+        conn.commit()
+        last_id, done = 0, 0
+    else:
+        last_id, done = checkpoint.last_id, checkpoint.rows_done
+        print(f"  - {name}: resuming after id {last_id:,} ({done:,} rows done)")
+
+    max_id = conn.execute(select(func.max(table.c.id))).scalar() or 0
+    query = select(table.c.id, *columns).order_by(table.c.id).limit(batch_size)
+    if where is not None:
+        query = query.where(where)
+
+    start = reported = time.time()
+    while True:
+        rows = conn.execute(query.where(table.c.id > last_id)).all()
+        if not rows:
+            break
+
+        done += apply(conn, rows)
+        last_id = rows[-1].id
+        conn.execute(
+            update(checkpoints).where(checkpoints.c.name == name).values(last_id=last_id, rows_done=done)
+        )
+        conn.commit()
+
+        if time.time() - reported >= PROGRESS_INTERVAL:
+            reported = time.time()
+            print(f"  - {name}: {done:,} rows, id {last_id:,}/{max_id:,} ({last_id / max(max_id, 1):.0%}) "
+                  f"- {done / (reported - start):,.0f} rows/s")
+        if pause:
+            time.sleep(pause)
+
+    return done
+
+
+def convert_json_embeddings(conn, model, batch_size: int = None) -> int:
+    """
+    JSON embedding → embedding_blob 변환 후 JSON 컬럼 비우기
+
+    Returns:
+        변환한 행 수
+    """
+    table = model.__table__
+    convert = update(table).where(table.c.id == bindparam("row_id")).values(
+        embedding_blob=bindparam("blob"), embedding=null()
+    )
+
+    def apply(conn, rows):
+        # JSON null('null')로 저장된 행도 SQL NULL로 정리
+        conn.execute(convert, [
+            {"row_id": row.id, "blob": encode_embedding(row.embedding)}
+            for row in rows
+        ])
+        return sum(row.embedding is not None for row in rows)
+
+    return backfill(
+        conn, f"embedding_blobs:{table.name}", table, [table.c.embedding], apply,
+        where=table.c.embedding.isnot(None), batch_size=batch_size
+    )
+
+
+def _001_embedding_blobs(conn):
+    """User/GraphNode 임베딩: JSON 컬럼 → 바이너리 BLOB"""
+    for model in (User, GraphNode):
+        add_column(conn, model, "embedding_blob")
+        converted = convert_json_embeddings(conn, model)
+        if converted:
+            print(f"  - {model.__tablename__}: {converted:,} embeddings converted")
+
+
+def _002_composite_indexes(conn):
+    """핫 쿼리용 복합 인덱스 (영화별 리뷰 목록, 인기 영화, 사용자별 최근 상호작용)"""
+    for model, index_name in (
+        (Review, "ix_reviews_movie_id_created_at"),
+        (Rating, "ix_ratings_avg_sentiment_review_count"),
+        (Rating, "ix_ratings_review_count"),
+        (Interaction, "ix_interactions_user_id_created_at"),
+    ):
+        add_index(conn, model, index_name)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "embedding_blobs", _001_embedding_blobs),
+    (2, "composite_indexes", _002_composite_indexes),
+]
+
+
+def run_migrations(engine=None) -> List[int]:
+    """
+    아직 적용되지 않은 마이그레이션 실행
+
+    Returns:
+        이번에 적용한 버전 목록
+    """
+    engine = engine or default_engine
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    MigrationCheckpoint.__table__.create(engine, checkfirst=True)
+
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(SchemaMigration.version)).scalars())
+
+    newly_applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+
+        with engine.connect() as conn:
+            migrate(conn)
+            conn.execute(insert(SchemaMigration.__table__).values(version=version, name=name))
+            conn.commit()
+
+        print(f"✅ Migration {version:03d} ({name}) applied")
+        newly_applied.append(version)
+
+    return newly_applied
+
+
+def migration_status(engine=None) -> List[Dict]:
+    """
+    마이그레이션별 적용 여부와 백필 진행 상황 (migrate.py --status)
+
+    Returns:
+        [{"version", "name", "applied_at"(미적용이면 None), "checkpoints": [{"name", "last_id", "rows_done"}]}]
+        체크포인트는 이름이 "마이그레이션 이름:"으로 시작하는 것
+    """
+    engine = engine or default_engine
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    MigrationCheckpoint.__table__.create(engine, checkfirst=True)
+
+    with engine.connect() as conn:
+        applied = dict(conn.execute(select(SchemaMigration.version, SchemaMigration.applied_at)).all())
+        checkpoints = conn.execute(select(MigrationCheckpoint.__table__)).all()
+
+    return [
+        {
+            "version": version,
+            "name": name,
+            "applied_at": applied.get(version),
+            "checkpoints": [
+                {"name": checkpoint.name, "last_id": checkpoint.last_id, "rows_done": checkpoint.rows_done}
+                for checkpoint in checkpoints if checkpoint.name.startswith(f"{name}:")
+            ],
+        }
+        for version, name, _ in MIGRATIONS
+    ]
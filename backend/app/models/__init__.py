@@ -2,7 +2,7 @@
 SQLAlchemy 데이터베이스 모델
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -35,6 +35,9 @@ class Movie(Base):
 class Review(Base):
     """리뷰 모델"""
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_movie_id_created_at", "movie_id", "created_at"),  # 영화별 최신 리뷰 목록
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False, index=True)
@@ -71,6 +74,10 @@ class Review(Base):
 class Rating(Base):
     """영화 평점 통계"""
     __tablename__ = "ratings"
+    __table_args__ = (
+        Index("ix_ratings_avg_sentiment_review_count", "avg_sentiment", "review_count"),  # 인기 영화 (평점, 리뷰 수 순)
+        Index("ix_ratings_review_count", "review_count"),  # 리뷰 많은 순
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False, unique=True, index=True)
@@ -104,7 +111,8 @@ class User(Base):
     email = Column(String(100), unique=True, index=True)
     
     # 사용자 임베딩 (추천 시스템)
-    embedding = Column(JSON)  # NCF/GNN 학습된 임베딩
+    embedding_blob = Column(LargeBinary)  # NCF/GNN 학습된 임베딩 (services/embedding_store 형식)
+    embedding = Column(JSON)  # 레거시 JSON 임베딩 (마이그레이션 후 비어 있음)
     
     # 선호도 프로필
     preferences = Column(JSON)  # {"genres": [...], "directors": [...]}
@@ -120,6 +128,9 @@ class User(Base):
 class Interaction(Base):
     """사용자-영화 상호작용 (추천 시스템용)"""
     __tablename__ = "interactions"
+    __table_args__ = (
+        Index("ix_interactions_user_id_created_at", "user_id", "created_at"),  # 사용자별 최근 상호작용
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -156,7 +167,8 @@ class GraphNode(Base):
     name = Column(String(200), nullable=False, index=True)
     
     # 노드 임베딩 (GNN 학습)
-    embedding = Column(JSON)  # 128-dim vector
+    embedding_blob = Column(LargeBinary)  # 128-dim vector (services/embedding_store 형식)
+    embedding = Column(JSON)  # 레거시 JSON 임베딩 (마이그레이션 후 비어 있음)
     
     # 메타데이터
     properties = Column(JSON)  # 추가 속성
@@ -209,3 +221,40 @@ class ABTest(Base):
     
     def __repr__(self):
         return f"<ABTest(experiment={self.experiment_name}, variant={self.variant})>"
+
+
+class SchemaMigration(Base):
+    """적용된 스키마/데이터 마이그레이션 기록 (app/migrations.py)"""
+    __tablename__ = "schema_migrations"
+    
+    version = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<SchemaMigration(version={self.version}, name='{self.name}')>"
+
+
+class MigrationCheckpoint(Base):
+    """배치 백필 진행 상황 (app/migrations.py backfill - 중단되면 last_id 다음부터 이어서 실행)"""
+    __tablename__ = "migration_checkpoints"
+    
+    name = Column(String(100), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    rows_done = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<MigrationCheckpoint(name='{self.name}', last_id={self.last_id}, rows={self.rows_done})>"
+
+
+class TableVersion(Base):
+    """테이블별 변경 카운터 (커밋마다 증가, HTTP ETag 계산용 - services/http_cache)"""
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<TableVersion(table={self.table_name}, version={self.version})>"
@@ -0,0 +1,131 @@
+"""
+사용자 상호작용 API 라우터 (RL 온라인 학습)
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+
+from ..database import get_db
+from ..models import Interaction, Movie
+from ..services.feature_store import get_feature_store
+from ..services.online_learning import get_online_trainer, compute_reward
+from ..services.recommendation_cache import get_recommendation_cache
+from ..services.recommender import get_recommender
+from ..services.feature_assembler import validate_context
+from ..config import settings
+
+router = APIRouter()
+
+
+# Pydantic 스키마
+from pydantic import BaseModel, field_validator
+
+class InteractionCreate(BaseModel):
+    user_id: int
+    movie_id: int
+    interaction_type: str = "view"  # view, like, review, watch
+    rating: Optional[float] = None
+    watch_duration: Optional[int] = None
+    completion_rate: Optional[float] = None
+    reward: Optional[float] = None  # 없으면 interaction_type 기반으로 계산
+    context: Optional[dict] = None  # 추천 시점 컨텍스트 {"time": "evening", "device": "mobile"}
+    
+    @field_validator("context")
+    @classmethod
+    def check_context(cls, context):
+        return validate_context(context)
+
+class InteractionResponse(BaseModel):
+    id: int
+    user_id: int
+    movie_id: int
+    interaction_type: str
+    reward: float
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+@router.post("/", response_model=InteractionResponse, status_code=status.HTTP_201_CREATED)
+async def create_interaction(
+    interaction: InteractionCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    상호작용 기록 및 RL 온라인 학습
+    
+    상호작용은 DB에 저장되고 WAL에 append되며,
+    micro-batch(RL_UPDATE_BATCH_SIZE)가 쌓이면 백그라운드에서 bandit에 반영됩니다.
+    
+    **Parameters:**
+    - user_id: 사용자 ID
+    - movie_id: 영화 ID
+    - interaction_type: view, like, review, watch
+    - reward: RL 보상 (선택사항)
+    - context: 추천 시점 컨텍스트 (선택사항)
+    """
+    movie = db.query(Movie).filter(Movie.id == interaction.movie_id).first()
+    if not movie:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Movie not found"
+        )
+    
+    reward = compute_reward(
+        interaction.interaction_type,
+        interaction.reward,
+        interaction.completion_rate
+    )
+    
+    db_interaction = Interaction(
+        user_id=interaction.user_id,
+        movie_id=interaction.movie_id,
+        interaction_type=interaction.interaction_type,
+        rating=interaction.rating,
+        watch_duration=interaction.watch_duration,
+        completion_rate=interaction.completion_rate,
+        reward=reward
+    )
+    db.add(db_interaction)
+    db.commit()
+    db.refresh(db_interaction)
+    
+    # 사용자/영화 특징 갱신 후 추천 캐시 / 컨텍스트 특징 캐시 무효화
+    feature_store = get_feature_store()
+    feature_store.refresh_users([interaction.user_id])
+    feature_store.refresh_movies([interaction.movie_id])
+    get_recommendation_cache().invalidate(interaction.user_id)
+    get_recommender().feature_assembler.invalidate(interaction.user_id)
+    
+    # RL 온라인 학습 (WAL 기록 → micro-batch 반영)
+    if settings.ENABLE_RL:
+        trainer = get_online_trainer()
+        trainer.record(
+            interaction.user_id,
+            interaction.movie_id,
+            reward,
+            interaction.context
+        )
+        if trainer.should_apply():
+            background_tasks.add_task(trainer.apply_pending)
+    
+    return db_interaction
+
+
+@router.post("/apply", response_model=dict)
+async def apply_pending_interactions():
+    """
+    WAL에 남은 상호작용을 즉시 bandit에 반영 (micro-batch 크기 미만 포함)
+    
+    락 대기/행렬 갱신/체크포인트 저장은 스레드풀에서 실행해 이벤트 루프를 막지 않음
+    """
+    if not settings.ENABLE_RL:
+        return {"applied": 0}
+    
+    applied = await run_in_threadpool(get_online_trainer().apply_pending)
+    return {"applied": applied}
@@ -2,13 +2,17 @@
 영화 API 라우터
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from datetime import datetime
 
-from ..database import get_db
+from ..config import settings
+from ..database import get_async_db, get_db
 from ..models import Movie, Rating
+from ..services.http_cache import conditional_get
 
 router = APIRouter()
 
@@ -38,6 +42,21 @@ class MovieResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkMovieItemResult(BaseModel):
+    index: int  # 요청 목록에서의 위치
+    title: str
+    status: Literal["created", "duplicate"]
+    id: Optional[int] = None  # 생성된 영화 또는 이미 있는 영화 ID (요청 내 중복이면 먼저 나온 항목의 ID)
+
+class BulkMovieResponse(BaseModel):
+    created: int
+    duplicates: int
+    results: List[BulkMovieItemResult]
+
+
+# SQLite 바인드 변수 한도 아래로 IN 조회를 나눔
+TITLE_LOOKUP_CHUNK = 5000
+
 
 @router.post("/", response_model=MovieResponse, status_code=status.HTTP_201_CREATED)
 async def create_movie(movie: MovieCreate, db: Session = Depends(get_db)):
@@ -60,26 +79,85 @@ async def create_movie(movie: MovieCreate, db: Session = Depends(get_db)):
             detail="Movie with this title already exists"
         )
     
-    # 영화 생성
+    # 영화 + Rating 레코드 생성 (한 트랜잭션)
     db_movie = Movie(**movie.dict())
     db.add(db_movie)
+    db.flush()
+    db.add(Rating(movie_id=db_movie.id))
     db.commit()
     db.refresh(db_movie)
     
-    # Rating 레코드 생성
-    rating = Rating(movie_id=db_movie.id)
-    db.add(rating)
+    return db_movie
+
+
+@router.post("/bulk", response_model=BulkMovieResponse)
+async def create_movies_bulk(movies: List[MovieCreate] = Body(...), db: Session = Depends(get_db)):
+    """
+    영화 일괄 등록 (카탈로그 동기화용)
+    
+    - 제목 중복은 IN 조회 한 번으로 확인 (요청 안에서 같은 제목이 반복되면 첫 항목만 등록)
+    - 영화와 Rating을 executemany로 한 트랜잭션에 삽입
+    - 항목별 결과(created / duplicate)를 요청 순서대로 반환
+    """
+    if len(movies) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many items (max {settings.BULK_MAX_ITEMS})"
+        )
+    
+    titles = list({movie.title for movie in movies})
+    existing = {}
+    for i in range(0, len(titles), TITLE_LOOKUP_CHUNK):
+        chunk = titles[i:i + TITLE_LOOKUP_CHUNK]
+        existing.update((title, movie_id) for movie_id, title in db.query(Movie.id, Movie.title).filter(Movie.title.in_(chunk)))
+    
+    new_indexes, first_index = [], {}
+    for index, movie in enumerate(movies):
+        if movie.title not in existing and movie.title not in first_index:
+            first_index[movie.title] = index
+            new_indexes.append(index)
+    
+    created_ids = {}
+    if new_indexes:
+        rows = db.execute(
+            insert(Movie).returning(Movie.id, sort_by_parameter_order=True),
+            [movies[index].dict() for index in new_indexes]
+        ).scalars().all()
+        created_ids = dict(zip(new_indexes, rows))
+        db.execute(insert(Rating), [{"movie_id": movie_id} for movie_id in rows])
     db.commit()
     
-    return db_movie
+    results = []
+    for index, movie in enumerate(movies):
+        if index in created_ids:
+            results.append(BulkMovieItemResult(index=index, title=movie.title, status="created", id=created_ids[index]))
+        else:
+            movie_id = existing.get(movie.title, created_ids.get(first_index.get(movie.title)))
+            results.append(BulkMovieItemResult(index=index, title=movie.title, status="duplicate", id=movie_id))
+    
+    return BulkMovieResponse(created=len(created_ids), duplicates=len(movies) - len(created_ids), results=results)
 
 
-@router.get("/", response_model=List[MovieResponse])
+def _movie_response(movie: Movie, rating: Optional[Rating]) -> MovieResponse:
+    return MovieResponse(
+        id=movie.id,
+        title=movie.title,
+        release_date=movie.release_date,
+        director=movie.director,
+        genre=movie.genre,
+        poster_url=movie.poster_url,
+        description=movie.description,
+        avg_rating=rating.avg_sentiment if rating else 0.0,
+        review_count=rating.review_count if rating else 0
+    )
+
+
+@router.get("/", response_model=List[MovieResponse], dependencies=[Depends(conditional_get("movies", "ratings"))])
 async def get_movies(
     skip: int = 0,
     limit: int = 100,
     genre: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     영화 목록 조회
@@ -89,58 +167,32 @@ async def get_movies(
     - limit: 최대 개수
     - genre: 장르 필터 (선택사항)
     """
-    query = db.query(Movie)
+    # Rating 정보를 함께 조회 (영화마다 따로 조회하지 않음)
+    query = select(Movie, Rating).outerjoin(Rating, Rating.movie_id == Movie.id).order_by(Movie.id)
     
     if genre:
-        query = query.filter(Movie.genre.contains(genre))
-    
-    movies = query.offset(skip).limit(limit).all()
-    
-    # Rating 정보 추가
-    result = []
-    for movie in movies:
-        rating = db.query(Rating).filter(Rating.movie_id == movie.id).first()
-        movie_dict = {
-            "id": movie.id,
-            "title": movie.title,
-            "release_date": movie.release_date,
-            "director": movie.director,
-            "genre": movie.genre,
-            "poster_url": movie.poster_url,
-            "description": movie.description,
-            "avg_rating": rating.avg_sentiment if rating else 0.0,
-            "review_count": rating.review_count if rating else 0
-        }
-        result.append(MovieResponse(**movie_dict))
-    
-    return result
-
-
-@router.get("/{movie_id}", response_model=MovieResponse)
-async def get_movie(movie_id: int, db: Session = Depends(get_db)):
+        query = query.where(Movie.genre.contains(genre))
+    
+    rows = (await db.execute(query.offset(skip).limit(limit))).all()
+    
+    return [_movie_response(movie, rating) for movie, rating in rows]
+
+
+@router.get("/{movie_id}", response_model=MovieResponse, dependencies=[Depends(conditional_get("movies", "ratings"))])
+async def get_movie(movie_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     특정 영화 조회
     """
-    movie = db.query(Movie).filter(Movie.id == movie_id).first()
-    if not movie:
+    row = (await db.execute(
+        select(Movie, Rating).outerjoin(Rating, Rating.movie_id == Movie.id).where(Movie.id == movie_id)
+    )).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Movie not found"
         )
     
-    rating = db.query(Rating).filter(Rating.movie_id == movie.id).first()
-    
-    return MovieResponse(
-        id=movie.id,
-        title=movie.title,
-        release_date=movie.release_date,
-        director=movie.director,
-        genre=movie.genre,
-        poster_url=movie.poster_url,
-        description=movie.description,
-        avg_rating=rating.avg_sentiment if rating else 0.0,
-        review_count=rating.review_count if rating else 0
-    )
+    return _movie_response(*row)
 
 
 @router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -163,15 +215,15 @@ async def delete_movie(movie_id: int, db: Session = Depends(get_db)):
     return None
 
 
-@router.get("/search/{query}")
-async def search_movies(query: str, db: Session = Depends(get_db)):
+@router.get("/search/{query}", dependencies=[Depends(conditional_get("movies"))])
+async def search_movies(query: str, db: AsyncSession = Depends(get_async_db)):
     """
     영화 검색 (제목, 감독, 장르)
     """
-    movies = db.query(Movie).filter(
+    movies = (await db.scalars(select(Movie).where(
         (Movie.title.contains(query)) |
         (Movie.director.contains(query)) |
         (Movie.genre.contains(query))
-    ).all()
+    ))).all()
     
     return movies
@@ -3,24 +3,33 @@
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from ..database import get_db
+from ..database import get_async_db, get_db, get_read_db
 from ..services.recommender import get_recommender
-from ..models import Movie
+from ..services.http_cache import conditional_get
+from ..models import Movie, Rating
+from ..services.feature_assembler import validate_context
 from ..config import settings
 
 router = APIRouter()
 
 
 # Pydantic 스키마
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 class RecommendationRequest(BaseModel):
     user_id: int
     num_recommendations: int = 10
     context: Optional[dict] = None  # {"time": "evening", "device": "mobile"}
+    
+    @field_validator("context")
+    @classmethod
+    def check_context(cls, context):
+        return validate_context(context)
 
 class RecommendationResponse(BaseModel):
     movie_id: int
@@ -64,10 +73,12 @@ async def get_recommendations(
         context=request.context
     )
     
-    # 영화 정보 조회 및 추천 이유 생성
+    # 영화 정보 조회 (한 번의 IN 쿼리) 및 추천 이유 생성
+    movies = _fetch_movies(db, [movie_id for movie_id, _ in recommendations])
+    
     result = []
     for movie_id, score in recommendations:
-        movie = db.query(Movie).filter(Movie.id == movie_id).first()
+        movie = movies.get(movie_id)
         if movie:
             # 추천 이유 생성
             reason = generate_recommendation_reason(movie, score)
@@ -82,11 +93,11 @@ async def get_recommendations(
     return result
 
 
-@router.get("/similar/{movie_id}", response_model=List[MovieSimple])
+@router.get("/similar/{movie_id}", response_model=List[MovieSimple], dependencies=[Depends(conditional_get("movies"))])
 async def get_similar_movies(
     movie_id: int,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     유사 영화 추천 (Content-Based)
@@ -96,7 +107,7 @@ async def get_similar_movies(
     - limit: 추천할 영화 수
     """
     # 기준 영화
-    base_movie = db.query(Movie).filter(Movie.id == movie_id).first()
+    base_movie = await db.get(Movie, movie_id)
     if not base_movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,10 +115,10 @@ async def get_similar_movies(
         )
     
     # 같은 장르의 영화 찾기
-    similar_movies = db.query(Movie).filter(
+    similar_movies = (await db.scalars(select(Movie).where(
         Movie.genre.contains(base_movie.genre),
         Movie.id != movie_id
-    ).limit(limit).all()
+    ).limit(limit))).all()
     
     return [MovieSimple(
         id=m.id,
@@ -117,51 +128,44 @@ async def get_similar_movies(
     ) for m in similar_movies]
 
 
-@router.get("/trending", response_model=List[MovieSimple])
+@router.get("/trending", response_model=List[MovieSimple], dependencies=[Depends(conditional_get("movies", "ratings"))])
 async def get_trending_movies(
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     인기 영화 (평점 및 리뷰 수 기반)
     """
-    from ..models import Rating
-    from sqlalchemy import desc
+    # 평점이 높고 리뷰가 많은 영화 (Movie를 함께 조인해 한 번에 조회)
+    movies = (await db.scalars(
+        select(Movie).join(Rating, Rating.movie_id == Movie.id).where(
+            Rating.review_count > 0
+        ).order_by(
+            desc(Rating.avg_sentiment),
+            desc(Rating.review_count)
+        ).limit(limit)
+    )).all()
     
-    # 평점이 높고 리뷰가 많은 영화
-    popular_ratings = db.query(Rating).filter(
-        Rating.review_count > 0
-    ).order_by(
-        desc(Rating.avg_sentiment),
-        desc(Rating.review_count)
-    ).limit(limit).all()
-    
-    result = []
-    for rating in popular_ratings:
-        movie = db.query(Movie).filter(Movie.id == rating.movie_id).first()
-        if movie:
-            result.append(MovieSimple(
-                id=movie.id,
-                title=movie.title,
-                genre=movie.genre,
-                poster_url=movie.poster_url
-            ))
-    
-    return result
+    return [MovieSimple(
+        id=movie.id,
+        title=movie.title,
+        genre=movie.genre,
+        poster_url=movie.poster_url
+    ) for movie in movies]
 
 
-@router.get("/by-genre/{genre}", response_model=List[MovieSimple])
+@router.get("/by-genre/{genre}", response_model=List[MovieSimple], dependencies=[Depends(conditional_get("movies"))])
 async def get_movies_by_genre(
     genre: str,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     장르별 영화 추천
     """
-    movies = db.query(Movie).filter(
+    movies = (await db.scalars(select(Movie).where(
         Movie.genre.contains(genre)
-    ).limit(limit).all()
+    ).limit(limit))).all()
     
     return [MovieSimple(
         id=m.id,
@@ -174,7 +178,7 @@ async def get_movies_by_genre(
 @router.get("/personalized-feed/{user_id}")
 async def get_personalized_feed(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     개인화 피드 (여러 행으로 구성)
@@ -189,17 +193,17 @@ async def get_personalized_feed(
     """
     recommender = get_recommender()
     
-    # 1. Top Picks (최고 추천)
-    top_picks_ids = recommender.recommend(user_id, 10)
-    top_picks = [db.query(Movie).filter(Movie.id == m[0]).first() for m in top_picks_ids]
+    # 1. Top Picks (최고 추천) - 사용자 추천 캐시에서 조회
+    top_picks_ids = [m[0] for m in recommender.recommend(user_id, 10)]
     
     # 2. Trending (인기)
-    from ..models import Rating
-    from sqlalchemy import desc
-    trending_ratings = db.query(Rating).order_by(
+    trending_ids = [r.movie_id for r in db.query(Rating.movie_id).order_by(
         desc(Rating.review_count)
-    ).limit(10).all()
-    trending = [db.query(Movie).filter(Movie.id == r.movie_id).first() for r in trending_ratings]
+    ).limit(10).all()]
+    
+    movies = _fetch_movies(db, top_picks_ids + trending_ids)
+    top_picks = [movies.get(movie_id) for movie_id in top_picks_ids]
+    trending = [movies.get(movie_id) for movie_id in trending_ids]
     
     # 3. Because You Watched (시청 기록 기반)
     # NOTE: 실제로는 사용자의 시청 히스토리 조회
@@ -212,6 +216,31 @@ async def get_personalized_feed(
     }
 
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    추천 캐시 통계 (hit rate 등)
+    """
+    from ..services.recommendation_cache import get_recommendation_cache
+    return get_recommendation_cache().stats()
+
+
+@router.get("/features/stats")
+async def get_feature_stats():
+    """
+    RL 컨텍스트 벡터 조립 시간 통계 (마이크로초, 사용자 캐시 hit/miss별)
+    """
+    return get_recommender().feature_assembler.stats()
+
+
+def _fetch_movies(db: Session, movie_ids: List[int]) -> dict:
+    """movie_id -> Movie (한 번의 쿼리)"""
+    if not movie_ids:
+        return {}
+    movies = db.query(Movie).filter(Movie.id.in_(set(movie_ids))).all()
+    return {movie.id: movie for movie in movies}
+
+
 def generate_recommendation_reason(movie: Movie, score: float) -> str:
     """
     추천 이유 생성
@@ -2,15 +2,22 @@
 리뷰 API 라우터 (감성 분석 통합)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
-from ..database import get_db
-from ..models import Review, Movie, Rating
+from ..database import get_async_db, get_db
+from ..models import Review, Movie, User
 from ..services.sentiment_analyzer import get_sentiment_analyzer, get_absa_analyzer, get_emotion_classifier
 from ..services.llm_service import get_llm_service
+from ..services.feature_store import get_feature_store
+from ..services.recommendation_cache import get_recommendation_cache
+from ..services.http_cache import conditional_get
+from ..services.review_ingest import ReviewIngestor, update_movie_ratings
 from ..config import settings
 
 router = APIRouter()
@@ -40,6 +47,19 @@ class ReviewResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkReviewError(BaseModel):
+    line: int  # NDJSON 줄 번호 (1부터)
+    error: str
+
+class BulkReviewResponse(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    movies_updated: int
+    seconds: float
+    reviews_per_second: float
+    errors: List[BulkReviewError] = []  # 최대 100개
+
 
 @router.post("/", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
 async def create_review(
@@ -112,18 +132,46 @@ async def create_review(
     db.commit()
     db.refresh(db_review)
     
+    # 작성자가 등록된 사용자면 사용자 특징 갱신 + 추천 캐시 무효화
+    user = db.query(User.id).filter(User.username == review.author_name).first()
+    if user:
+        get_feature_store().refresh_users([user.id])
+        get_recommendation_cache().invalidate(user.id)
+    
     # 평점 통계 업데이트 (백그라운드)
     background_tasks.add_task(update_movie_rating, review.movie_id, db)
     
     return db_review
 
 
-@router.get("/", response_model=List[ReviewResponse])
+@router.post("/bulk", response_model=BulkReviewResponse)
+async def create_reviews_bulk(request: Request, db: Session = Depends(get_db)):
+    """
+    리뷰 대량 등록 (NDJSON 스트리밍, 크롤링 데이터 백필용)
+    
+    요청 본문은 한 줄에 리뷰 하나인 NDJSON입니다 (Content-Type: application/x-ndjson).
+    
+        {"movie_id": 1, "author_name": "user1", "content": "정말 재미있어요", "created_at": "2024-05-01T12:00:00"}
+    
+    - 받는 대로 줄 단위로 파싱해 REVIEW_INGEST_CHUNK_SIZE개씩 배치 분석 + 저장
+    - 평점 통계는 마지막에 영향받은 영화마다 한 번만 갱신
+    - 잘못된 줄/없는 영화는 건너뛰고 errors에 줄 번호와 함께 보고
+    - LLM 요약은 생성하지 않음
+    - 분석/저장(동기)은 스레드풀에서 실행해 이벤트 루프를 막지 않음
+    """
+    ingestor = ReviewIngestor(db)
+    async for chunk in request.stream():
+        await run_in_threadpool(ingestor.feed, chunk)
+    
+    return BulkReviewResponse(**await run_in_threadpool(ingestor.finish))
+
+
+@router.get("/", response_model=List[ReviewResponse], dependencies=[Depends(conditional_get("reviews"))])
 async def get_reviews(
     skip: int = 0,
     limit: int = 10,
     movie_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     리뷰 목록 조회
@@ -133,19 +181,19 @@ async def get_reviews(
     - limit: 최대 개수 (기본 10개)
     - movie_id: 특정 영화의 리뷰만 조회 (선택사항)
     """
-    query = db.query(Review).order_by(Review.created_at.desc())
+    query = select(Review).order_by(Review.created_at.desc())
     
     if movie_id:
-        query = query.filter(Review.movie_id == movie_id)
+        query = query.where(Review.movie_id == movie_id)
     
-    reviews = query.offset(skip).limit(limit).all()
+    reviews = (await db.scalars(query.offset(skip).limit(limit))).all()
     return reviews
 
 
-@router.get("/{review_id}", response_model=ReviewResponse)
-async def get_review(review_id: int, db: Session = Depends(get_db)):
+@router.get("/{review_id}", response_model=ReviewResponse, dependencies=[Depends(conditional_get("reviews"))])
+async def get_review(review_id: int, db: AsyncSession = Depends(get_async_db)):
     """특정 리뷰 조회"""
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -203,41 +251,4 @@ def update_movie_rating(movie_id: int, db: Session):
     """
     영화 평점 통계 업데이트 (백그라운드 작업)
     """
-    # 모든 리뷰 조회
-    reviews = db.query(Review).filter(Review.movie_id == movie_id).all()
-    
-    if not reviews:
-        return
-    
-    # 평균 계산
-    avg_sentiment = sum(r.sentiment_score for r in reviews) / len(reviews)
-    
-    # Aspect별 평균
-    avg_aspects = {}
-    if settings.ENABLE_ABSA:
-        all_aspects = {}
-        for review in reviews:
-            if review.aspect_sentiments:
-                for aspect, score in review.aspect_sentiments.items():
-                    if aspect not in all_aspects:
-                        all_aspects[aspect] = []
-                    all_aspects[aspect].append(score)
-        
-        for aspect, scores in all_aspects.items():
-            avg_aspects[aspect] = sum(scores) / len(scores)
-    
-    # 감정 분포
-    emotion_distribution = {}
-    if settings.ENABLE_EMOTION_CLASSIFICATION:
-        for emotion in ["joy", "sadness", "anger", "surprise", "fear", "disgust"]:
-            count = sum(1 for r in reviews if r.emotions and r.emotions.get(emotion, 0) > 0.5)
-            emotion_distribution[emotion] = count
-    
-    # Rating 업데이트
-    rating = db.query(Rating).filter(Rating.movie_id == movie_id).first()
-    if rating:
-        rating.avg_sentiment = avg_sentiment
-        rating.review_count = len(reviews)
-        rating.avg_aspects = avg_aspects
-        rating.emotion_distribution = emotion_distribution
-        db.commit()
+    update_movie_ratings(db, [movie_id])
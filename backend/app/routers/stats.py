@@ -0,0 +1,252 @@
+"""
+대시보드 통계 API 라우터
+
+프론트엔드가 영화/리뷰 전체를 받아 직접 평균을 내지 않도록
+SQL 집계(COUNT/AVG/GROUP BY)와 미리 계산된 Rating 테이블로 요약만 반환합니다.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Integer, case, cast, func
+from sqlalchemy.orm import Session
+from typing import Dict, List, Literal, Optional
+from datetime import datetime, timedelta
+
+from ..database import get_read_db
+from ..models import Interaction, Movie, Rating, Review, User
+from ..services.http_cache import conditional_get
+
+router = APIRouter()
+
+
+# Pydantic 스키마
+from pydantic import BaseModel
+
+class MovieStat(BaseModel):
+    id: int
+    title: str
+    avg_rating: float = 0.0
+    review_count: int = 0
+
+class OverviewResponse(BaseModel):
+    movie_count: int
+    review_count: int
+    user_count: int
+    interaction_count: int
+    avg_sentiment: float
+    avg_confidence: float
+    positive_rate: float  # sentiment_score > 0 비율
+    label_counts: Dict[str, int]
+    top_movies: List[MovieStat]
+
+class HistogramBin(BaseModel):
+    start: float
+    end: float
+    count: int
+
+class MovieStatsResponse(BaseModel):
+    movie_id: int
+    title: str
+    director: Optional[str] = None
+    genre: Optional[str] = None
+    poster_url: Optional[str] = None
+    avg_rating: float = 0.0
+    review_count: int = 0
+    avg_confidence: Optional[float] = None
+    label_counts: Dict[str, int]
+    avg_aspects: Dict[str, float] = {}
+    emotion_distribution: Dict[str, int] = {}
+    sentiment_histogram: List[HistogramBin]
+
+class TrendPoint(BaseModel):
+    period: str
+    review_count: int
+    avg_sentiment: Optional[float] = None
+    positive: int = 0
+    negative: int = 0
+    neutral: int = 0
+
+
+def _label_counts(query) -> Dict[str, int]:
+    return {label or "unknown": count for label, count in query.group_by(Review.sentiment_label).all()}
+
+
+def _bucket_expr(db: Session, bucket: str):
+    """created_at → 기간 시작일 문자열 (YYYY-MM-DD, 월 단위는 YYYY-MM)"""
+    if db.get_bind().dialect.name == "sqlite":
+        if bucket == "month":
+            return func.strftime("%Y-%m", Review.created_at)
+        if bucket == "week":
+            # 월요일 시작 주
+            return func.date(Review.created_at, "-6 days", "weekday 1")
+        return func.date(Review.created_at)
+
+    truncated = func.date_trunc(bucket, Review.created_at)
+    return func.to_char(truncated, "YYYY-MM" if bucket == "month" else "YYYY-MM-DD")
+
+
+@router.get(
+    "/overview",
+    response_model=OverviewResponse,
+    dependencies=[Depends(conditional_get("movies", "reviews", "ratings", "users", "interactions"))]
+)
+async def get_overview(top: int = Query(10, ge=0, le=100), db: Session = Depends(get_read_db)):
+    """
+    전체 요약 통계
+
+    **Parameters:**
+    - top: 평점 순위에 포함할 영화 수
+    """
+    review_count, avg_sentiment, avg_confidence, positive = db.query(
+        func.count(Review.id),
+        func.avg(Review.sentiment_score),
+        func.avg(Review.confidence),
+        func.sum(case((Review.sentiment_score > 0, 1), else_=0)),
+    ).one()
+
+    top_movies = db.query(Movie.id, Movie.title, Rating.avg_sentiment, Rating.review_count).join(
+        Rating, Rating.movie_id == Movie.id
+    ).filter(
+        Rating.review_count > 0
+    ).order_by(
+        Rating.avg_sentiment.desc(), Rating.review_count.desc()
+    ).limit(top).all()
+
+    return OverviewResponse(
+        movie_count=db.query(func.count(Movie.id)).scalar(),
+        review_count=review_count,
+        user_count=db.query(func.count(User.id)).scalar(),
+        interaction_count=db.query(func.count(Interaction.id)).scalar(),
+        avg_sentiment=avg_sentiment or 0.0,
+        avg_confidence=avg_confidence or 0.0,
+        positive_rate=(positive or 0) / review_count if review_count else 0.0,
+        label_counts=_label_counts(db.query(Review.sentiment_label, func.count(Review.id))),
+        top_movies=[
+            MovieStat(id=m.id, title=m.title, avg_rating=m.avg_sentiment or 0.0, review_count=m.review_count or 0)
+            for m in top_movies
+        ],
+    )
+
+
+@router.get("/movies", response_model=List[MovieStat], dependencies=[Depends(conditional_get("movies", "ratings"))])
+async def get_movie_stats_list(
+    skip: int = 0,
+    limit: int = Query(1000, le=10000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    영화별 평점/리뷰 수 목록 (리뷰 많은 순, 선택 목록용 경량 응답)
+    """
+    rows = db.query(Movie.id, Movie.title, Rating.avg_sentiment, Rating.review_count).outerjoin(
+        Rating, Rating.movie_id == Movie.id
+    ).order_by(
+        func.coalesce(Rating.review_count, 0).desc(), Movie.id
+    ).offset(skip).limit(limit).all()
+
+    return [
+        MovieStat(id=m.id, title=m.title, avg_rating=m.avg_sentiment or 0.0, review_count=m.review_count or 0)
+        for m in rows
+    ]
+
+
+@router.get(
+    "/movies/{movie_id}",
+    response_model=MovieStatsResponse,
+    dependencies=[Depends(conditional_get("movies", "ratings", "reviews"))]
+)
+async def get_movie_stats(
+    movie_id: int,
+    bins: int = Query(10, ge=2, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    영화별 상세 통계
+
+    - 평점/Aspect 평균/감정 분포: Rating 테이블 (리뷰 작성 시 갱신)
+    - 라벨 분포, 감성 점수 히스토그램: SQL GROUP BY
+
+    **Parameters:**
+    - bins: 감성 점수 히스토그램 구간 수 (-1.0 ~ 1.0)
+    """
+    movie = db.query(Movie).filter(Movie.id == movie_id).first()
+    if not movie:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Movie not found"
+        )
+
+    rating = db.query(Rating).filter(Rating.movie_id == movie_id).first()
+    reviews = db.query(Review).filter(Review.movie_id == movie_id)
+
+    # (score + 1) / 구간 폭 의 정수 부분 → 구간 번호 (score=1.0은 마지막 구간)
+    width = 2.0 / bins
+    scaled = (Review.sentiment_score + 1.0) / width
+    raw_index = cast(scaled, Integer) if db.get_bind().dialect.name == "sqlite" else func.floor(scaled)
+    bin_index = case((raw_index < 0, 0), (raw_index > bins - 1, bins - 1), else_=raw_index)
+    counts = dict(
+        reviews.with_entities(bin_index, func.count(Review.id))
+        .filter(Review.sentiment_score.isnot(None))
+        .group_by(bin_index)
+        .all()
+    )
+
+    return MovieStatsResponse(
+        movie_id=movie.id,
+        title=movie.title,
+        director=movie.director,
+        genre=movie.genre,
+        poster_url=movie.poster_url,
+        avg_rating=(rating.avg_sentiment or 0.0) if rating else 0.0,
+        review_count=(rating.review_count or 0) if rating else 0,
+        avg_confidence=reviews.with_entities(func.avg(Review.confidence)).scalar(),
+        label_counts=_label_counts(reviews.with_entities(Review.sentiment_label, func.count(Review.id))),
+        avg_aspects=(rating.avg_aspects or {}) if rating else {},
+        emotion_distribution=(rating.emotion_distribution or {}) if rating else {},
+        sentiment_histogram=[
+            HistogramBin(start=-1.0 + i * width, end=-1.0 + (i + 1) * width, count=counts.get(i, 0))
+            for i in range(bins)
+        ],
+    )
+
+
+@router.get("/trends", response_model=List[TrendPoint], dependencies=[Depends(conditional_get("reviews", daily=True))])
+async def get_trends(
+    bucket: Literal["day", "week", "month"] = "day",
+    movie_id: Optional[int] = None,
+    days: Optional[int] = Query(None, ge=1, description="최근 N일만"),
+    limit: int = Query(365, ge=1, le=5000, description="최근 기간 최대 개수"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    기간별 리뷰 수 / 평균 감성 / 라벨 개수
+
+    **Parameters:**
+    - bucket: day | week | month
+    - movie_id: 특정 영화만 (선택사항)
+    - days: 최근 N일만 (선택사항)
+    """
+    period = _bucket_expr(db, bucket).label("period")
+    query = db.query(
+        period,
+        func.count(Review.id),
+        func.avg(Review.sentiment_score),
+        *[func.sum(case((Review.sentiment_label == label, 1), else_=0)) for label in ("positive", "negative", "neutral")],
+    ).filter(Review.created_at.isnot(None))
+
+    if movie_id is not None:
+        query = query.filter(Review.movie_id == movie_id)
+    if days:
+        query = query.filter(Review.created_at >= datetime.utcnow() - timedelta(days=days))
+
+    rows = query.group_by(period).order_by(period.desc()).limit(limit).all()
+
+    return [
+        TrendPoint(
+            period=row[0],
+            review_count=row[1],
+            avg_sentiment=row[2],
+            positive=row[3] or 0,
+            negative=row[4] or 0,
+            neutral=row[5] or 0,
+        )
+        for row in reversed(rows)
+    ]
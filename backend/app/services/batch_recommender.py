@@ -0,0 +1,367 @@
+"""
+오프라인 배치 추천 생성
+- User 테이블을 ID 구간(청크) 단위로 순회
+- 사용자 임베딩 행렬 × 영화 임베딩 행렬ᵀ 를 영화 블록 단위로 계산 (메모리 = 청크 × 블록)
+- 사용자별 Top-K를 Parquet 파일(청크당 1개)로 저장
+- 청크를 여러 프로세스에 분배하고 처리량(users/sec)을 보고
+
+점수는 온라인 GNN 추천과 같은 코사인 유사도이며,
+사용자 임베딩은 User.embedding_blob(차원이 맞을 때) 또는 최근 상호작용한 영화 임베딩의 평균입니다.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .embedding_store import decode_matrix
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def blocked_top_k(
+    users: np.ndarray,
+    items: np.ndarray,
+    item_norms: np.ndarray,
+    k: int,
+    block_size: int,
+    seen: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    영화 블록 단위 코사인 Top-K
+
+    블록마다 [현재 Top-K | 블록 점수]를 이어 붙여 argpartition으로 Top-K만 유지하므로
+    [사용자 수 × 전체 영화 수] 점수 행렬을 만들지 않습니다.
+
+    Args:
+        users: [num_users, dim] (행 단위 정규화됨)
+        items: [num_items, dim] (memmap 가능, 정규화 전)
+        item_norms: [num_items]
+        seen: 제외할 (사용자 행, 영화 인덱스) 쌍
+
+    Returns:
+        (indices, scores) [num_users, k] - 점수 내림차순, 후보가 모자라면 -inf
+    """
+    num_users = len(users)
+    k = min(k, len(items))
+    best_scores = np.full((num_users, k), -np.inf, dtype=np.float32)
+    best_indices = np.zeros((num_users, k), dtype=np.int64)
+
+    if seen is not None:
+        seen_order = np.argsort(seen[1], kind="stable")
+        seen_rows, seen_cols = seen[0][seen_order], seen[1][seen_order]
+
+    for start in range(0, len(items), block_size):
+        stop = min(start + block_size, len(items))
+        block = np.asarray(items[start:stop], dtype=np.float32) / item_norms[start:stop, None]
+        scores = users @ block.T
+
+        if seen is not None:
+            lo, hi = np.searchsorted(seen_cols, [start, stop])
+            scores[seen_rows[lo:hi], seen_cols[lo:hi] - start] = -np.inf
+
+        block_indices = np.broadcast_to(np.arange(start, stop), scores.shape)
+        candidate_scores = np.concatenate([best_scores, scores], axis=1)
+        candidate_indices = np.concatenate([best_indices, block_indices], axis=1)
+
+        top = np.argpartition(-candidate_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(candidate_scores, top, axis=1)
+        best_indices = np.take_along_axis(candidate_indices, top, axis=1)
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_indices, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+class BatchRecommendationJob:
+    """
+    전체 사용자 Top-K 배치 생성
+
+    출력 디렉토리 구조 (pandas.read_parquet(디렉토리)로 바로 읽을 수 있도록 부가 파일은 '_'로 시작):
+        _items/movie_ids.npy, _items/embeddings.npy - 워커가 memory-map으로 공유하는 영화 임베딩
+        part-<첫 user_id>.parquet                  - 청크별 결과 (user_id, rank, movie_id, score)
+        _manifest.json                             - 모델 버전, top_k, 사용자 수
+    """
+
+    MANIFEST_FILE = "_manifest.json"
+
+    def __init__(
+        self,
+        output_dir: str = None,
+        top_k: int = None,
+        user_chunk_size: int = None,
+        item_block_size: int = None,
+        exclude_seen: bool = True
+    ):
+        self.output_dir = Path(output_dir or settings.BATCH_RECOMMENDATION_PATH)
+        self.top_k = top_k or settings.BATCH_TOP_K
+        self.user_chunk_size = user_chunk_size or settings.BATCH_USER_CHUNK_SIZE
+        self.item_block_size = item_block_size or settings.BATCH_ITEM_BLOCK_SIZE
+        self.exclude_seen = exclude_seen
+
+    def plan(self, db) -> List[Tuple[int, int]]:
+        """
+        User.id keyset 순회로 청크 구간 [first_id, last_id] 목록 생성
+
+        ID만 읽으므로 사용자 수가 많아도 가볍습니다.
+        """
+        from ..models import User
+
+        ranges = []
+        last_id = 0
+        while True:
+            ids = [
+                row.id for row in db.query(User.id)
+                .filter(User.id > last_id)
+                .order_by(User.id)
+                .limit(self.user_chunk_size)
+                .all()
+            ]
+            if not ids:
+                break
+            ranges.append((ids[0], ids[-1]))
+            last_id = ids[-1]
+        return ranges
+
+    def prepare_items(self) -> str:
+        """
+        영화 임베딩을 출력 디렉토리에 .npy로 저장 (워커들이 memory-map으로 공유)
+
+        Returns:
+            모델 버전 (노드 임베딩 파일 수정 시각)
+        """
+        from .gnn_pipeline import default_embedding_path, load_movie_embeddings
+
+        loaded = load_movie_embeddings()
+        if loaded is None:
+            raise RuntimeError("GNN embeddings not found. Run export_graph.py and train_gnn.py first.")
+
+        movie_ids, embeddings, _ = loaded
+        item_dir = self.output_dir / "_items"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        np.save(item_dir / "movie_ids.npy", movie_ids)
+        np.save(item_dir / "embeddings.npy", embeddings)
+        return f"gnn-{os.stat(default_embedding_path()).st_mtime_ns}"
+
+    def run(self, db, workers: int = None, resume: bool = False) -> Dict:
+        """
+        배치 실행
+
+        Args:
+            workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+            resume: 이미 저장된 part 파일의 청크는 건너뜀
+
+        Returns:
+            {"users": 처리 사용자 수, "skipped": 임베딩 없는 사용자 수, "seconds": ..., "users_per_sec": ...}
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for batch recommendations (pip install pyarrow)")
+
+        workers = workers or settings.BATCH_WORKERS
+        start = time.time()
+        model_version = self.prepare_items()
+
+        ranges = self.plan(db)
+        if resume:
+            ranges = [r for r in ranges if not self._part_path(r[0]).exists()]
+        else:
+            for old in self.output_dir.glob("part-*.parquet"):
+                old.unlink()
+
+        config = {
+            "output_dir": str(self.output_dir),
+            "top_k": self.top_k,
+            "item_block_size": self.item_block_size,
+            "exclude_seen": self.exclude_seen,
+            "limit_threads": workers > 1,
+        }
+
+        totals = {"users": 0, "skipped": 0}
+        for i, (users, skipped) in enumerate(self._map(config, ranges, workers), 1):
+            totals["users"] += users
+            totals["skipped"] += skipped
+            elapsed = time.time() - start
+            print(
+                f"  [{i}/{len(ranges)}] {totals['users']:,} users "
+                f"({totals['users'] / max(elapsed, 1e-9):,.0f} users/sec)"
+            )
+
+        totals["seconds"] = time.time() - start
+        totals["users_per_sec"] = totals["users"] / max(totals["seconds"], 1e-9)
+        self._write_manifest(model_version, totals)
+        return totals
+
+    def _map(self, config: Dict, ranges: List[Tuple[int, int]], workers: int) -> Iterator[Tuple[int, int]]:
+        if workers <= 1 or len(ranges) <= 1:
+            _init_worker(config)
+            for user_range in ranges:
+                yield _process_chunk(user_range)
+            return
+
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(config,)) as pool:
+            yield from pool.imap_unordered(_process_chunk, ranges)
+
+    def _part_path(self, first_user_id: int) -> Path:
+        return self.output_dir / f"part-{first_user_id:012d}.parquet"
+
+    def _write_manifest(self, model_version: str, totals: Dict):
+        manifest = {
+            "model_version": model_version,
+            "top_k": self.top_k,
+            "exclude_seen": self.exclude_seen,
+            "num_users": totals["users"],
+            "created_at": time.time(),
+        }
+        with open(self.output_dir / self.MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+
+# ----- 워커 프로세스 -----
+
+_worker = {}
+
+
+def _init_worker(config: Dict):
+    """워커 초기화: 영화 임베딩 memory-map, 부모에게서 물려받은 DB 커넥션 폐기"""
+    from ..database import engine
+
+    engine.dispose()
+
+    if config["limit_threads"]:
+        # 프로세스 수 × BLAS 스레드 수가 코어 수를 넘지 않도록
+        try:
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(1)
+        except ImportError:
+            pass
+
+    item_dir = Path(config["output_dir"]) / "_items"
+    items = np.load(item_dir / "embeddings.npy", mmap_mode="r")
+    norms = np.linalg.norm(items, axis=1).astype(np.float32)
+    norms[norms == 0] = 1.0
+
+    _worker.update(config)
+    _worker["movie_ids"] = np.load(item_dir / "movie_ids.npy")
+    _worker["items"] = items
+    _worker["item_norms"] = norms
+
+
+def _process_chunk(user_range: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    사용자 ID 구간 하나를 처리해 part 파일로 저장
+
+    Returns:
+        (추천을 생성한 사용자 수, 임베딩이 없어 건너뛴 사용자 수)
+    """
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_ids, user_matrix, seen = _load_user_chunk(db, *user_range)
+    finally:
+        db.close()
+
+    valid = np.flatnonzero(np.isfinite(user_matrix).all(axis=1))
+    skipped = len(user_ids) - len(valid)
+
+    if len(valid):
+        users = user_matrix[valid]
+        users /= np.maximum(np.linalg.norm(users, axis=1, keepdims=True), 1e-12)
+        if seen is not None:
+            remap = np.full(len(user_ids), -1, dtype=np.int64)
+            remap[valid] = np.arange(len(valid))
+            keep = remap[seen[0]] >= 0
+            seen = (remap[seen[0][keep]], seen[1][keep])
+
+        indices, scores = blocked_top_k(
+            users, _worker["items"], _worker["item_norms"],
+            _worker["top_k"], _worker["item_block_size"], seen
+        )
+        rows, ranks = np.nonzero(np.isfinite(scores))
+        table = pa.table({
+            "user_id": pa.array(user_ids[valid][rows], type=pa.int64()),
+            "rank": pa.array(ranks + 1, type=pa.int16()),
+            "movie_id": pa.array(_worker["movie_ids"][indices[rows, ranks]], type=pa.int64()),
+            "score": pa.array(scores[rows, ranks], type=pa.float32()),
+        })
+    else:
+        table = pa.table({
+            "user_id": pa.array([], type=pa.int64()),
+            "rank": pa.array([], type=pa.int16()),
+            "movie_id": pa.array([], type=pa.int64()),
+            "score": pa.array([], type=pa.float32()),
+        })
+
+    part = Path(_worker["output_dir"]) / f"part-{user_range[0]:012d}.parquet"
+    tmp = part.with_suffix(".tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, part)
+    return len(valid), skipped
+
+
+def _load_user_chunk(db, first_id: int, last_id: int):
+    """
+    청크 사용자 임베딩 행렬 구성
+
+    User.embedding_blob의 차원이 영화 임베딩과 같으면 그대로 쓰고,
+    아니면 최근 SEQUENCE_LENGTH개 상호작용 영화 임베딩의 평균을 사용합니다 (온라인 GNN 추천과 동일).
+    둘 다 없으면 NaN 행.
+
+    Returns:
+        (user_ids, user_matrix [n, dim], seen (사용자 행, 영화 인덱스) 또는 None)
+    """
+    from ..models import Interaction, User
+
+    movie_ids = _worker["movie_ids"]
+    items = _worker["items"]
+    dim = items.shape[1]
+
+    users = db.query(User.id, User.embedding_blob).filter(
+        User.id >= first_id, User.id <= last_id
+    ).order_by(User.id).all()
+    user_ids = np.array([u.id for u in users], dtype=np.int64)
+    user_matrix, dims = decode_matrix([u.embedding_blob for u in users], dim)
+    user_matrix[dims != dim] = np.nan
+
+    interactions = db.query(Interaction.user_id, Interaction.movie_id).filter(
+        Interaction.user_id >= first_id, Interaction.user_id <= last_id
+    ).order_by(Interaction.user_id, Interaction.created_at.desc()).all()
+    if not interactions:
+        return user_ids, user_matrix, None
+
+    pairs = np.array([(i.user_id, i.movie_id) for i in interactions], dtype=np.int64)
+    rows = np.searchsorted(user_ids, pairs[:, 0])
+    cols = np.minimum(np.searchsorted(movie_ids, pairs[:, 1]), len(movie_ids) - 1)
+    known = (user_ids[rows] == pairs[:, 0]) & (movie_ids[cols] == pairs[:, 1])
+    rows, cols = rows[known], cols[known]
+
+    # 사용자별 최근 SEQUENCE_LENGTH개 (created_at 내림차순 정렬되어 있음)
+    group_start = np.searchsorted(rows, rows, side="left")
+    recent = np.arange(len(rows)) - group_start < settings.SEQUENCE_LENGTH
+    recent_rows, recent_cols = rows[recent], cols[recent]
+
+    # 온라인 경로와 같이 중복 영화는 한 번만 평균에 반영
+    unique_pairs = np.unique(np.stack([recent_rows, recent_cols], axis=1), axis=0)
+    missing = np.isnan(user_matrix[:, 0])
+    use = missing[unique_pairs[:, 0]]
+    mean_rows, mean_cols = unique_pairs[use, 0], unique_pairs[use, 1]
+
+    if len(mean_rows):
+        read_order = np.argsort(mean_cols, kind="stable")  # memmap은 정렬된 인덱스로 읽기
+        vectors = np.empty((len(mean_cols), dim), dtype=np.float32)
+        vectors[read_order] = items[mean_cols[read_order]]
+        starts = np.flatnonzero(np.r_[True, mean_rows[1:] != mean_rows[:-1]])
+        counts = np.diff(np.r_[starts, len(mean_rows)])
+        user_matrix[mean_rows[starts]] = np.add.reduceat(vectors, starts, axis=0) / counts[:, None]
+
+    seen = (rows, cols) if _worker["exclude_seen"] else None
+    return user_ids, user_matrix, seen
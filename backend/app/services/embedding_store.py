@@ -0,0 +1,137 @@
+"""
+임베딩 바이너리 저장 형식
+- User.embedding_blob / GraphNode.embedding_blob (LargeBinary)
+- 헤더 8바이트 + little-endian raw 벡터 (float32 또는 float16)
+- 여러 행을 한 번에 NumPy 행렬로 변환 (행별 JSON 파싱/float 박싱 없음)
+
+헤더: magic(b"EM") | version(uint8) | dtype 코드(uint8) | dim(uint32)
+"""
+
+import struct
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+
+MAGIC = b"EM"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<2sBBI")
+HEADER_SIZE = HEADER.size
+
+DTYPES = {1: np.dtype("<f4"), 2: np.dtype("<f2")}
+DTYPE_CODES = {"float32": 1, "float16": 2}
+
+
+def encode_embedding(vector, dtype: str = None) -> Optional[bytes]:
+    """
+    벡터 → BLOB
+
+    Args:
+        vector: list 또는 1차원 배열 (None이면 None)
+        dtype: "float32" | "float16" (기본: EMBEDDING_STORAGE_DTYPE)
+    """
+    if vector is None:
+        return None
+
+    code = DTYPE_CODES[dtype or settings.EMBEDDING_STORAGE_DTYPE]
+    values = np.asarray(vector, dtype=DTYPES[code]).ravel()
+    return HEADER.pack(MAGIC, FORMAT_VERSION, code, len(values)) + values.tobytes()
+
+
+def parse_header(blob: bytes) -> Tuple[np.dtype, int]:
+    """BLOB 헤더 → (dtype, dim)"""
+    magic, version, code, dim = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != FORMAT_VERSION or code not in DTYPES:
+        raise ValueError(f"Unknown embedding blob header: {bytes(blob[:HEADER_SIZE])!r}")
+    if len(blob) != HEADER_SIZE + dim * DTYPES[code].itemsize:
+        raise ValueError(f"Embedding blob size mismatch (dim={dim}, size={len(blob)})")
+    return DTYPES[code], dim
+
+
+def decode_embedding(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    """BLOB → float32 벡터"""
+    if blob is None:
+        return None
+    dtype, dim = parse_header(blob)
+    return np.frombuffer(blob, dtype=dtype, count=dim, offset=HEADER_SIZE).astype(np.float32)
+
+
+def decode_matrix(blobs: Sequence[Optional[bytes]], dim: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 BLOB → [n, dim] float32 행렬
+
+    헤더가 같은 행들은 하나로 이어 붙여 np.frombuffer 한 번으로 변환합니다.
+    dim보다 긴 벡터는 잘리고, 짧은 벡터와 None은 0으로 채워집니다.
+
+    Args:
+        dim: 출력 차원 (None이면 첫 BLOB의 차원)
+
+    Returns:
+        (matrix, dims) - dims[i]는 i번째 BLOB의 원래 차원 (None이면 0)
+    """
+    dims = np.zeros(len(blobs), dtype=np.int64)
+    groups = {}
+    for i, blob in enumerate(blobs):
+        if blob is not None:
+            groups.setdefault(bytes(blob[:HEADER_SIZE]), []).append(i)
+
+    if dim is None:
+        dim = parse_header(blobs[next(iter(groups.values()))[0]])[1] if groups else 0
+
+    matrix = np.zeros((len(blobs), dim), dtype=np.float32)
+    for header, rows in groups.items():
+        dtype, blob_dim = parse_header(blobs[rows[0]])
+        row_size = HEADER_SIZE + blob_dim * dtype.itemsize
+        raw = np.frombuffer(b"".join(blobs[i] for i in rows), dtype=np.uint8)
+        if len(raw) != len(rows) * row_size:
+            raise ValueError(f"Embedding blob size mismatch (dim={blob_dim})")
+        raw = raw.reshape(len(rows), row_size)
+
+        values = np.ascontiguousarray(raw[:, HEADER_SIZE:]).view(dtype)
+        width = min(dim, blob_dim)
+        matrix[rows, :width] = values[:, :width]
+        dims[rows] = blob_dim
+
+    return matrix, dims
+
+
+def iter_embedding_chunks(db, model, chunk_size: int = 10000) -> Iterator[Tuple[np.ndarray, List[Optional[bytes]]]]:
+    """
+    model(User/GraphNode)의 (id, embedding_blob)을 id keyset 순서로 청크 단위 조회
+
+    Yields:
+        (ids, blobs)
+    """
+    last_id = 0
+    while True:
+        rows = db.query(model.id, model.embedding_blob).filter(
+            model.id > last_id
+        ).order_by(model.id).limit(chunk_size).all()
+        if not rows:
+            break
+        yield np.array([r.id for r in rows], dtype=np.int64), [r.embedding_blob for r in rows]
+        last_id = rows[-1].id
+
+
+def load_embedding_matrix(db, model, dim: int = None, chunk_size: int = 10000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    테이블 전체 임베딩 bulk 로딩 (임베딩이 있는 행만)
+
+    Returns:
+        (ids [n], matrix [n, dim] float32)
+    """
+    all_ids, blocks = [], []
+    for ids, blobs in iter_embedding_chunks(db, model, chunk_size):
+        matrix, dims = decode_matrix(blobs, dim)
+        if dim is None and dims.any():
+            dim = matrix.shape[1]
+        present = dims > 0
+        if present.any():
+            all_ids.append(ids[present])
+            blocks.append(matrix[present])
+
+    if not blocks:
+        return np.empty(0, dtype=np.int64), np.empty((0, dim or 0), dtype=np.float32)
+    return np.concatenate(all_ids), np.concatenate(blocks)
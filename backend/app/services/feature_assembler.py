@@ -0,0 +1,312 @@
+"""
+컨텍스트 특징 조립 (RL bandit / re-ranker 입력)
+
+고정 레이아웃 float32 벡터 [FEATURE_DIM=128]:
+    [  0: 64] 사용자 임베딩 (User.embedding_blob 또는 최근 시청 영화 GNN 임베딩 평균 → 64차원 투영, L2 정규화)
+    [ 64: 88] 최근 장르 히스토그램 (최근 SEQUENCE_LENGTH개 상호작용, 합 1)
+    [ 88:112] 시간대 one-hot (0~23시)
+    [112:119] 요일 one-hot (월~일)
+    [119:127] 기기 one-hot (DEVICES)
+    [127]     bias (1.0)
+
+사용자 부분(0:88)은 feature store의 사용자 특징으로 만들어 사용자별로 캐시하고(상호작용 시 무효화),
+컨텍스트 부분(88:128)은 (시간, 요일, 기기) 조합별로 미리 계산한 테이블에서 한 행을 가져옵니다.
+요청당 조립은 캐시 조회 + 테이블 조회 + concatenate 한 번입니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+
+USER_EMBEDDING_DIM = 64
+NUM_GENRES = 24
+NUM_HOURS = 24
+NUM_DAYS = 7
+DEVICES = ["mobile", "desktop", "tablet", "tv", "web", "ios", "android", "other"]
+
+USER_DIM = USER_EMBEDDING_DIM + NUM_GENRES
+CONTEXT_DIM = NUM_HOURS + NUM_DAYS + len(DEVICES) + 1
+FEATURE_DIM = USER_DIM + CONTEXT_DIM
+
+# 장르 이름(한국어/OMDb 영어) → 히스토그램 슬롯 (마지막 슬롯은 기타)
+GENRE_SLOTS = {}
+for slot, names in enumerate([
+    ("액션", "action"), ("드라마", "drama"), ("코미디", "comedy"), ("스릴러", "thriller"),
+    ("sf", "sci-fi", "science fiction"), ("로맨스", "romance"), ("판타지", "fantasy"),
+    ("애니메이션", "animation"), ("공포", "호러", "horror"), ("어드벤처", "모험", "adventure"),
+    ("범죄", "crime"), ("미스터리", "mystery"), ("다큐멘터리", "documentary"), ("가족", "family"),
+    ("뮤지컬", "음악", "musical", "music"), ("전쟁", "war"), ("역사", "history"),
+    ("전기", "biography"), ("서부", "western"), ("스포츠", "sport"), ("재난", "disaster"),
+    ("느와르", "film-noir"), ("단편", "short"),
+]):
+    for name in names:
+        GENRE_SLOTS[name] = slot
+OTHER_GENRE = NUM_GENRES - 1
+
+# 시간대 라벨 → 대표 시각
+TIME_LABELS = {
+    "dawn": 4, "새벽": 4,
+    "morning": 9, "아침": 9, "오전": 9,
+    "afternoon": 15, "오후": 15,
+    "evening": 20, "저녁": 20,
+    "night": 23, "밤": 23,
+}
+DAY_LABELS = {name: i for i, name in enumerate(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])}
+DEVICE_INDEX = {name: i for i, name in enumerate(DEVICES)}
+NO_DEVICE = len(DEVICES)
+
+
+def _build_context_table() -> np.ndarray:
+    """(시간, 요일, 기기|없음) 전체 조합의 컨텍스트 부분 [24 * 7 * 9, CONTEXT_DIM]"""
+    table = np.zeros((NUM_HOURS, NUM_DAYS, len(DEVICES) + 1, CONTEXT_DIM), dtype=np.float32)
+    for hour in range(NUM_HOURS):
+        table[hour, :, :, hour] = 1.0
+    for day in range(NUM_DAYS):
+        table[:, day, :, NUM_HOURS + day] = 1.0
+    for device in range(len(DEVICES)):
+        table[:, :, device, NUM_HOURS + NUM_DAYS + device] = 1.0
+    table[..., -1] = 1.0
+    return table.reshape(-1, CONTEXT_DIM)
+
+
+CONTEXT_TABLE = _build_context_table()
+
+
+@lru_cache(maxsize=4096)
+def genre_slots(genre: Optional[str]) -> Tuple[int, ...]:
+    """Movie.genre ("SF, 액션") → 슬롯 목록"""
+    if not genre:
+        return ()
+    return tuple(
+        GENRE_SLOTS.get(name.strip().lower(), OTHER_GENRE)
+        for name in genre.split(",") if name.strip()
+    )
+
+
+@lru_cache(maxsize=8)
+def projection(dim: int) -> np.ndarray:
+    """dim → USER_EMBEDDING_DIM 고정 랜덤 투영 (Johnson-Lindenstrauss, seed 고정)"""
+    if dim == USER_EMBEDDING_DIM:
+        return np.eye(dim, dtype=np.float32)
+    rng = np.random.default_rng(dim)
+    return (rng.standard_normal((dim, USER_EMBEDDING_DIM)) / np.sqrt(USER_EMBEDDING_DIM)).astype(np.float32)
+
+
+def context_row(context: Optional[Dict]) -> int:
+    """
+    context dict → CONTEXT_TABLE 행 번호
+
+    인식하는 키:
+        hour (0~23) | time ("evening", "21:30", ISO 시각) | timestamp (epoch 초 또는 ISO)
+        weekday (0=월 ~ 6=일 또는 "mon") | device ("mobile", ...)
+    시각 정보가 없거나 해석할 수 없으면 현재 시각을 사용합니다 (예외를 내지 않음 - WAL 재생용).
+    """
+    context = context or {}
+    hour = _to_int(context.get("hour"))
+    day = context.get("weekday")
+    day = DAY_LABELS.get(day[:3].lower()) if isinstance(day, str) else _to_int(day)
+    time_label = context.get("time")
+    when = _parse_when(context) if hour is None or day is None else None
+
+    if hour is not None:
+        hour %= NUM_HOURS
+    elif isinstance(time_label, str) and time_label.lower() in TIME_LABELS:
+        hour = TIME_LABELS[time_label.lower()]
+    else:
+        hour = when.hour
+
+    day = day % NUM_DAYS if day is not None else when.weekday()
+
+    device = context.get("device")
+    device = DEVICE_INDEX.get(device.lower(), DEVICE_INDEX["other"]) if isinstance(device, str) else NO_DEVICE
+
+    return (hour * NUM_DAYS + day) * (len(DEVICES) + 1) + device
+
+
+def validate_context(context: Optional[Dict]) -> Optional[Dict]:
+    """
+    요청 context 검사 (InteractionCreate / RecommendationRequest)
+
+    context_row가 인식하는 키의 값이 잘못되면 ValueError (API에서는 422)
+    """
+    if not context:
+        return context
+
+    hour = context.get("hour")
+    if hour is not None and (isinstance(hour, bool) or _to_int(hour) not in range(NUM_HOURS)):
+        raise ValueError("context.hour must be an integer between 0 and 23")
+
+    day = context.get("weekday")
+    if day is not None:
+        if isinstance(day, str):
+            if day[:3].lower() not in DAY_LABELS:
+                raise ValueError("context.weekday must be 0-6 or a day name (mon ~ sun)")
+        elif isinstance(day, bool) or _to_int(day) not in range(NUM_DAYS):
+            raise ValueError("context.weekday must be 0-6 or a day name (mon ~ sun)")
+
+    time_label = context.get("time")
+    if time_label is not None and (
+        not isinstance(time_label, str)
+        or (time_label.lower() not in TIME_LABELS and _parse_time_value(time_label) is None)
+    ):
+        raise ValueError("context.time must be a label (morning, evening, ...), HH:MM or an ISO timestamp")
+
+    timestamp = context.get("timestamp")
+    if timestamp is not None and (isinstance(timestamp, bool) or _parse_time_value(timestamp) is None):
+        raise ValueError("context.timestamp must be epoch seconds or an ISO timestamp")
+
+    device = context.get("device")
+    if device is not None and not isinstance(device, str):
+        raise ValueError("context.device must be a string")
+
+    return context
+
+
+def _to_int(value) -> Optional[int]:
+    """정수로 해석할 수 없으면 None"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _parse_time_value(value) -> Optional[datetime]:
+    """epoch 초 / "21:30" / ISO 시각 → datetime (해석 불가면 None)"""
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value)
+        if isinstance(value, str):
+            if len(value) <= 5 and ":" in value:  # "21:30"
+                return datetime.now().replace(hour=int(value.split(":")[0]) % NUM_HOURS)
+            return datetime.fromisoformat(value)
+    except (ValueError, TypeError, OverflowError, OSError):
+        pass
+    return None
+
+
+def _parse_when(context: Dict) -> datetime:
+    for key in ("timestamp", "time"):
+        value = context.get(key)
+        if isinstance(value, str) and value.lower() in TIME_LABELS:
+            continue
+        when = _parse_time_value(value)
+        if when is not None:
+            return when
+    return datetime.now()
+
+
+class FeatureAssembler:
+    """
+    요청 단위 컨텍스트 벡터 조립기
+
+    사용자 부분은 LRU(FEATURE_USER_CACHE_SIZE, TTL FEATURE_USER_CACHE_TTL)에 캐시되며,
+    조립 시간은 캐시 hit/miss별로 최근 1024건을 기록해 stats()로 확인할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        movie_ids: Optional[np.ndarray] = None,
+        movie_embeddings: Optional[np.ndarray] = None,
+        cache_size: int = None,
+        ttl: int = None
+    ):
+        self.movie_ids = movie_ids
+        self.movie_embeddings = movie_embeddings
+        self.cache_size = cache_size or settings.FEATURE_USER_CACHE_SIZE
+        self.ttl = ttl or settings.FEATURE_USER_CACHE_TTL
+
+        self._users: "OrderedDict[int, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hit_ns = deque(maxlen=1024)
+        self._miss_ns = deque(maxlen=1024)
+
+    def assemble(self, user_id: int, context: Optional[Dict] = None) -> np.ndarray:
+        """컨텍스트 벡터 [FEATURE_DIM] float32"""
+        start = time.perf_counter_ns()
+        user_part, hit = self._user_part(user_id)
+        vector = np.concatenate((user_part, CONTEXT_TABLE[context_row(context)]))
+        (self._hit_ns if hit else self._miss_ns).append(time.perf_counter_ns() - start)
+        return vector
+
+    def invalidate(self, user_id: int):
+        """사용자 부분 캐시 무효화 (새 상호작용 발생 시)"""
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def _user_part(self, user_id: int) -> Tuple[np.ndarray, bool]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._users.move_to_end(user_id)
+                return entry[0], True
+
+        part = self._compute_user_part(user_id)
+        with self._lock:
+            self._users[user_id] = (part, now)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.cache_size:
+                self._users.popitem(last=False)
+        return part, False
+
+    def _compute_user_part(self, user_id: int) -> np.ndarray:
+        """사용자 임베딩(64) + 최근 장르 히스토그램(24) (feature store에서 조회)"""
+        from .feature_store import get_feature_store
+
+        features = get_feature_store().get_users([user_id]).get(user_id)
+        part = np.zeros(USER_DIM, dtype=np.float32)
+        if features is None:
+            return part
+
+        embedding = features["embedding"]
+        if embedding is None:
+            embedding = self._mean_movie_embedding(features["recent_movie_ids"])
+        if embedding is not None and len(embedding):
+            embedding = np.asarray(embedding, dtype=np.float32)
+            projected = embedding @ projection(len(embedding))
+            norm = np.linalg.norm(projected)
+            if norm > 0:
+                part[:USER_EMBEDDING_DIM] = projected / norm
+
+        part[USER_EMBEDDING_DIM:] = features["genre_histogram"]
+        return part
+
+    def _mean_movie_embedding(self, movie_ids) -> Optional[np.ndarray]:
+        if self.movie_ids is None or not movie_ids:
+            return None
+        seen = np.unique(np.asarray(movie_ids, dtype=np.int64))
+        index = np.minimum(np.searchsorted(self.movie_ids, seen), len(self.movie_ids) - 1)
+        index = index[self.movie_ids[index] == seen]
+        if len(index) == 0:
+            return None
+        return self.movie_embeddings[index].mean(axis=0)
+
+    def stats(self) -> dict:
+        """조립 시간 통계 (마이크로초)"""
+        def summary(samples):
+            if not samples:
+                return None
+            us = np.asarray(samples, dtype=np.float64) / 1000.0
+            return {
+                "count": len(us),
+                "mean_us": float(us.mean()),
+                "p50_us": float(np.percentile(us, 50)),
+                "p99_us": float(np.percentile(us, 99)),
+            }
+
+        return {
+            "feature_dim": FEATURE_DIM,
+            "cached_users": len(self._users),
+            "cache_hit": summary(list(self._hit_ns)),
+            "cache_miss": summary(list(self._miss_ns)),
+        }
@@ -0,0 +1,458 @@
+"""
+추천용 Feature Store
+- 사용자/영화 특징을 SQL 집계(set-based)로 계산
+- Offline: FEATURE_STORE_PATH/{user,movie}_features.parquet 로 materialize
+- Online: 프로세스 내 LRU(memory) / SQLite / Redis key-value, multi_get으로 일괄 조회
+- 조회 시 없는 키는 계산 후 저장(read-through), 상호작용/리뷰 발생 시 해당 키만 재계산
+
+ENABLE_FEATURE_STORE가 꺼져 있으면 online store는 프로세스 내 LRU로 동작합니다
+(같은 인터페이스, 재시작 시 비어 있음).
+
+사용자 특징:
+    interaction_count, review_count, avg_sentiment,
+    genre_histogram [24] (최근 SEQUENCE_LENGTH개 상호작용), recent_movie_ids (최신순),
+    embedding (User.embedding_blob, 없으면 None)
+영화 특징:
+    review_count, avg_sentiment, aspects [ABSA_ASPECTS 순서] (Rating.avg_aspects),
+    interaction_count, genres (장르 슬롯), popularity
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .embedding_store import decode_embedding
+from .feature_assembler import NUM_GENRES, genre_slots
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+USER = "user"
+MOVIE = "movie"
+
+
+# ----- 특징 계산 (SQL 집계) -----
+
+def compute_user_features(db, user_ids: Sequence[int]) -> Dict[int, Dict]:
+    """user_ids의 특징 (존재하지 않는 ID는 결과에 없음)"""
+    from sqlalchemy import func
+    from ..models import Interaction, Movie, Review, User
+
+    user_ids = list(user_ids)
+    users = db.query(User.id, User.username, User.embedding_blob).filter(User.id.in_(user_ids)).all()
+    features = {
+        u.id: {
+            "interaction_count": 0,
+            "review_count": 0,
+            "avg_sentiment": 0.0,
+            "genre_histogram": [0.0] * NUM_GENRES,
+            "recent_movie_ids": [],
+            "embedding": _embedding_list(u.embedding_blob),
+        }
+        for u in users
+    }
+    if not features:
+        return features
+
+    counts = db.query(Interaction.user_id, func.count(Interaction.id)).filter(
+        Interaction.user_id.in_(user_ids)
+    ).group_by(Interaction.user_id).all()
+    for user_id, count in counts:
+        features[user_id]["interaction_count"] = count
+
+    reviews = db.query(User.id, func.count(Review.id), func.avg(Review.sentiment_score)).join(
+        Review, Review.author_name == User.username
+    ).filter(User.id.in_(user_ids)).group_by(User.id).all()
+    for user_id, count, avg_sentiment in reviews:
+        features[user_id]["review_count"] = count
+        features[user_id]["avg_sentiment"] = float(avg_sentiment or 0.0)
+
+    # 사용자별 최근 SEQUENCE_LENGTH개 (window 함수로 한 번에)
+    rank = func.row_number().over(
+        partition_by=Interaction.user_id,
+        order_by=(Interaction.created_at.desc(), Interaction.id.desc())
+    ).label("rank")
+    recent = db.query(Interaction.user_id, Interaction.movie_id, rank).filter(
+        Interaction.user_id.in_(user_ids)
+    ).subquery()
+    rows = db.query(recent.c.user_id, recent.c.movie_id, Movie.genre).outerjoin(
+        Movie, Movie.id == recent.c.movie_id
+    ).filter(recent.c.rank <= settings.SEQUENCE_LENGTH).order_by(recent.c.user_id, recent.c.rank).all()
+
+    for user_id, movie_id, genre in rows:
+        user = features[user_id]
+        user["recent_movie_ids"].append(movie_id)
+        for slot in genre_slots(genre):
+            user["genre_histogram"][slot] += 1.0
+
+    for user in features.values():
+        total = sum(user["genre_histogram"])
+        if total > 0:
+            user["genre_histogram"] = [count / total for count in user["genre_histogram"]]
+
+    return features
+
+
+def compute_movie_features(db, movie_ids: Sequence[int]) -> Dict[int, Dict]:
+    """movie_ids의 특징 (존재하지 않는 ID는 결과에 없음)"""
+    from sqlalchemy import func
+    from ..models import Interaction, Movie, Rating
+
+    movie_ids = list(movie_ids)
+    aspects = settings.ABSA_ASPECTS
+    rows = db.query(
+        Movie.id, Movie.genre, Rating.review_count, Rating.avg_sentiment, Rating.avg_aspects
+    ).outerjoin(Rating, Rating.movie_id == Movie.id).filter(Movie.id.in_(movie_ids)).all()
+
+    interaction_counts = dict(
+        db.query(Interaction.movie_id, func.count(Interaction.id)).filter(
+            Interaction.movie_id.in_(movie_ids)
+        ).group_by(Interaction.movie_id).all()
+    )
+
+    features = {}
+    for movie_id, genre, review_count, avg_sentiment, avg_aspects in rows:
+        review_count = review_count or 0
+        avg_sentiment = float(avg_sentiment or 0.0)
+        interaction_count = interaction_counts.get(movie_id, 0)
+        avg_aspects = avg_aspects or {}
+        features[movie_id] = {
+            "review_count": review_count,
+            "avg_sentiment": avg_sentiment,
+            "aspects": [float(avg_aspects.get(aspect, 0.0)) for aspect in aspects],
+            "interaction_count": interaction_count,
+            "genres": list(genre_slots(genre)),
+            # 참여도(로그) × 감성 (-1~1 → 0~1)
+            "popularity": math.log1p(review_count + interaction_count) * (1.0 + avg_sentiment) / 2.0,
+        }
+    return features
+
+
+def _embedding_list(blob: Optional[bytes]) -> Optional[List[float]]:
+    embedding = decode_embedding(blob)
+    return embedding.tolist() if embedding is not None else None
+
+
+COMPUTE = {USER: compute_user_features, MOVIE: compute_movie_features}
+
+
+# ----- Online store -----
+
+class MemoryOnlineStore:
+    """프로세스 내 LRU key-value (entity별 max_entries)"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or settings.ONLINE_STORE_MAX_ENTRIES
+        self._data: Dict[str, "OrderedDict[int, Dict]"] = {}
+        self._lock = threading.Lock()
+
+    def multi_get(self, entity: str, ids: Sequence[int]) -> List[Optional[Dict]]:
+        with self._lock:
+            table = self._data.setdefault(entity, OrderedDict())
+            values = []
+            for entity_id in ids:
+                value = table.get(entity_id)
+                if value is not None:
+                    table.move_to_end(entity_id)
+                values.append(value)
+            return values
+
+    def put_many(self, entity: str, values: Dict[int, Dict]):
+        with self._lock:
+            table = self._data.setdefault(entity, OrderedDict())
+            for entity_id, value in values.items():
+                table[entity_id] = value
+                table.move_to_end(entity_id)
+            while len(table) > self.max_entries:
+                table.popitem(last=False)
+
+
+class SQLiteOnlineStore:
+    """
+    SQLite key-value (FEATURE_STORE_PATH/online.db)
+
+    같은 호스트의 여러 워커가 공유하며 재시작 후에도 유지됩니다.
+    커넥션은 스레드별로 하나씩 사용합니다.
+    """
+
+    MULTI_GET_BATCH = 500  # SQLite 바인드 변수 제한 이내
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS online_features ("
+                " entity TEXT NOT NULL, entity_id INTEGER NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL,"
+                " PRIMARY KEY (entity, entity_id)) WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def multi_get(self, entity: str, ids: Sequence[int]) -> List[Optional[Dict]]:
+        conn = self._connect()
+        found = {}
+        ids = list(ids)
+        for start in range(0, len(ids), self.MULTI_GET_BATCH):
+            batch = ids[start:start + self.MULTI_GET_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT entity_id, value FROM online_features WHERE entity = ? AND entity_id IN ({placeholders})",
+                [entity, *batch]
+            ).fetchall()
+            found.update(rows)
+        return [json.loads(found[i]) if i in found else None for i in ids]
+
+    def put_many(self, entity: str, values: Dict[int, Dict]):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO online_features (entity, entity_id, value, updated_at) VALUES (?, ?, ?, ?)",
+                [(entity, entity_id, json.dumps(value, separators=(",", ":")), now) for entity_id, value in values.items()]
+            )
+
+
+class RedisOnlineStore:
+    """Redis key-value (MGET / pipeline SET)"""
+
+    KEY_PREFIX = "feat:v1:"
+
+    def __init__(self, url: str):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def multi_get(self, entity: str, ids: Sequence[int]) -> List[Optional[Dict]]:
+        if not ids:
+            return []
+        raw = self.client.mget([f"{self.KEY_PREFIX}{entity}:{i}" for i in ids])
+        return [json.loads(value) if value else None for value in raw]
+
+    def put_many(self, entity: str, values: Dict[int, Dict]):
+        pipeline = self.client.pipeline(transaction=False)
+        for entity_id, value in values.items():
+            pipeline.set(f"{self.KEY_PREFIX}{entity}:{entity_id}", json.dumps(value, separators=(",", ":")))
+        pipeline.execute()
+
+
+def create_online_store():
+    """설정에 맞는 online store 생성"""
+    if not settings.ENABLE_FEATURE_STORE or settings.ONLINE_STORE_TYPE == "memory":
+        return MemoryOnlineStore()
+    if settings.ONLINE_STORE_TYPE == "redis":
+        if settings.REDIS_URL:
+            try:
+                store = RedisOnlineStore(settings.REDIS_URL)
+                store.client.ping()
+                return store
+            except Exception as e:
+                print(f"⚠️  Redis unavailable ({e}). Using SQLite online feature store.")
+    return SQLiteOnlineStore(f"{settings.FEATURE_STORE_PATH}/online.db")
+
+
+# ----- Feature Store -----
+
+class FeatureStore:
+    """
+    사용자/영화 특징 조회 진입점
+
+    get_users / get_movies: online store multi_get → 없는 키만 DB에서 계산해 저장
+    refresh_users / refresh_movies: 변경된 엔티티 재계산 (쓰기 경로)
+    materialize: 전체 재계산 → Parquet + online store
+    """
+
+    def __init__(self, online=None, offline_path: str = None):
+        self.online = online or create_online_store()
+        self.offline_path = Path(offline_path or settings.FEATURE_STORE_PATH)
+        self._popular = None  # (parquet mtime, movie_ids, popularity)
+
+    def get_users(self, user_ids: Sequence[int]) -> Dict[int, Dict]:
+        return self._get(USER, user_ids)
+
+    def get_movies(self, movie_ids: Sequence[int]) -> Dict[int, Dict]:
+        return self._get(MOVIE, movie_ids)
+
+    def refresh_users(self, user_ids: Sequence[int]):
+        self._refresh(USER, user_ids)
+
+    def refresh_movies(self, movie_ids: Sequence[int]):
+        self._refresh(MOVIE, movie_ids)
+
+    def _get(self, entity: str, ids: Sequence[int]) -> Dict[int, Dict]:
+        ids = list(dict.fromkeys(int(i) for i in ids))
+        values = self.online.multi_get(entity, ids)
+        result = {i: v for i, v in zip(ids, values) if v is not None}
+
+        missing = [i for i, v in zip(ids, values) if v is None]
+        if missing:
+            computed = self._compute(entity, missing)
+            if computed:
+                self.online.put_many(entity, computed)
+            result.update(computed)
+        return result
+
+    def _refresh(self, entity: str, ids: Sequence[int]):
+        computed = self._compute(entity, list(ids))
+        if computed:
+            self.online.put_many(entity, computed)
+
+    @staticmethod
+    def _compute(entity: str, ids: List[int]) -> Dict[int, Dict]:
+        from ..database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return COMPUTE[entity](db, ids)
+        finally:
+            db.close()
+
+    def materialize(self, db, chunk_size: int = 5000, online: bool = True) -> Dict[str, int]:
+        """
+        전체 사용자/영화 특징을 청크 단위로 계산해 Parquet(offline)과 online store에 저장
+
+        Returns:
+            {"user": 사용자 수, "movie": 영화 수}
+        """
+        from ..models import Movie, User
+
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for the offline feature store (pip install pyarrow)")
+
+        self.offline_path.mkdir(parents=True, exist_ok=True)
+        counts = {}
+        for entity, model in ((USER, User), (MOVIE, Movie)):
+            output = self.offline_path / f"{entity}_features.parquet"
+            tmp = output.with_suffix(".tmp")
+            writer = None
+            counts[entity] = 0
+            try:
+                for ids in _keyset_chunks(db, model, chunk_size):
+                    features = COMPUTE[entity](db, ids)
+                    if not features:
+                        continue
+                    table = _to_table(entity, features)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp, table.schema, compression="zstd")
+                    writer.write_table(table)
+                    if online:
+                        self.online.put_many(entity, features)
+                    counts[entity] += len(features)
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is not None:
+                tmp.replace(output)
+
+        self._popular = None
+        return counts
+
+    def popular_movies(self, top_k: int) -> List[Tuple[int, float]]:
+        """
+        popularity 상위 영화
+
+        offline movie_features.parquet이 있으면 그것을 사용하고(파일이 바뀌면 다시 읽음),
+        materialize 전이면 online store의 영화 특징으로 계산해 CACHE_TTL 동안 재사용합니다.
+
+        Returns:
+            [(movie_id, popularity), ...]
+        """
+        path = self.offline_path / f"{MOVIE}_features.parquet"
+        if PYARROW_AVAILABLE and path.exists():
+            version = path.stat().st_mtime_ns
+        else:
+            path = None
+            version = int(time.time() // settings.CACHE_TTL)
+
+        if self._popular is None or self._popular[0] != version:
+            if path is not None:
+                table = pq.read_table(path, columns=["movie_id", "popularity"])
+                movie_ids = table.column("movie_id").to_numpy()
+                popularity = table.column("popularity").to_numpy()
+            else:
+                movies = self.get_movies(self._all_movie_ids())
+                movie_ids = np.fromiter(movies.keys(), dtype=np.int64, count=len(movies))
+                popularity = np.array([m["popularity"] for m in movies.values()], dtype=np.float32)
+            order = np.argsort(-popularity, kind="stable")
+            self._popular = (version, movie_ids[order], popularity[order])
+
+        _, movie_ids, popularity = self._popular
+        return [(int(m), float(p)) for m, p in zip(movie_ids[:top_k], popularity[:top_k])]
+
+    @staticmethod
+    def _all_movie_ids() -> List[int]:
+        from ..database import SessionLocal
+        from ..models import Movie
+
+        db = SessionLocal()
+        try:
+            return [row.id for row in db.query(Movie.id).all()]
+        finally:
+            db.close()
+
+
+def _keyset_chunks(db, model, chunk_size: int) -> Iterable[List[int]]:
+    last_id = 0
+    while True:
+        ids = [
+            row.id for row in db.query(model.id)
+            .filter(model.id > last_id)
+            .order_by(model.id)
+            .limit(chunk_size)
+            .all()
+        ]
+        if not ids:
+            break
+        yield ids
+        last_id = ids[-1]
+
+
+def _to_table(entity: str, features: Dict[int, Dict]) -> "pa.Table":
+    """특징 dict → Arrow 테이블 (리스트 특징은 list 컬럼)"""
+    ids = list(features)
+    columns = {f"{entity}_id": pa.array(ids, type=pa.int64())}
+    for name in next(iter(features.values())):
+        values = [features[i][name] for i in ids]
+        if name in ("genre_histogram", "aspects", "embedding"):
+            columns[name] = pa.array(values, type=pa.list_(pa.float32()))
+        elif name in ("recent_movie_ids", "genres"):
+            columns[name] = pa.array(values, type=pa.list_(pa.int64()))
+        elif name in ("avg_sentiment", "popularity"):
+            columns[name] = pa.array(values, type=pa.float32())
+        else:
+            columns[name] = pa.array(values, type=pa.int64())
+    return pa.table(columns)
+
+
+# 싱글톤 인스턴스
+_feature_store = None
+_feature_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Feature store 싱글톤"""
+    global _feature_store
+    if _feature_store is None:
+        with _feature_store_lock:
+            if _feature_store is None:
+                _feature_store = FeatureStore()
+    return _feature_store
@@ -0,0 +1,300 @@
+"""
+GNN 학습/추론 파이프라인
+- GraphSAGE 이웃 샘플링 mini-batch 학습 (레이어별 fan-out)
+- 전체 노드에 대한 레이어 단위(layer-wise) 청크 추론
+- 최종 노드 임베딩을 memory-mapped .npy로 저장 → HybridRecommender가 사용
+
+입력은 GraphStore(CSR)만 사용하며 ORM을 거치지 않습니다.
+torch_geometric이 없으면 MeanSAGEConv(순수 PyTorch)로 동작합니다.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from ..config import settings
+from .graph_store import GraphStore
+from .recommender import GraphSAGERecommender, get_device
+
+
+class NeighborSampler:
+    """
+    GraphSAGE 이웃 샘플러
+
+    seed 노드에서 시작해 출력 레이어부터 입력 레이어 방향으로
+    노드별 최대 fanout개의 이웃을 샘플링하고, 로컬 인덱스로 재라벨링한 블록을 만듭니다.
+    """
+
+    def __init__(self, store: GraphStore, fanouts: List[int], seed: Optional[int] = None):
+        self.indptr = np.asarray(store.indptr)
+        self.indices = store.indices
+        self.fanouts = fanouts
+        self.rng = np.random.default_rng(seed)
+
+    def sample_neighbors(self, nodes: np.ndarray, fanout: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        노드별 이웃 샘플링
+
+        Args:
+            nodes: 목적지 노드 인덱스
+            fanout: 노드별 최대 이웃 수 (None이면 전체 이웃)
+
+        Returns:
+            (neighbors, dst_positions) - dst_positions는 nodes 내 위치
+        """
+        start = self.indptr[nodes]
+        deg = self.indptr[nodes + 1] - start
+
+        if fanout is None:
+            full = np.ones(len(nodes), dtype=bool)
+        else:
+            full = deg <= fanout
+
+        # 차수가 fanout 이하인 노드: 이웃 전체
+        full_pos = np.flatnonzero(full)
+        full_deg = deg[full_pos]
+        dst_full = np.repeat(full_pos, full_deg)
+        offsets = np.arange(full_deg.sum()) - np.repeat(np.cumsum(full_deg) - full_deg, full_deg)
+        edge_full = np.repeat(start[full_pos], full_deg) + offsets
+
+        # 차수가 큰 노드: fanout개 무작위 샘플링 (중복 제거)
+        sampled_pos = np.flatnonzero(~full)
+        if len(sampled_pos):
+            dst_sampled = np.repeat(sampled_pos, fanout)
+            edge_sampled = np.repeat(start[sampled_pos], fanout) + (
+                self.rng.random(len(dst_sampled)) * np.repeat(deg[sampled_pos], fanout)
+            ).astype(np.int64)
+            edge_sampled, unique = np.unique(edge_sampled, return_index=True)
+            dst_sampled = dst_sampled[unique]
+        else:
+            dst_sampled = edge_sampled = np.empty(0, dtype=np.int64)
+
+        edges = np.concatenate([edge_full, edge_sampled])
+        dst_positions = np.concatenate([dst_full, dst_sampled])
+        return np.asarray(self.indices[edges], dtype=np.int64), dst_positions
+
+    def sample(self, seeds: np.ndarray, fanouts: Optional[List[Optional[int]]] = None):
+        """
+        mini-batch 블록 생성
+
+        Returns:
+            input_nodes: 첫 레이어 입력 노드 (전역 인덱스)
+            blocks: [(edge_index, num_dst), ...] 입력 → 출력 순서
+        """
+        fanouts = fanouts or self.fanouts
+        nodes = np.asarray(seeds, dtype=np.int64)
+        blocks = []
+
+        for fanout in reversed(fanouts):
+            neighbors, dst_local = self.sample_neighbors(nodes, fanout)
+            src_nodes, src_local = relabel(nodes, neighbors)
+            edge_index = torch.from_numpy(np.stack([src_local, dst_local]))
+            blocks.append((edge_index, len(nodes)))
+            nodes = src_nodes
+
+        blocks.reverse()
+        return nodes, blocks
+
+
+def relabel(dst_nodes: np.ndarray, neighbors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    블록 소스 노드 구성 (목적지 노드가 앞, 새 이웃이 뒤)
+
+    Returns:
+        (src_nodes, neighbors의 로컬 인덱스)
+    """
+    all_nodes = np.concatenate([dst_nodes, neighbors])
+    unique, first, inverse = np.unique(all_nodes, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    local = np.empty(len(unique), dtype=np.int64)
+    local[order] = np.arange(len(unique))
+    return unique[order], local[inverse[len(dst_nodes):]]
+
+
+class GNNTrainer:
+    """
+    GraphSAGE 비지도 학습 (link prediction)
+
+    positive: 실제 엣지 (u, v), negative: 무작위 노드 n
+    loss = -log σ(z_u·z_v) - log σ(-z_u·z_n)
+    """
+
+    def __init__(
+        self,
+        model: GraphSAGERecommender,
+        store: GraphStore,
+        fanouts: List[int] = None,
+        batch_size: int = None,
+        lr: float = 0.001,
+        seed: Optional[int] = None
+    ):
+        self.device = get_device()
+        self.model = model.to(self.device)
+        self.store = store
+        self.batch_size = batch_size or settings.GNN_BATCH_SIZE
+        self.sampler = NeighborSampler(store, fanouts or settings.GNN_FANOUTS, seed)
+        self.optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+        self.rng = np.random.default_rng(seed)
+        self.edge_dst = None
+
+    def train_epoch(self) -> float:
+        """1 epoch 학습 (엣지 수 / batch_size 스텝), 평균 loss 반환"""
+        if self.store.num_edges == 0:
+            return 0.0
+        if self.edge_dst is None:
+            _, self.edge_dst = self.store.coo()
+
+        self.model.train()
+        num_steps = max(1, self.store.num_edges // self.batch_size)
+        total_loss = 0.0
+
+        for _ in range(num_steps):
+            edges = self.rng.integers(0, self.store.num_edges, self.batch_size)
+            u = self.edge_dst[edges]
+            v = np.asarray(self.store.indices[edges], dtype=np.int64)
+            n = self.rng.integers(0, self.store.num_nodes, self.batch_size)
+
+            seeds, inverse = np.unique(np.concatenate([u, v, n]), return_inverse=True)
+            z = self.embed(seeds)
+            z_u, z_v, z_n = z[inverse].split(self.batch_size)
+
+            pos = (z_u * z_v).sum(dim=-1)
+            neg = (z_u * z_n).sum(dim=-1)
+            loss = -F.logsigmoid(pos).mean() - F.logsigmoid(-neg).mean()
+
+            self.optimizer.zero_grad()
+            loss.backward()
+            self.optimizer.step()
+            total_loss += loss.item()
+
+        return total_loss / num_steps
+
+    def embed(self, seeds: np.ndarray) -> torch.Tensor:
+        """seed 노드 임베딩 (이웃 샘플링 forward)"""
+        input_nodes, blocks = self.sampler.sample(seeds)
+        x = torch.from_numpy(np.asarray(self.store.features[np.sort(input_nodes)]))
+        # mmap은 정렬된 인덱스로 읽는 것이 빠르므로 정렬 후 원래 순서로 복원
+        x = x[torch.from_numpy(np.argsort(np.argsort(input_nodes)))]
+        blocks = [(edge_index.to(self.device), num_dst) for edge_index, num_dst in blocks]
+        return self.model.forward_blocks(x.to(self.device), blocks)
+
+
+@torch.no_grad()
+def layerwise_inference(
+    model: GraphSAGERecommender,
+    store: GraphStore,
+    output_path: str = None,
+    chunk_size: int = None
+) -> np.ndarray:
+    """
+    레이어 단위 전체 노드 추론
+
+    레이어 l의 출력을 모든 노드에 대해 청크 단위로 계산해 memmap에 쓰고,
+    다음 레이어는 그 memmap을 입력으로 사용합니다 (전체 이웃, 샘플링 없음).
+    메모리 사용량은 그래프 크기가 아니라 청크 크기에 비례합니다.
+
+    Returns:
+        최종 노드 임베딩 memmap [num_nodes, out_channels]
+    """
+    device = get_device()
+    model = model.to(device)
+    model.eval()
+
+    output_file = Path(output_path or default_embedding_path())
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    chunk_size = chunk_size or settings.GNN_INFERENCE_CHUNK_SIZE
+    sampler = NeighborSampler(store, [None])
+
+    x = store.features
+    for i, conv in enumerate(model.convs):
+        last = i == model.num_layers - 1
+        out_file = output_file.with_name(f"{output_file.stem}.layer{i}.tmp.npy")
+        out_channels = _out_channels(conv)
+        out = np.lib.format.open_memmap(out_file, mode="w+", dtype=np.float32, shape=(store.num_nodes, out_channels))
+
+        for start in range(0, store.num_nodes, chunk_size):
+            dst_nodes = np.arange(start, min(start + chunk_size, store.num_nodes))
+            neighbors, dst_local = sampler.sample_neighbors(dst_nodes, None)
+            src_nodes, src_local = relabel(dst_nodes, neighbors)
+
+            order = np.argsort(src_nodes)
+            x_src = torch.empty((len(src_nodes), x.shape[1]), dtype=torch.float32)
+            x_src[torch.from_numpy(order)] = torch.from_numpy(np.asarray(x[src_nodes[order]]))
+            x_src = x_src.to(device)
+
+            edge_index = torch.from_numpy(np.stack([src_local, dst_local])).to(device)
+            h = model.inference_layer(i, x_src, x_src[:len(dst_nodes)], edge_index)
+            out[start:start + len(dst_nodes)] = h.cpu().numpy()
+
+        out.flush()
+        previous = x
+        x = np.load(out_file, mmap_mode="r")
+        if i > 0:
+            del previous
+            os.remove(output_file.with_name(f"{output_file.stem}.layer{i - 1}.tmp.npy"))
+        if last:
+            del x
+            os.replace(out_file, output_file)
+
+    _write_embedding_manifest(output_file, store)
+    return np.load(output_file, mmap_mode="r")
+
+
+def _out_channels(conv) -> int:
+    if hasattr(conv, "out_channels"):
+        return conv.out_channels
+    return conv.lin_l.out_features
+
+
+def _write_embedding_manifest(output_file: Path, store: GraphStore):
+    """임베딩이 어떤 그래프 버전으로 계산됐는지 기록"""
+    manifest = {
+        "num_nodes": store.num_nodes,
+        "last_node_id": store.manifest["last_node_id"],
+        "last_edge_id": store.manifest["last_edge_id"],
+        "created_at": time.time(),
+    }
+    with open(output_file.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def load_movie_embeddings(embedding_path: str = None) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+    """
+    노드 임베딩 중 영화 노드만 영화 ID 순으로 로딩
+
+    Returns:
+        (movie_ids 정렬됨, embeddings [num_movies, dim] float32, 그래프 특징 차원)
+        임베딩이 없거나 그래프와 맞지 않으면 None
+    """
+    store = GraphStore.load()
+    embedding_file = Path(embedding_path or default_embedding_path())
+    if store is None or not embedding_file.exists():
+        print(f"⚠️  GNN embeddings not found at {embedding_file}. GNN recommendations disabled.")
+        return None
+
+    embeddings = np.load(embedding_file, mmap_mode="r")
+    if embeddings.shape[0] != store.num_nodes:
+        print("⚠️  GNN embeddings are stale (graph changed). Re-run train_gnn.py.")
+        return None
+
+    movie_nodes = store.nodes_of_type("movie")
+    movie_ids = np.asarray(store.entity_ids[movie_nodes])
+    order = np.argsort(movie_ids)
+    movie_embeddings = np.ascontiguousarray(embeddings[movie_nodes[order]], dtype=np.float32)
+    return movie_ids[order], movie_embeddings, store.feature_dim
+
+
+def default_embedding_path() -> str:
+    """최종 노드 임베딩 저장 경로"""
+    return f"{settings.GNN_MODEL_PATH}/embeddings.npy"
+
+
+def default_model_path() -> str:
+    """GraphSAGE 가중치 저장 경로"""
+    return f"{settings.GNN_MODEL_PATH}/graphsage.pt"
@@ -0,0 +1,361 @@
+"""
+GNN 그래프 저장소
+- GraphNode/GraphEdge 테이블을 청크 단위로 스트리밍하여 CSR/COO NumPy 배열로 export
+- 노드 특징은 연속된 float32 행렬, 모든 배열은 .npy로 저장 후 memory-map 로딩
+- 새 영화/엣지만 읽어 기존 그래프에 병합하는 증분 빌드
+
+GNN 학습/추론은 ORM을 거치지 않고 GraphStore만 사용합니다.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+from .embedding_store import decode_matrix, parse_header
+
+
+class GraphStore:
+    """
+    Memory-mapped 그래프 (CSR, 목적지 노드 기준)
+
+    - node_ids[i]: i번째 노드의 GraphNode.id (오름차순 → searchsorted로 매핑)
+    - indptr[i]:indptr[i+1] 구간의 indices = 노드 i로 메시지를 보내는 이웃 노드
+    - 관계는 양방향 엣지로 저장됩니다 (GraphSAGE 집계용)
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    NODE_ARRAYS = ("node_ids", "node_types", "entity_ids", "features")
+    EDGE_ARRAYS = ("indptr", "indices", "edge_weight", "edge_type")
+
+    def __init__(self, path: str, manifest: Dict, arrays: Dict[str, np.ndarray]):
+        self.path = Path(path)
+        self.manifest = manifest
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    @property
+    def num_nodes(self) -> int:
+        return self.manifest["num_nodes"]
+
+    @property
+    def num_edges(self) -> int:
+        return self.manifest["num_edges"]
+
+    @property
+    def feature_dim(self) -> int:
+        return self.manifest["feature_dim"]
+
+    @classmethod
+    def load(cls, path: str = None, mmap_mode: Optional[str] = "r") -> Optional["GraphStore"]:
+        """
+        저장된 그래프 로딩 (없으면 None)
+        """
+        directory = Path(path or default_graph_path())
+        manifest_file = directory / cls.MANIFEST_FILE
+        if not manifest_file.exists():
+            return None
+
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in cls.NODE_ARRAYS + cls.EDGE_ARRAYS
+        }
+        return cls(directory, manifest, arrays)
+
+    def node_index(self, graph_node_ids) -> np.ndarray:
+        """GraphNode.id → 연속 인덱스 (없는 ID는 -1)"""
+        return GraphExporter._lookup(self.node_ids, np.asarray(graph_node_ids, dtype=np.int64))
+
+    def nodes_of_type(self, node_type: str) -> np.ndarray:
+        """특정 타입 노드의 인덱스"""
+        types = self.manifest["node_types"]
+        if node_type not in types:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.node_types == types.index(node_type))
+
+    def neighbors(self, node: int) -> np.ndarray:
+        """노드 i의 이웃 인덱스"""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def coo(self):
+        """(src, dst) COO 배열"""
+        dst = np.repeat(np.arange(self.num_nodes, dtype=np.int64), self.degrees())
+        return np.asarray(self.indices), dst
+
+    def edge_index(self):
+        """PyG 형식 edge_index [2, num_edges] (torch.LongTensor)"""
+        import torch
+
+        src, dst = self.coo()
+        return torch.from_numpy(np.stack([src, dst]))
+
+
+class GraphExporter:
+    """
+    DB → GraphStore export
+
+    manifest의 last_node_id/last_edge_id 이후 행만 읽으므로
+    새 영화나 엣지가 추가된 경우 증분 빌드됩니다.
+    (노드/엣지 삭제를 반영하려면 rebuild=True)
+    """
+
+    def __init__(self, path: str = None, chunk_size: int = 10000):
+        self.path = Path(path or default_graph_path())
+        self.chunk_size = chunk_size
+
+    def export(self, db, rebuild: bool = False) -> GraphStore:
+        """
+        그래프 export 실행
+
+        Args:
+            db: SQLAlchemy Session
+            rebuild: True면 기존 그래프를 무시하고 전체 재빌드
+
+        Returns:
+            새로 저장된 GraphStore
+        """
+        previous = None if rebuild else GraphStore.load(self.path, mmap_mode="r")
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        manifest = json.loads(json.dumps(previous.manifest)) if previous else {
+            "num_nodes": 0,
+            "num_edges": 0,
+            "feature_dim": 0,
+            "last_node_id": 0,
+            "last_edge_id": 0,
+            "node_types": [],
+            "edge_types": [],
+        }
+
+        node_arrays = self._export_nodes(db, previous, manifest)
+        edge_arrays = self._export_edges(db, previous, manifest, node_arrays["node_ids"])
+
+        # 배열을 모두 쓴 뒤 manifest를 교체 (읽는 쪽은 항상 완전한 그래프를 봄)
+        for name, array in {**node_arrays, **edge_arrays}.items():
+            if isinstance(array, np.memmap):
+                array.flush()
+                os.replace(array.filename, self.path / f"{name}.npy")
+            else:
+                self._save(name, array)
+        del node_arrays, edge_arrays
+
+        tmp_manifest = self.path / f"{GraphStore.MANIFEST_FILE}.tmp"
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_manifest, self.path / GraphStore.MANIFEST_FILE)
+
+        return GraphStore.load(self.path)
+
+    def _save(self, name: str, array: np.ndarray):
+        tmp_file = self.path / f"{name}.npy.tmp"
+        with open(tmp_file, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_file, self.path / f"{name}.npy")
+
+    def _export_nodes(self, db, previous: Optional[GraphStore], manifest: Dict) -> Dict[str, np.ndarray]:
+        """새 노드를 스트리밍하여 노드 배열에 append"""
+        from ..models import GraphNode
+
+        last_id = manifest["last_node_id"]
+        old_n = manifest["num_nodes"]
+        new_n = db.query(GraphNode).filter(GraphNode.id > last_id).count()
+        total = old_n + new_n
+
+        feature_dim = manifest["feature_dim"] or self._detect_feature_dim(db)
+        manifest["feature_dim"] = feature_dim
+
+        node_ids = np.empty(total, dtype=np.int64)
+        node_types = np.empty(total, dtype=np.int16)
+        entity_ids = np.empty(total, dtype=np.int64)
+        features = np.lib.format.open_memmap(
+            self.path / "features.npy.tmp", mode="w+", dtype=np.float32, shape=(total, feature_dim)
+        )
+
+        if previous is not None and old_n:
+            node_ids[:old_n] = previous.node_ids
+            node_types[:old_n] = previous.node_types
+            entity_ids[:old_n] = previous.entity_ids
+            for start in range(0, old_n, self.chunk_size):
+                end = min(start + self.chunk_size, old_n)
+                features[start:end] = previous.features[start:end]
+
+        type_codes = {name: code for code, name in enumerate(manifest["node_types"])}
+        pos = old_n
+        while pos < total:
+            rows = db.query(
+                GraphNode.id, GraphNode.node_type, GraphNode.node_id, GraphNode.embedding_blob
+            ).filter(
+                GraphNode.id > last_id
+            ).order_by(GraphNode.id).limit(min(self.chunk_size, total - pos)).all()
+            if not rows:
+                break
+
+            end = pos + len(rows)
+            node_ids[pos:end] = [r.id for r in rows]
+            node_types[pos:end] = [self._code(type_codes, manifest["node_types"], r.node_type) for r in rows]
+            entity_ids[pos:end] = [r.node_id for r in rows]
+
+            features[pos:end] = decode_matrix([r.embedding_blob for r in rows], feature_dim)[0]
+
+            last_id = rows[-1].id
+            pos = end
+
+        # count 이후 삭제된 행이 있으면 잘라냄
+        if pos < total:
+            node_ids, node_types, entity_ids = node_ids[:pos], node_types[:pos], entity_ids[:pos]
+            features.flush()
+            features = np.array(features[:pos])
+
+        manifest["num_nodes"] = pos
+        manifest["last_node_id"] = int(last_id)
+
+        return {
+            "node_ids": node_ids,
+            "node_types": node_types,
+            "entity_ids": entity_ids,
+            "features": features,
+        }
+
+    def _export_edges(
+        self,
+        db,
+        previous: Optional[GraphStore],
+        manifest: Dict,
+        node_ids: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        새 엣지를 스트리밍하여 기존 CSR과 병합
+
+        이번 export에 포함되지 않은 노드(last_node_id 이후 추가)를 가리키는 엣지를 만나면 거기서 멈추고
+        last_edge_id를 그 앞까지만 올려, 다음 export에서 노드와 함께 다시 읽습니다.
+        가리키는 노드가 graph_nodes에 없으면(삭제됨, SQLite는 FK를 강제하지 않음) 엣지를 버리고 진행하며
+        manifest["dropped_edges"]에 누적합니다.
+        """
+        from ..models import GraphEdge
+
+        num_nodes = len(node_ids)
+        type_codes = {name: code for code, name in enumerate(manifest["edge_types"])}
+
+        src_parts, dst_parts, weight_parts, type_parts = [], [], [], []
+        if previous is not None and previous.num_edges:
+            src, dst = previous.coo()
+            src_parts.append(src)
+            dst_parts.append(dst)
+            weight_parts.append(np.asarray(previous.edge_weight))
+            type_parts.append(np.asarray(previous.edge_type))
+
+        last_id = manifest["last_edge_id"]
+        last_node_id = manifest["last_node_id"]
+        while True:
+            rows = db.query(
+                GraphEdge.id, GraphEdge.source_id, GraphEdge.target_id, GraphEdge.edge_type, GraphEdge.weight
+            ).filter(
+                GraphEdge.id > last_id
+            ).order_by(GraphEdge.id).limit(self.chunk_size).all()
+            if not rows:
+                break
+
+            source_ids = np.fromiter((r.source_id for r in rows), dtype=np.int64, count=len(rows))
+            target_ids = np.fromiter((r.target_id for r in rows), dtype=np.int64, count=len(rows))
+            pending = np.flatnonzero(
+                self._pending(db, source_ids, last_node_id) | self._pending(db, target_ids, last_node_id)
+            )
+            if len(pending):
+                rows = rows[:pending[0]]
+                source_ids, target_ids = source_ids[:len(rows)], target_ids[:len(rows)]
+
+            source = self._lookup(node_ids, source_ids)
+            target = self._lookup(node_ids, target_ids)
+            weight = np.fromiter((r.weight if r.weight is not None else 1.0 for r in rows), dtype=np.float32, count=len(rows))
+            etype = np.fromiter(
+                (self._code(type_codes, manifest["edge_types"], r.edge_type) for r in rows),
+                dtype=np.int16, count=len(rows)
+            )
+
+            # 삭제된 노드를 가리키는 엣지 제외, 양방향으로 저장
+            valid = (source >= 0) & (target >= 0)
+            manifest["dropped_edges"] = manifest.get("dropped_edges", 0) + int(len(valid) - valid.sum())
+            source, target, weight, etype = source[valid], target[valid], weight[valid], etype[valid]
+            src_parts += [source, target]
+            dst_parts += [target, source]
+            weight_parts += [weight, weight]
+            type_parts += [etype, etype]
+
+            if rows:
+                last_id = rows[-1].id
+            if len(pending):
+                break
+
+        manifest["last_edge_id"] = int(last_id)
+
+        if src_parts:
+            src = np.concatenate(src_parts)
+            dst = np.concatenate(dst_parts)
+            weight = np.concatenate(weight_parts)
+            etype = np.concatenate(type_parts)
+        else:
+            src = dst = np.empty(0, dtype=np.int64)
+            weight = np.empty(0, dtype=np.float32)
+            etype = np.empty(0, dtype=np.int16)
+
+        # 목적지 기준 정렬 → CSR
+        order = np.argsort(dst, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=num_nodes), out=indptr[1:])
+
+        manifest["num_edges"] = int(len(src))
+
+        return {
+            "indptr": indptr,
+            "indices": src[order],
+            "edge_weight": weight[order],
+            "edge_type": etype[order],
+        }
+
+    def _detect_feature_dim(self, db) -> int:
+        """첫 임베딩의 차원 (없으면 GNN_HIDDEN_DIM)"""
+        from ..models import GraphNode
+
+        row = db.query(GraphNode.embedding_blob).filter(GraphNode.embedding_blob.isnot(None)).first()
+        if row:
+            return parse_header(row.embedding_blob)[1]
+        return settings.GNN_HIDDEN_DIM
+
+    def _pending(self, db, graph_node_ids: np.ndarray, last_node_id: int) -> np.ndarray:
+        """last_node_id 이후에 추가되어 아직 export되지 않은 (존재하는) 노드를 가리키는지"""
+        from ..models import GraphNode
+
+        beyond = graph_node_ids > last_node_id
+        if not beyond.any():
+            return beyond
+        ids = np.unique(graph_node_ids[beyond]).tolist()
+        existing = [row.id for row in db.query(GraphNode.id).filter(GraphNode.id.in_(ids)).all()]
+        return beyond & np.isin(graph_node_ids, existing)
+
+    @staticmethod
+    def _lookup(node_ids: np.ndarray, graph_node_ids: np.ndarray) -> np.ndarray:
+        if len(node_ids) == 0:
+            return np.full(len(graph_node_ids), -1, dtype=np.int64)
+        index = np.minimum(np.searchsorted(node_ids, graph_node_ids), len(node_ids) - 1)
+        return np.where(node_ids[index] == graph_node_ids, index, -1)
+
+    @staticmethod
+    def _code(codes: Dict[str, int], names: List[str], name: str) -> int:
+        if name not in codes:
+            codes[name] = len(names)
+            names.append(name)
+        return codes[name]
+
+
+def default_graph_path() -> str:
+    """기본 그래프 저장 경로"""
+    return f"{settings.GNN_MODEL_PATH}/graph"
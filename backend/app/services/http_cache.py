@@ -0,0 +1,151 @@
+"""
+HTTP 조건부 GET (ETag / 304 Not Modified)
+
+- 세션이 flush/DML할 때 변경된 테이블을 session.info에 모아 두고, 커밋 후 별도의 짧은 트랜잭션에서
+  table_versions.version을 +1 (database.py의 세션 이벤트로 연결, 롤백되면 버림)
+  쓰기 트랜잭션 안에서 버전 행을 갱신하면 같은 테이블의 쓰기가 버전 행 락에서 직렬화되므로 커밋 뒤로 미룸
+  (커밋~증가 사이에 읽은 응답은 이전 ETag를 받을 뿐이고, 증가 후 다음 요청에서 200으로 갱신됨)
+- 읽기 API의 ETag = hash(경로 + 쿼리 + 의존 테이블 버전)
+- If-None-Match가 일치하면 본문을 만들지 않고 304 반환
+
+    @router.get("/", dependencies=[Depends(conditional_get("movies", "ratings"))])
+
+ORM 단위 작업/ORM DML(session.execute(update(Movie)...))은 자동으로 추적됩니다.
+세션 이벤트를 거치지 않는 쓰기(bulk_insert_mappings 등)는 커밋 전에 mark_changed(session, tables)를,
+세션 없이 Core 커넥션으로 쓰는 코드는 커밋 후 bump_versions()를 호출해야 합니다.
+"""
+
+import hashlib
+from datetime import date
+from typing import Dict, Iterable, Set
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import get_read_db
+
+_table_ready = False
+CHANGED_TABLES_KEY = "http_cache_changed_tables"  # session.info 키: 커밋 후 버전을 올릴 테이블
+
+
+def _versions_table():
+    from ..models import TableVersion
+    return TableVersion.__table__
+
+
+def bump_versions(connection, tables: Iterable[str]):
+    """tables의 버전을 +1 (행이 없으면 생성). 호출한 커넥션의 트랜잭션에 포함되므로 짧은 트랜잭션에서 호출하세요."""
+    global _table_ready
+    table = _versions_table()
+    if not _table_ready:
+        table.create(bind=connection, checkfirst=True)
+        _table_ready = True
+
+    for name in sorted(set(tables) - {table.name}):
+        updated = connection.execute(
+            update(table)
+            .where(table.c.table_name == name)
+            .values(version=table.c.version + 1, updated_at=func.now())
+        ).rowcount
+        if not updated:
+            connection.execute(insert(table).values(table_name=name, version=1))
+
+
+def flushed_tables(session) -> Set[str]:
+    """flush 대상 객체들의 테이블 이름 (after_flush 시점에는 new/dirty/deleted가 flush 전 상태)"""
+    tables = set()
+    for obj in session.new | session.deleted:
+        tables.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tables.add(obj.__table__.name)
+    return tables
+
+
+def mark_changed(session, tables: Iterable[str]):
+    """세션이 커밋되면 버전을 올릴 테이블로 기록"""
+    session.info.setdefault(CHANGED_TABLES_KEY, set()).update(tables)
+
+
+def on_after_flush(session, flush_context):
+    tables = flushed_tables(session)
+    if tables:
+        mark_changed(session, tables)
+
+
+def on_orm_execute(orm_execute_state):
+    """ORM DML 문(insert/update/delete)이 바꾼 테이블도 기록"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_changed(orm_execute_state.session, [orm_execute_state.statement.table.name])
+    return None
+
+
+def on_after_commit(session):
+    """커밋된 변경의 테이블 버전을 별도 트랜잭션으로 증가 (primary 엔진)"""
+    tables = session.info.pop(CHANGED_TABLES_KEY, None)
+    if not tables:
+        return
+    bind = session.bind or getattr(session, "primary_engine", None)
+    try:
+        with bind.begin() as connection:
+            bump_versions(connection, tables)
+    except Exception as e:
+        # 데이터는 이미 커밋됨 - 요청을 실패시키지 않고 다음 쓰기의 증가로 복구
+        print(f"⚠️  Table version bump failed for {sorted(tables)}: {e}")
+
+
+def on_after_transaction_end(session, transaction):
+    """롤백된 최상위 트랜잭션의 기록은 버림 (커밋은 after_commit에서 이미 처리)"""
+    if transaction.parent is None:
+        session.info.pop(CHANGED_TABLES_KEY, None)
+
+
+def get_versions(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    table = _versions_table()
+    tables = sorted(set(tables))
+    versions = dict(db.execute(
+        select(table.c.table_name, table.c.version).where(table.c.table_name.in_(tables))
+    ).all())
+    return {name: versions.get(name, 0) for name in tables}
+
+
+def make_etag(request: Request, versions: Dict[str, int], daily: bool = False) -> str:
+    key = "|".join([
+        settings.VERSION,
+        date.today().isoformat() if daily else "",
+        request.url.path,
+        "&".join(sorted(request.url.query.split("&"))),
+        ",".join(f"{name}:{version}" for name, version in versions.items()),
+    ])
+    return '"' + hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 비교 (약한 비교, '*' 및 여러 값 지원)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_get(*tables: str, max_age: int = None, daily: bool = False):
+    """
+    읽기 엔드포인트용 의존성
+
+    tables 중 하나라도 바뀌면 ETag가 달라집니다. 일치하면 304(본문 없음)로 응답하고
+    핸들러는 실행되지 않습니다. daily=True면 날짜가 바뀔 때도 달라집니다 ("최근 N일" 같은 응답).
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_read_db)):
+        etag = make_etag(request, get_versions(db, tables), daily=daily)
+        age = settings.HTTP_CACHE_MAX_AGE if max_age is None else max_age
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={age}" if age > 0 else "no-cache",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
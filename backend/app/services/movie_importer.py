@@ -0,0 +1,375 @@
+"""
+영화 일괄 가져오기 (OMDb / TMDB / 파일 스텁)
+
+- httpx.AsyncClient + asyncio.Semaphore로 동시 요청 수 제한 (IMPORT_CONCURRENCY)
+- 토큰 버킷으로 초당 요청 수 제한 (IMPORT_RATE_LIMIT), 429는 Retry-After만큼 대기
+- 네트워크 오류 / 429 / 5xx는 지수 백오프(+지터)로 재시도 (IMPORT_MAX_RETRIES)
+- 결과는 IMPORT_BATCH_SIZE개씩 bulk_insert_mappings(Movie, Rating)로 한 트랜잭션에 저장
+- 배치를 커밋할 때마다 처리한 항목 키를 체크포인트 파일에 기록 → 중단 후 resume
+
+    importer = BulkMovieImporter(OMDbSource(api_key))
+    result = importer.run([{"title": "Inception", "year": "2010"}, ...])
+
+로컬 테스트에는 OMDb 응답 JSON을 모아 둔 파일을 FileSource로 사용합니다.
+"""
+
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..config import settings
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    """재시도할 수 있는 응답 (429, 5xx)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def item_key(item: Dict) -> str:
+    """체크포인트/중복 판단용 키"""
+    return f"{item['title'].strip().lower()}|{item.get('year') or ''}"
+
+
+class RateLimiter:
+    """비동기 토큰 버킷 (초당 rate개, 최대 burst개 연속 허용)"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """429 Retry-After: 모든 요청을 잠시 멈춤"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def _retry_after(response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+async def _get_json(client, url: str, params: Dict) -> Dict:
+    response = await client.get(url, params=params)
+    if response.status_code in RETRY_STATUS:
+        raise RetryableError(f"HTTP {response.status_code}", _retry_after(response))
+    response.raise_for_status()
+    return response.json()
+
+
+def _clean(value: Optional[str], default: str = "") -> str:
+    if not value or value == "N/A":
+        return default
+    return value
+
+
+def normalize_omdb(data: Dict, item: Dict) -> Dict:
+    """OMDb 응답 → Movie 컬럼"""
+    year = _clean(data.get("Year"), item.get("year") or "")[:4]
+    release_date = f"{year}-01-01" if year else ""
+    released = _clean(data.get("Released"))
+    if released:
+        try:
+            release_date = datetime.strptime(released, "%d %b %Y").strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    return {
+        "title": _clean(data.get("Title"), item["title"]),
+        "release_date": release_date,
+        "director": _clean(data.get("Director"), "감독 정보 없음"),
+        "genre": _clean(data.get("Genre"), "장르 정보 없음"),
+        "poster_url": _clean(data.get("Poster")),
+        "description": _clean(data.get("Plot")),
+    }
+
+
+class OMDbSource:
+    """OMDb (?t=제목&y=연도)"""
+
+    name = "omdb"
+
+    def __init__(self, api_key: str, base_url: str = None):
+        self.api_key = api_key
+        self.base_url = base_url or settings.OMDB_BASE_URL
+
+    async def fetch(self, client, item: Dict) -> Optional[Dict]:
+        params = {"apikey": self.api_key, "t": item["title"], "plot": "full"}
+        if item.get("year"):
+            params["y"] = item["year"]
+        data = await _get_json(client, self.base_url, params)
+        if data.get("Response") != "True":
+            if "limit" in (data.get("Error") or "").lower():
+                # 일일 한도 초과(200 + Error)는 기다려도 풀리지 않으므로 실패 처리 → 다음 실행에서 이어하기
+                raise RuntimeError(data["Error"])
+            return None
+        return normalize_omdb(data, item)
+
+
+class TMDBSource:
+    """TMDB (검색 → 상세 + credits)"""
+
+    name = "tmdb"
+    BASE_URL = "https://api.themoviedb.org/3"
+    IMAGE_URL = "https://image.tmdb.org/t/p/w500"
+
+    def __init__(self, api_key: str, language: str = "ko-KR"):
+        self.api_key = api_key
+        self.language = language
+
+    async def fetch(self, client, item: Dict) -> Optional[Dict]:
+        params = {"api_key": self.api_key, "query": item["title"], "language": self.language}
+        if item.get("year"):
+            params["year"] = item["year"]
+        results = (await _get_json(client, f"{self.BASE_URL}/search/movie", params)).get("results") or []
+        if not results:
+            return None
+
+        details = await _get_json(client, f"{self.BASE_URL}/movie/{results[0]['id']}", {
+            "api_key": self.api_key,
+            "language": self.language,
+            "append_to_response": "credits",
+        })
+        directors = [c["name"] for c in details.get("credits", {}).get("crew", []) if c.get("job") == "Director"]
+        return {
+            "title": details.get("title") or item["title"],
+            "release_date": details.get("release_date") or "",
+            "director": ", ".join(directors) or "감독 정보 없음",
+            "genre": ", ".join(g["name"] for g in details.get("genres", [])) or "장르 정보 없음",
+            "poster_url": f"{self.IMAGE_URL}{details['poster_path']}" if details.get("poster_path") else "",
+            "description": details.get("overview") or "",
+        }
+
+
+class FileSource:
+    """
+    로컬 테스트용 스텁
+
+    OMDb 응답 형식 레코드의 JSON 배열 또는 JSONL 파일을 읽어 (제목, 연도)로 찾습니다.
+    latency(초)를 주면 요청마다 그만큼 대기해 실제 API처럼 동시성 효과를 확인할 수 있습니다.
+    """
+
+    name = "file"
+
+    def __init__(self, path: str, latency: float = 0.0):
+        text = Path(path).read_text(encoding="utf-8")
+        records = json.loads(text) if text.lstrip().startswith("[") else [
+            json.loads(line) for line in text.splitlines() if line.strip()
+        ]
+        self.latency = latency
+        self.records = {}
+        for record in records:
+            title = record.get("Title", "").strip().lower()
+            self.records.setdefault(f"{title}|{record.get('Year', '')[:4]}", record)
+            self.records.setdefault(f"{title}|", record)
+
+    async def fetch(self, client, item: Dict) -> Optional[Dict]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        record = self.records.get(item_key(item)) or self.records.get(f"{item['title'].strip().lower()}|")
+        return normalize_omdb(record, item) if record else None
+
+
+class BulkMovieImporter:
+    """
+    영화 일괄 가져오기
+
+    Returns (run):
+        {"requested", "skipped", "inserted", "not_found", "no_poster", "duplicates", "failed", "seconds"}
+    """
+
+    def __init__(
+        self,
+        source,
+        concurrency: int = None,
+        rate_limit: float = None,
+        max_retries: int = None,
+        batch_size: int = None,
+        checkpoint_path: str = None,
+        require_poster: bool = True,
+    ):
+        self.source = source
+        self.concurrency = concurrency or settings.IMPORT_CONCURRENCY
+        self.rate_limit = settings.IMPORT_RATE_LIMIT if rate_limit is None else rate_limit
+        self.max_retries = settings.IMPORT_MAX_RETRIES if max_retries is None else max_retries
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.checkpoint_path = Path(checkpoint_path or settings.IMPORT_CHECKPOINT_PATH)
+        self.require_poster = require_poster
+        self.failures: List[str] = []
+
+    def run(self, items: Iterable[Dict], resume: bool = True) -> Dict:
+        if not HTTPX_AVAILABLE and not isinstance(self.source, FileSource):
+            raise RuntimeError("httpx is required for API import (pip install httpx)")
+        return asyncio.run(self.import_items(list(items), resume=resume))
+
+    async def import_items(self, items: List[Dict], resume: bool = True) -> Dict:
+        from ..database import SessionLocal
+        from ..models import Movie
+
+        start = time.time()
+        done = self.load_checkpoint() if resume else set()
+        if not resume:
+            self.checkpoint_path.unlink(missing_ok=True)
+
+        stats = {"requested": len(items), "skipped": 0, "inserted": 0, "not_found": 0,
+                 "no_poster": 0, "duplicates": 0, "failed": 0}
+        self.failures = []
+
+        db = SessionLocal()
+        try:
+            titles = {title.lower() for (title,) in db.query(Movie.title).all()}
+
+            pending, seen = [], set()
+            for item in items:
+                key = item_key(item)
+                if key in done or key in seen:
+                    stats["skipped"] += 1
+                    continue
+                seen.add(key)
+                pending.append(item)
+
+            buffer, buffer_keys = [], []
+            async for item, movie, error in self._fetch_all(pending):
+                key = item_key(item)
+                if error:
+                    # 실패 항목은 체크포인트에 넣지 않아 resume 시 다시 시도
+                    stats["failed"] += 1
+                    self.failures.append(f"{item['title']} ({item.get('year') or '-'}): {error}")
+                    continue
+
+                buffer_keys.append(key)
+                if movie is None:
+                    stats["not_found"] += 1
+                elif self.require_poster and not movie["poster_url"]:
+                    stats["no_poster"] += 1
+                elif movie["title"].lower() in titles:
+                    stats["duplicates"] += 1
+                else:
+                    titles.add(movie["title"].lower())
+                    buffer.append(movie)
+
+                if len(buffer_keys) >= self.batch_size:
+                    stats["inserted"] += self._flush(db, buffer, buffer_keys, done)
+                    buffer, buffer_keys = [], []
+
+            stats["inserted"] += self._flush(db, buffer, buffer_keys, done)
+        finally:
+            db.close()
+
+        stats["seconds"] = time.time() - start
+        return stats
+
+    async def _fetch_all(self, items: List[Dict]):
+        """(item, movie | None, error | None)을 완료 순서대로"""
+        limiter = RateLimiter(self.rate_limit, burst=self.concurrency)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency) if HTTPX_AVAILABLE else None
+
+        async def fetch_one(client, item):
+            async with semaphore:
+                for attempt in range(self.max_retries + 1):
+                    await limiter.acquire()
+                    try:
+                        return item, await self.source.fetch(client, item), None
+                    except RetryableError as e:
+                        if e.retry_after:
+                            limiter.pause(e.retry_after)
+                        error = e
+                    except Exception as e:
+                        if not HTTPX_AVAILABLE or not isinstance(e, httpx.TransportError):
+                            return item, None, str(e)
+                        error = e
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(min(2 ** attempt, 30) * (0.5 + random.random()))
+                return item, None, f"retries exhausted ({error})"
+
+        if HTTPX_AVAILABLE:
+            client = httpx.AsyncClient(timeout=settings.IMPORT_TIMEOUT, limits=limits)
+        else:
+            client = None
+        try:
+            # 작업을 한꺼번에 만들지 않도록 동시성의 몇 배씩만 대기열에 둠
+            window = self.concurrency * 4
+            queue = iter(items)
+            running = set()
+            while True:
+                while len(running) < window:
+                    item = next(queue, None)
+                    if item is None:
+                        break
+                    running.add(asyncio.ensure_future(fetch_one(client, item)))
+                if not running:
+                    break
+                finished, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    yield task.result()
+        finally:
+            if client is not None:
+                await client.aclose()
+
+    def _flush(self, db, movies: List[Dict], keys: List[str], done: set) -> int:
+        """영화 + Rating을 한 트랜잭션으로 저장하고 체크포인트 갱신"""
+        from ..models import Movie, Rating
+        from .http_cache import mark_changed
+
+        if movies:
+            db.bulk_insert_mappings(Movie, movies, return_defaults=True)
+            db.bulk_insert_mappings(Rating, [{"movie_id": movie["id"]} for movie in movies])
+            # bulk_insert_mappings는 세션 이벤트를 거치지 않으므로 직접 기록 (커밋 후 ETag 버전 증가)
+            mark_changed(db, ["movies", "ratings"])
+            db.commit()
+
+        if keys:
+            done.update(keys)
+            self.save_checkpoint(done)
+        return len(movies)
+
+    def load_checkpoint(self) -> set:
+        if not self.checkpoint_path.exists():
+            return set()
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return set(json.load(f).get("done", []))
+
+    def save_checkpoint(self, done: set):
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"source": self.source.name, "done": sorted(done), "updated_at": time.time()}, f, ensure_ascii=False)
+        tmp.replace(self.checkpoint_path)
@@ -0,0 +1,266 @@
+"""
+RL 온라인 학습 서비스
+- Interaction 보상을 write-ahead log(WAL)에 append
+- micro-batch 단위로 ContextualBandit에 반영
+- 반영 후 RL_MODEL_PATH에 체크포인트 저장 (재시작/다른 워커에서 이어서 사용)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config import settings
+
+try:
+    import fcntl  # POSIX: 워커 프로세스 간 파일 잠금
+except ImportError:  # Windows
+    fcntl = None
+
+
+# 상호작용 타입별 기본 보상 (Interaction.reward가 없을 때)
+REWARD_BY_TYPE = {
+    "view": 1.0,    # 클릭
+    "watch": 2.0,   # 시청완료
+    "like": 3.0,    # 좋아요
+    "review": 3.0,
+}
+
+
+def compute_reward(
+    interaction_type: Optional[str],
+    reward: Optional[float] = None,
+    completion_rate: Optional[float] = None
+) -> float:
+    """
+    상호작용 보상 계산
+
+    명시적 reward가 있으면 그대로 사용하고, 없으면 타입별 기본 보상을 사용합니다.
+    시청(watch)은 완료율에 비례합니다.
+    """
+    if reward is not None:
+        return float(reward)
+
+    base = REWARD_BY_TYPE.get(interaction_type or "view", 1.0)
+    if interaction_type == "watch" and completion_rate is not None:
+        return base * max(0.0, min(1.0, completion_rate))
+    return base
+
+
+class InteractionLog:
+    """
+    상호작용 write-ahead log (JSON Lines)
+
+    각 레코드는 한 줄로 append + fsync되므로, 프로세스가 죽어도
+    체크포인트 이후의 상호작용은 재시작 시 다시 반영됩니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def append(self, record: Dict):
+        """레코드 1건 기록"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def size(self) -> int:
+        """WAL 크기 (바이트)"""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def inode(self) -> Optional[int]:
+        """WAL 파일 식별자 (truncate로 새 파일이 되면 바뀜, 파일이 없으면 None)"""
+        try:
+            return self.path.stat().st_ino
+        except FileNotFoundError:
+            return None
+
+    def read_from(self, offset: int, max_records: int) -> Tuple[List[Dict], int]:
+        """
+        offset부터 최대 max_records건 읽기
+
+        Returns:
+            (records, 다음 offset) - 아직 끝나지 않은 마지막 줄은 건너뜁니다.
+        """
+        records = []
+        if not self.path.exists():
+            return records, offset
+
+        # 체크포인트 갱신 전에 WAL이 비워졌던 경우
+        if offset > self.size():
+            offset = 0
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            while len(records) < max_records:
+                line = f.readline()
+                if not line or not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"⚠️  Skipping corrupt WAL record at offset {offset - len(line)}")
+
+        return records, offset
+
+    def truncate(self):
+        """
+        모두 반영된 WAL 비우기
+
+        빈 새 파일로 교체하므로 inode가 바뀝니다. 비운 뒤 offset 저장 전에 죽어도
+        체크포인트의 wal_inode와 달라 이전 offset을 버릴 수 있습니다.
+        """
+        tmp_file = self.path.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8"):
+            pass
+        os.replace(tmp_file, self.path)
+
+
+class OnlineBanditTrainer:
+    """
+    ContextualBandit 온라인 학습기
+
+    반영된 WAL offset은 bandit 체크포인트의 metadata에 WAL inode와 함께 저장되므로,
+    체크포인트와 WAL만으로 상태를 정확히 복구할 수 있습니다.
+    (WAL이 비워져 inode가 바뀌었으면 offset은 새 WAL의 처음부터)
+    """
+
+    WAL_FILE = "interactions.wal"
+    REJECTED_FILE = "interactions.rejected"  # 반영에 실패한 레코드 (오류 메시지와 함께 격리)
+    LOCK_FILE = "trainer.lock"
+
+    def __init__(self, model_dir: str = None, batch_size: int = None):
+        self.model_dir = Path(model_dir or settings.RL_MODEL_PATH)
+        self.batch_size = batch_size or settings.RL_UPDATE_BATCH_SIZE
+        self.log = InteractionLog(self.model_dir / self.WAL_FILE)
+        self.rejected = InteractionLog(self.model_dir / self.REJECTED_FILE)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """프로세스 내 + 프로세스 간 잠금"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.model_dir / self.LOCK_FILE, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def record(
+        self,
+        user_id: int,
+        movie_id: int,
+        reward: float,
+        context: Optional[Dict] = None
+    ):
+        """상호작용을 WAL에 기록"""
+        with self._locked():
+            self.log.append({
+                "user_id": user_id,
+                "movie_id": movie_id,
+                "reward": reward,
+                "context": context or {},
+                "timestamp": time.time(),  # 반영 시 시간대/요일 특징을 상호작용 시각 기준으로
+            })
+
+    def should_apply(self) -> bool:
+        """반영 대기 중인 레코드가 micro-batch 하나 이상 쌓였는지"""
+        records, _ = self.log.read_from(self._applied_offset(), self.batch_size)
+        return len(records) >= self.batch_size
+
+    def _applied_offset(self) -> int:
+        from .recommender import get_recommender
+
+        agent = get_recommender().rl_agent
+        return self._wal_offset(agent) if agent else 0
+
+    def _wal_offset(self, agent) -> int:
+        """체크포인트의 offset (저장된 WAL inode가 현재 WAL과 다르면 0)"""
+        inode = agent.metadata.get("wal_inode")
+        if inode is not None and inode != self.log.inode():
+            return 0
+        return agent.metadata.get("wal_offset", 0)
+
+    def apply_pending(self) -> int:
+        """
+        WAL에 쌓인 상호작용을 micro-batch로 bandit에 반영하고 체크포인트 저장
+
+        반영 중 예외가 난 레코드는 REJECTED_FILE로 옮기고 건너뜁니다
+        (잘못된 레코드 하나 때문에 offset이 멈춰 학습이 영원히 막히지 않도록).
+
+        Returns:
+            반영한 상호작용 수
+        """
+        from .recommender import get_recommender
+
+        recommender = get_recommender()
+        if recommender.rl_agent is None:
+            return 0
+
+        with self._locked():
+            # 다른 워커가 먼저 반영했다면 그 체크포인트부터 이어서
+            recommender.sync_rl_agent()
+            agent = recommender.rl_agent
+            offset = self._wal_offset(agent)
+
+            applied = 0
+            processed = 0
+            while True:
+                records, offset = self.log.read_from(offset, self.batch_size)
+                if not records:
+                    break
+
+                for record in records:
+                    try:
+                        context = {"timestamp": record.get("timestamp"), **(record.get("context") or {})}
+                        context_vector = recommender._build_context_vector(record["user_id"], context)
+                        agent.update(record["movie_id"], context_vector, float(record["reward"]))
+                        applied += 1
+                    except Exception as e:
+                        print(f"⚠️  Skipping WAL record that failed to apply: {e!r}")
+                        self.rejected.append({"record": record, "error": repr(e), "rejected_at": time.time()})
+                processed += len(records)
+
+            if processed == 0:
+                return 0
+
+            agent.metadata["wal_offset"] = offset
+            agent.metadata["wal_inode"] = self.log.inode()
+            agent.save(str(self.model_dir))
+
+            # 모두 반영했으면 WAL을 비우고 offset 초기화 (체크포인트 저장 후)
+            if offset >= self.log.size():
+                self.log.truncate()
+                agent.metadata["wal_offset"] = 0
+                agent.metadata["wal_inode"] = self.log.inode()
+                agent.save_manifest(str(self.model_dir))
+
+            recommender.mark_rl_checkpoint()
+
+        return applied
+
+
+# 싱글톤 인스턴스
+_trainer = None
+
+
+def get_online_trainer() -> OnlineBanditTrainer:
+    """온라인 학습기 싱글톤"""
+    global _trainer
+    if _trainer is None:
+        _trainer = OnlineBanditTrainer()
+    return _trainer
@@ -0,0 +1,224 @@
+"""
+사용자별 추천 결과 캐시
+- 사용자의 Top-N 후보 리스트를 모델 버전과 함께 저장 (TTL: CACHE_TTL)
+- 사용자가 상호작용/리뷰를 남기면 즉시 무효화 (사용자별 세대 증가)
+- 계산 시작 전에 읽은 세대가 그대로일 때만 저장하므로, 계산 중 무효화되면 오래된 결과를 쓰지 않음
+- 활성 사용자 캐시를 백그라운드에서 미리 채움 (warm_active_users)
+
+ENABLE_REDIS가 켜져 있으면 Redis를 사용해 워커 간에 공유하고,
+아니면 프로세스 내 LRU를 사용합니다.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from ..config import settings
+
+
+class RecommendationCache:
+    """
+    추천 후보 캐시
+
+    항목: {"items": [[movie_id, score], ...], "model_version": str, "limit": int, "created_at": float}
+    limit은 계산 시 요청한 후보 수로, 카탈로그가 작아 items가 더 짧아도 완전한 결과임을 나타냅니다.
+    """
+
+    KEY_PREFIX = "rec:v1:"
+
+    def __init__(self, ttl: int = None, max_users: int = None):
+        self.ttl = ttl or settings.CACHE_TTL
+        self.max_users = max_users or settings.RECOMMENDATION_CACHE_MAX_USERS
+        self.hits = 0
+        self.misses = 0
+
+        self._local: "OrderedDict[int, dict]" = OrderedDict()
+        self._generations: dict = {}  # user_id → 무효화 세대 (무효화된 적 있는 사용자만)
+        self._lock = threading.Lock()
+        self._redis = self._connect_redis()
+
+    def _connect_redis(self):
+        if not (settings.ENABLE_REDIS and settings.REDIS_URL):
+            return None
+        try:
+            import redis
+            client = redis.Redis.from_url(settings.REDIS_URL)
+            client.ping()
+            return client
+        except Exception as e:
+            print(f"⚠️  Redis unavailable ({e}). Using in-process recommendation cache.")
+            return None
+
+    def get(self, user_id: int, model_version: str, limit: int) -> Optional[List[Tuple[int, float]]]:
+        """
+        캐시된 후보 조회
+
+        만료됐거나, 모델 버전이 다르거나, 요청보다 적게 계산된 경우 None
+        """
+        entry = self._read(user_id)
+        if (
+            entry is None
+            or entry["model_version"] != model_version
+            or entry["limit"] < limit
+            or time.time() - entry["created_at"] > self.ttl
+        ):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [(movie_id, score) for movie_id, score in entry["items"][:limit]]
+
+    def generation(self, user_id: int) -> int:
+        """사용자 무효화 세대 (invalidate마다 증가) - 계산 시작 전에 읽어 set에 전달"""
+        if self._redis is not None:
+            return int(self._redis.get(f"{self.KEY_PREFIX}gen:{user_id}") or 0)
+
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def set(
+        self,
+        user_id: int,
+        items: List[Tuple[int, float]],
+        model_version: str,
+        limit: int,
+        generation: Optional[int] = None,
+    ):
+        """
+        후보 저장
+
+        generation이 주어졌는데 그 사이 invalidate로 세대가 바뀌었으면 저장하지 않습니다.
+        """
+        entry = {
+            "items": [[int(movie_id), float(score)] for movie_id, score in items],
+            "model_version": model_version,
+            "limit": limit,
+            "created_at": time.time(),
+        }
+
+        if self._redis is not None:
+            self._set_redis(user_id, entry, generation)
+            return
+
+        with self._lock:
+            if generation is not None and self._generations.get(user_id, 0) != generation:
+                return
+            self._local[user_id] = entry
+            self._local.move_to_end(user_id)
+            while len(self._local) > self.max_users:
+                self._local.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        """사용자 캐시 무효화 (상호작용/리뷰 발생 시)"""
+        if self._redis is not None:
+            pipe = self._redis.pipeline()
+            pipe.incr(f"{self.KEY_PREFIX}gen:{user_id}")
+            pipe.expire(f"{self.KEY_PREFIX}gen:{user_id}", self.ttl)
+            pipe.delete(f"{self.KEY_PREFIX}{user_id}")
+            pipe.execute()
+            return
+
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._local.pop(user_id, None)
+
+    def _set_redis(self, user_id: int, entry: dict, generation: Optional[int]):
+        """세대 키를 WATCH해 세대 확인과 저장을 원자적으로 (그 사이 무효화되면 포기)"""
+        from redis.exceptions import WatchError
+
+        key = f"{self.KEY_PREFIX}{user_id}"
+        with self._redis.pipeline() as pipe:
+            try:
+                pipe.watch(f"{self.KEY_PREFIX}gen:{user_id}")
+                if generation is not None and int(pipe.get(f"{self.KEY_PREFIX}gen:{user_id}") or 0) != generation:
+                    return
+                pipe.multi()
+                pipe.setex(key, self.ttl, json.dumps(entry))
+                pipe.execute()
+            except WatchError:
+                pass
+
+    def contains(self, user_id: int, model_version: str) -> bool:
+        """유효한 캐시가 있는지 (통계에 반영하지 않음)"""
+        entry = self._read(user_id)
+        return (
+            entry is not None
+            and entry["model_version"] == model_version
+            and time.time() - entry["created_at"] <= self.ttl
+        )
+
+    def _read(self, user_id: int) -> Optional[dict]:
+        if self._redis is not None:
+            raw = self._redis.get(f"{self.KEY_PREFIX}{user_id}")
+            return json.loads(raw) if raw else None
+
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is not None:
+                self._local.move_to_end(user_id)
+            return entry
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "cached_users": len(self._local) if self._redis is None else None,
+        }
+
+
+def warm_active_users(limit: int = None) -> int:
+    """
+    활성 사용자 추천 캐시 예열 (배치 작업)
+
+    최근 RECOMMENDATION_CACHE_ACTIVE_DAYS일 내 상호작용이 있는 사용자 중
+    유효한 캐시가 없는 사용자의 후보를 미리 계산합니다.
+
+    Returns:
+        새로 계산한 사용자 수
+    """
+    from ..database import SessionLocal
+    from ..models import Interaction
+    from .recommender import get_recommender
+
+    recommender = get_recommender()
+    cache = get_recommendation_cache()
+    since = datetime.utcnow() - timedelta(days=settings.RECOMMENDATION_CACHE_ACTIVE_DAYS)
+
+    db = SessionLocal()
+    try:
+        query = db.query(Interaction.user_id).filter(
+            Interaction.created_at >= since
+        ).distinct()
+        if limit:
+            query = query.limit(limit)
+        user_ids = [row.user_id for row in query.all()]
+    finally:
+        db.close()
+
+    model_version = recommender.model_version
+    warmed = 0
+    for user_id in user_ids:
+        if cache.contains(user_id, model_version):
+            continue
+        recommender.get_candidates(user_id, settings.RECOMMENDATION_CACHE_SIZE)
+        warmed += 1
+
+    return warmed
+
+
+# 싱글톤 인스턴스
+_recommendation_cache = None
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    """추천 캐시 싱글톤"""
+    global _recommendation_cache
+    if _recommendation_cache is None:
+        _recommendation_cache = RecommendationCache()
+    return _recommendation_cache
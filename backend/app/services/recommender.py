@@ -11,8 +11,16 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from ..config import settings
+from .feature_assembler import FEATURE_DIM, FeatureAssembler
 
 def get_device():
     """Get device (CPU/GPU)"""
@@ -87,14 +95,44 @@ class NCFModel(nn.Module):
         return self.item_embedding(torch.tensor([item_id]))
 
 
+class MeanSAGEConv(nn.Module):
+    """
+    torch_geometric 없이 동작하는 SAGEConv (mean aggregation)
+    
+    torch_geometric.nn.SAGEConv와 같은 파라미터 이름(lin_l, lin_r)과
+    입력 형식(x 또는 (x_src, x_dst), edge_index)을 사용합니다.
+    """
+    
+    def __init__(self, in_channels: int, out_channels: int):
+        super().__init__()
+        self.lin_l = nn.Linear(in_channels, out_channels)  # 이웃 집계
+        self.lin_r = nn.Linear(in_channels, out_channels, bias=False)  # 자기 자신
+    
+    def forward(self, x, edge_index):
+        x_src, x_dst = x if isinstance(x, tuple) else (x, x)
+        src, dst = edge_index
+        
+        agg = torch.zeros(x_dst.size(0), x_src.size(1), dtype=x_src.dtype, device=x_src.device)
+        agg.index_add_(0, dst, x_src.index_select(0, src))
+        deg = torch.zeros(x_dst.size(0), dtype=x_src.dtype, device=x_src.device)
+        deg.index_add_(0, dst, torch.ones_like(dst, dtype=x_src.dtype))
+        agg = agg / deg.clamp(min=1).unsqueeze(-1)
+        
+        return self.lin_l(agg) + self.lin_r(x_dst)
+
+
 class GraphSAGERecommender(nn.Module):
     """
     Graph Neural Network for Recommendations
     
     GraphSAGE를 사용하여 영화-배우-감독 그래프에서 추천
+    
+    - forward: 전체 그래프 (작은 그래프용)
+    - forward_blocks: 이웃 샘플링된 mini-batch (학습용)
+    - inference_layer: 레이어 단위 전체 노드 추론 (gnn_pipeline.layerwise_inference)
     """
     
-    def __init__(self, in_channels: int, hidden_channels: int, out_channels: int):
+    def __init__(self, in_channels: int, hidden_channels: int, out_channels: int, num_layers: int = None):
         super().__init__()
         
         if not settings.ENABLE_GNN:
@@ -102,16 +140,21 @@ class GraphSAGERecommender(nn.Module):
         
         try:
             from torch_geometric.nn import SAGEConv
-            
-            self.conv1 = SAGEConv(in_channels, hidden_channels)
-            self.conv2 = SAGEConv(hidden_channels, hidden_channels)
-            self.conv3 = SAGEConv(hidden_channels, out_channels)
-            
-            self.dropout = nn.Dropout(0.2)
-            
         except ImportError:
-            print("⚠️  torch_geometric not installed. GNN disabled.")
-            settings.ENABLE_GNN = False
+            print("⚠️  torch_geometric not installed. Using pure PyTorch SAGEConv.")
+            SAGEConv = MeanSAGEConv
+        
+        num_layers = num_layers or settings.GNN_NUM_LAYERS
+        dims = [in_channels] + [hidden_channels] * (num_layers - 1) + [out_channels]
+        self.convs = nn.ModuleList(
+            SAGEConv(dims[i], dims[i + 1]) for i in range(num_layers)
+        )
+        
+        self.dropout = nn.Dropout(0.2)
+    
+    @property
+    def num_layers(self) -> int:
+        return len(self.convs)
     
     def forward(self, x, edge_index):
         """
@@ -127,21 +170,36 @@ class GraphSAGERecommender(nn.Module):
         if not settings.ENABLE_GNN:
             return x
         
-        # 1st layer
-        x = self.conv1(x, edge_index)
-        x = F.relu(x)
-        x = self.dropout(x)
+        for i in range(self.num_layers):
+            x = self.inference_layer(i, x, x, edge_index)
         
-        # 2nd layer
-        x = self.conv2(x, edge_index)
-        x = F.relu(x)
-        x = self.dropout(x)
+        return x
+    
+    def forward_blocks(self, x, blocks: List[Tuple[torch.Tensor, int]]):
+        """
+        이웃 샘플링 mini-batch forward
         
-        # 3rd layer
-        x = self.conv3(x, edge_index)
+        Args:
+            x: 입력 노드 특징 [num_input_nodes, in_channels]
+            blocks: 레이어별 (edge_index, num_dst) - 입력 → 출력 순서
+                    각 블록의 목적지 노드는 소스 노드의 앞 num_dst개입니다.
+            
+        Returns:
+            seed_embeddings: [num_seed_nodes, out_channels]
+        """
+        for i, (edge_index, num_dst) in enumerate(blocks):
+            x = self.inference_layer(i, x, x[:num_dst], edge_index)
         
         return x
     
+    def inference_layer(self, i: int, x_src, x_dst, edge_index):
+        """i번째 레이어 (마지막 레이어 외에는 ReLU + Dropout)"""
+        x = self.convs[i]((x_src, x_dst), edge_index)
+        if i < self.num_layers - 1:
+            x = F.relu(x)
+            x = self.dropout(x)
+        return x
+    
     def recommend(self, user_embedding: torch.Tensor, movie_embeddings: torch.Tensor, top_k: int = 10):
         """
         GNN 기반 추천
@@ -170,11 +228,16 @@ class SequentialRecommender(nn.Module):
     Sequential Recommendation with Transformer
     
     사용자의 시청 히스토리 순서를 고려한 추천
+    
+    서빙 시에는 전체 히스토리를 매번 다시 인코딩하지 않고
+    사용자별 인코더 상태(GRU/LSTM: hidden state, Transformer: layer별 KV cache)를
+    새 상호작용마다 한 스텝씩 갱신합니다 (init_state / step).
     """
     
     def __init__(self, num_items: int, embedding_dim: int = 128):
         super().__init__()
         
+        self.num_items = num_items
         self.item_embedding = nn.Embedding(num_items, embedding_dim)
         self.position_embedding = nn.Embedding(settings.SEQUENCE_LENGTH, embedding_dim)
         
@@ -218,49 +281,286 @@ class SequentialRecommender(nn.Module):
         
         # Encode sequence
         if settings.SEQUENTIAL_MODEL == "transformer":
-            encoded = self.encoder(x)  # [batch, seq_len, emb_dim]
+            # Causal mask: 각 위치는 이전 아이템만 참조 (KV cache 서빙과 동일한 결과)
+            mask = nn.Transformer.generate_square_subsequent_mask(seq_len, device=item_sequence.device)
+            encoded = self.encoder(x, mask=mask, is_causal=True)  # [batch, seq_len, emb_dim]
             # Last token
             encoded = encoded[:, -1, :]  # [batch, emb_dim]
         else:  # GRU/LSTM
             _, hidden = self.encoder(x)
+            if settings.SEQUENTIAL_MODEL == "lstm":
+                hidden = hidden[0]
             encoded = hidden[-1]  # [batch, emb_dim]
         
         # Output
         logits = self.output(encoded)  # [batch, num_items]
         
         return logits
+    
+    # ========== 서빙: 증분 인코딩 ==========
+    
+    def init_state(self, item_ids: List[int]) -> Dict:
+        """
+        히스토리로 사용자 인코더 상태 생성 (한 번의 prefill)
+        
+        Args:
+            item_ids: 시간순 아이템 ID (마지막 SEQUENCE_LENGTH개만 사용)
+            
+        Returns:
+            state: {"items", "hidden" | "kv_cache", "encoded"}
+        """
+        item_ids = list(item_ids)[-settings.SEQUENCE_LENGTH:]
+        state = {"items": [], "hidden": None, "kv_cache": None, "encoded": None}
+        if item_ids:
+            self._encode(state, item_ids)
+        return state
+    
+    def step(self, state: Dict, item_id: int) -> Dict:
+        """
+        새 상호작용 1건으로 상태 갱신
+        
+        윈도우(SEQUENCE_LENGTH)가 가득 차면 최근 절반으로 다시 prefill하므로
+        재인코딩 비용은 스텝당 상수로 분할 상환됩니다.
+        """
+        if len(state["items"]) >= settings.SEQUENCE_LENGTH:
+            keep = state["items"][-(settings.SEQUENCE_LENGTH // 2):]
+            return self.init_state(keep + [item_id])
+        
+        self._encode(state, [item_id])
+        return state
+    
+    def score_candidates(self, state: Dict, candidate_ids: List[int]) -> np.ndarray:
+        """
+        후보 아이템에 대해서만 다음 아이템 logit 계산
+        
+        전체 num_items 출력층 대신 후보 행만 골라 [num_candidates] 크기로 계산합니다.
+        """
+        if state["encoded"] is None or not candidate_ids:
+            return np.zeros(len(candidate_ids), dtype=np.float32)
+        
+        index = torch.as_tensor(candidate_ids, dtype=torch.long, device=state["encoded"].device)
+        weight = self.output.weight.index_select(0, index)  # [num_candidates, emb_dim]
+        bias = self.output.bias.index_select(0, index)
+        logits = weight @ state["encoded"] + bias
+        
+        return logits.detach().cpu().numpy()
+    
+    @torch.no_grad()
+    def _encode(self, state: Dict, new_items: List[int]):
+        """new_items를 기존 상태 뒤에 이어서 인코딩"""
+        device = self.item_embedding.weight.device
+        start = len(state["items"])
+        
+        items = torch.as_tensor(new_items, dtype=torch.long, device=device).unsqueeze(0)
+        positions = torch.arange(start, start + len(new_items), device=device).unsqueeze(0)
+        x = self.item_embedding(items) + self.position_embedding(positions)  # [1, n, emb_dim]
+        
+        if settings.SEQUENTIAL_MODEL == "transformer":
+            if state["kv_cache"] is None:
+                state["kv_cache"] = [None] * len(self.encoder.layers)
+            for i, layer in enumerate(self.encoder.layers):
+                x, state["kv_cache"][i] = self._cached_layer(layer, x, state["kv_cache"][i])
+            if self.encoder.norm is not None:
+                x = self.encoder.norm(x)
+            state["encoded"] = x[0, -1]
+        else:  # GRU/LSTM
+            _, hidden = self.encoder(x, state["hidden"])
+            state["hidden"] = hidden
+            h = hidden[0] if settings.SEQUENTIAL_MODEL == "lstm" else hidden
+            state["encoded"] = h[-1, 0]
+        
+        state["items"].extend(new_items)
+    
+    @staticmethod
+    def _cached_layer(layer: nn.TransformerEncoderLayer, x: torch.Tensor, cache):
+        """
+        TransformerEncoderLayer 1개를 KV cache와 함께 실행 (eval 모드 전용)
+        
+        Args:
+            x: 새 토큰 [1, n, emb_dim]
+            cache: (K, V) [1, heads, past_len, head_dim] 또는 None
+        """
+        attn = layer.self_attn
+        num_heads = attn.num_heads
+        _, n, dim = x.shape
+        head_dim = dim // num_heads
+        
+        def self_attention(h):
+            nonlocal cache
+            q, k, v = F.linear(h, attn.in_proj_weight, attn.in_proj_bias).chunk(3, dim=-1)
+            q, k, v = (t.view(1, n, num_heads, head_dim).transpose(1, 2) for t in (q, k, v))
+            
+            if cache is not None:
+                k = torch.cat([cache[0], k], dim=2)
+                v = torch.cat([cache[1], v], dim=2)
+            cache = (k, v)
+            
+            # 새 토큰 i는 과거 전체 + 자신까지만 참조
+            past = k.shape[2] - n
+            mask = torch.ones(n, k.shape[2], dtype=torch.bool, device=h.device).tril(diagonal=past)
+            out = F.scaled_dot_product_attention(q, k, v, attn_mask=mask)
+            out = out.transpose(1, 2).reshape(1, n, dim)
+            return attn.out_proj(out)
+        
+        def feed_forward(h):
+            return layer.linear2(layer.activation(layer.linear1(h)))
+        
+        if layer.norm_first:
+            x = x + self_attention(layer.norm1(x))
+            x = x + feed_forward(layer.norm2(x))
+        else:
+            x = layer.norm1(x + self_attention(x))
+            x = layer.norm2(x + feed_forward(x))
+        
+        return x, cache
+
+
+class SequentialSessionCache:
+    """
+    사용자별 Sequential 인코더 상태 캐시 (LRU)
+    
+    각 항목은 인코더 상태와 마지막으로 반영한 Interaction ID를 가지므로,
+    이후 요청에서는 새 상호작용만 조회해 step으로 갱신합니다.
+    
+    step은 상태를 제자리에서 갱신하므로 조회 → 갱신 → 점수 계산 동안 user_lock(user_id)을 잡습니다.
+    (요청 스레드와 캐시 예열 스레드가 같은 사용자를 동시에 처리할 수 있음)
+    """
+    
+    LOCK_STRIPES = 64  # 사용자별 락 (user_id % LOCK_STRIPES, 메모리 고정)
+    
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, Tuple[Dict, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._user_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+    
+    def user_lock(self, user_id: int) -> threading.Lock:
+        return self._user_locks[user_id % self.LOCK_STRIPES]
+    
+    def get(self, user_id: int) -> Optional[Tuple[Dict, int]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+            return entry
+    
+    def put(self, user_id: int, state: Dict, last_interaction_id: int):
+        with self._lock:
+            self._entries[user_id] = (state, last_interaction_id)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
 
 
 class ContextualBandit:
     """
-    Reinforcement Learning - Contextual Bandit
+    Reinforcement Learning - Contextual Bandit (LinUCB)
     
     사용자 컨텍스트를 고려한 최적 추천 (Exploration vs Exploitation)
+    
+    - arm별 A⁻¹를 Sherman–Morrison rank-1 업데이트로 직접 유지 (역행렬 계산 없음)
+    - 모든 arm의 A⁻¹, b, θ를 하나의 stacked float32 배열에 저장
+    - arm은 처음 업데이트될 때 lazy 할당 → 메모리는 카탈로그가 아닌 활성 arm 수에 비례
+    - save/load로 .npy 체크포인트 저장, memory-map으로 로딩 (워커 간 페이지 공유)
     """
     
-    def __init__(self, num_arms: int, context_dim: int):
+    MANIFEST_FILE = "manifest.json"
+    ARRAY_FILES = ("A_inv", "b", "theta", "arms")
+    CHECKPOINT_PREFIX = "ckpt-"  # 저장할 때마다 새 디렉터리 (ckpt-<time_ns>)
+    KEEP_CHECKPOINTS = 3  # 다른 워커가 아직 읽고 있을 수 있는 이전 체크포인트 보존 수
+    
+    def __init__(self, num_arms: int, context_dim: int, initial_capacity: int = 64):
         """
         Args:
-            num_arms: 영화 개수
+            num_arms: 영화 개수 (카탈로그 크기, 사전 할당에는 사용하지 않음)
             context_dim: 컨텍스트 차원 (사용자 특징 + 시간 + 기기 등)
+            initial_capacity: 처음 확보할 arm 슬롯 수 (부족하면 2배씩 증가)
         """
         self.num_arms = num_arms
         self.context_dim = context_dim
         
-        # Linear reward model for each arm
-        self.weights = {}  # arm_id -> weight vector
-        for arm in range(num_arms):
-            self.weights[arm] = np.zeros(context_dim)
-        
-        # Confidence bounds
-        self.A = {}  # arm_id -> A matrix
-        self.b = {}  # arm_id -> b vector
+        # arm_id -> stacked 배열의 행 번호
+        self.arm_index: Dict[int, int] = {}
         
-        for arm in range(num_arms):
-            self.A[arm] = np.identity(context_dim)
-            self.b[arm] = np.zeros(context_dim)
+        capacity = max(1, initial_capacity)
+        self.A_inv = np.empty((capacity, context_dim, context_dim), dtype=np.float32)  # arm별 A⁻¹
+        self.b = np.empty((capacity, context_dim), dtype=np.float32)  # arm별 보상 가중 컨텍스트 합
+        self.theta = np.empty((capacity, context_dim), dtype=np.float32)  # arm별 A⁻¹b
         
         self.alpha = settings.RL_EPSILON  # Exploration parameter
+        
+        # 체크포인트와 함께 저장되는 부가 정보 (예: 반영된 WAL offset)
+        self.metadata: Dict = {}
+        self.checkpoint_dir: Optional[str] = None  # manifest가 가리키는 배열 디렉터리 이름
+    
+    @property
+    def num_active_arms(self) -> int:
+        """한 번 이상 업데이트된 arm 수"""
+        return len(self.arm_index)
+    
+    def _allocate(self, arm: int) -> int:
+        """arm 슬롯 할당 (A⁻¹ = I, b = θ = 0으로 초기화)"""
+        row = self.arm_index.get(arm)
+        if row is not None:
+            return row
+        
+        row = len(self.arm_index)
+        if row >= self.A_inv.shape[0]:
+            self._grow(2 * self.A_inv.shape[0])
+        
+        self.A_inv[row] = np.identity(self.context_dim, dtype=np.float32)
+        self.b[row] = 0.0
+        self.theta[row] = 0.0
+        self.arm_index[arm] = row
+        return row
+    
+    def _grow(self, capacity: int):
+        """stacked 배열 용량 확장 (기존 arm 복사)"""
+        n = len(self.arm_index)
+        d = self.context_dim
+        
+        A_inv = np.empty((capacity, d, d), dtype=np.float32)
+        b = np.empty((capacity, d), dtype=np.float32)
+        theta = np.empty((capacity, d), dtype=np.float32)
+        A_inv[:n] = self.A_inv[:n]
+        b[:n] = self.b[:n]
+        theta[:n] = self.theta[:n]
+        
+        self.A_inv, self.b, self.theta = A_inv, b, theta
+    
+    def ucb_scores(self, context: np.ndarray, candidate_arms: List[int]) -> np.ndarray:
+        """
+        후보 arm 전체의 UCB 점수를 한 번에 계산
+        
+        Args:
+            context: [context_dim] 현재 컨텍스트
+            candidate_arms: 후보 영화 ID 리스트
+            
+        Returns:
+            scores: [len(candidate_arms)] θᵀx + α·sqrt(xᵀA⁻¹x)
+        """
+        x = np.asarray(context, dtype=np.float32)
+        rows = np.fromiter(
+            (self.arm_index.get(arm, -1) for arm in candidate_arms),
+            dtype=np.int64,
+            count=len(candidate_arms)
+        )
+        
+        # 미할당 arm: A⁻¹ = I, θ = 0 → UCB = α·‖x‖
+        scores = np.full(len(candidate_arms), self.alpha * np.sqrt(x @ x), dtype=np.float32)
+        
+        known = rows >= 0
+        if known.any():
+            idx = rows[known]
+            pred_reward = self.theta[idx] @ x
+            variance = np.einsum("i,nij,j->n", x, self.A_inv[idx], x)
+            scores[known] = pred_reward + self.alpha * np.sqrt(np.maximum(variance, 0.0))
+        
+        return scores
     
     def select_arm(self, context: np.ndarray, candidate_arms: List[int]) -> int:
         """
@@ -273,43 +573,193 @@ class ContextualBandit:
         Returns:
             selected_arm: 선택된 영화 ID
         """
-        best_arm = None
-        best_ucb = -float('inf')
+        scores = self.ucb_scores(context, candidate_arms)
+        return candidate_arms[int(np.argmax(scores))]
+    
+    def rank_arms(
+        self,
+        context: np.ndarray,
+        candidate_arms: List[int],
+        k: int,
+        groups: Optional[Dict[int, str]] = None,
+        max_per_group: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        UCB 점수를 한 번만 계산해 Top-K arm 선택 (select_arm 반복 호출 대체)
         
-        for arm in candidate_arms:
-            # Predicted reward
-            theta = self.weights.get(arm, np.zeros(self.context_dim))
-            pred_reward = np.dot(theta, context)
-            
-            # Confidence bound
-            A_inv = np.linalg.inv(self.A.get(arm, np.identity(self.context_dim)))
-            cb = self.alpha * np.sqrt(context.T @ A_inv @ context)
-            
-            # UCB
-            ucb = pred_reward + cb
+        Args:
+            context: [context_dim] 현재 컨텍스트
+            candidate_arms: 후보 영화 ID 리스트
+            k: 선택할 arm 수
+            groups: 다양성 제약용 arm_id -> 그룹 (예: 장르), 선택사항
+            max_per_group: 그룹별 최대 선택 수 (groups와 함께 사용)
             
-            if ucb > best_ucb:
-                best_ucb = ucb
-                best_arm = arm
+        Returns:
+            [(arm_id, ucb_score), ...] UCB 내림차순
+        """
+        if not candidate_arms or k <= 0:
+            return []
+        
+        scores = self.ucb_scores(context, candidate_arms)
+        k = min(k, len(candidate_arms))
+        
+        # 다양성 제약 없음: argpartition으로 Top-K만 정렬
+        if not groups or max_per_group is None:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(candidate_arms[i], float(scores[i])) for i in top]
         
-        return best_arm if best_arm is not None else candidate_arms[0]
+        # 다양성 제약: UCB 순으로 훑으며 그룹별 상한 적용
+        selected = []
+        group_counts: Dict[str, int] = {}
+        for i in np.argsort(-scores, kind="stable"):
+            arm = candidate_arms[i]
+            group = groups.get(arm)
+            if group is not None:
+                if group_counts.get(group, 0) >= max_per_group:
+                    continue
+                group_counts[group] = group_counts.get(group, 0) + 1
+            selected.append((arm, float(scores[i])))
+            if len(selected) == k:
+                break
+        
+        return selected
     
     def update(self, arm: int, context: np.ndarray, reward: float):
         """
         보상 받은 후 모델 업데이트
         
+        A ← A + xxᵀ 에 대해 Sherman–Morrison으로 A⁻¹을 직접 갱신:
+        A⁻¹ ← A⁻¹ - (A⁻¹x)(A⁻¹x)ᵀ / (1 + xᵀA⁻¹x)
+        
         Args:
             arm: 선택한 영화 ID
             context: 컨텍스트
             reward: 실제 보상 (클릭=1, 시청완료=2, 좋아요=3)
         """
-        # Update A and b
-        self.A[arm] += np.outer(context, context)
-        self.b[arm] += reward * context
+        x = np.asarray(context, dtype=np.float32)
+        row = self._allocate(arm)
+        
+        A_inv = self.A_inv[row]
+        A_inv_x = A_inv @ x  # A⁻¹은 대칭이므로 xᵀA⁻¹ = (A⁻¹x)ᵀ
+        A_inv -= np.outer(A_inv_x, A_inv_x) / (1.0 + x @ A_inv_x)
         
-        # Update weights
-        A_inv = np.linalg.inv(self.A[arm])
-        self.weights[arm] = A_inv @ self.b[arm]
+        self.b[row] += reward * x
+        self.theta[row] = A_inv @ self.b[row]
+    
+    def save(self, path: str):
+        """
+        체크포인트 저장
+        
+        활성 arm 배열을 새 디렉터리(ckpt-<time_ns>)에 모두 쓴 뒤 manifest가 그 디렉터리를
+        가리키도록 교체합니다. 기존 파일을 덮어쓰지 않으므로 다른 워커가 잠금 없이 load해도
+        manifest와 배열이 항상 같은 체크포인트입니다.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        n = len(self.arm_index)
+        arms = np.empty(n, dtype=np.int64)
+        for arm, row in self.arm_index.items():
+            arms[row] = arm
+        
+        arrays = {
+            "A_inv": self.A_inv[:n],
+            "b": self.b[:n],
+            "theta": self.theta[:n],
+            "arms": arms,
+        }
+        checkpoint_dir = f"{self.CHECKPOINT_PREFIX}{time.time_ns()}"
+        tmp_dir = directory / f"{checkpoint_dir}.tmp"
+        tmp_dir.mkdir()
+        for name, array in arrays.items():
+            with open(tmp_dir / f"{name}.npy", "wb") as f:
+                np.save(f, array)
+        os.replace(tmp_dir, directory / checkpoint_dir)
+        
+        self.checkpoint_dir = checkpoint_dir
+        self.save_manifest(path)
+        self._prune_checkpoints(directory)
+    
+    def _prune_checkpoints(self, directory: Path):
+        """최근 KEEP_CHECKPOINTS개만 남기고 이전 체크포인트 디렉터리 삭제 (memory-map 중인 파일은 POSIX에서 안전)"""
+        checkpoints = sorted(
+            (p for p in directory.glob(f"{self.CHECKPOINT_PREFIX}*") if p.is_dir() and not p.name.endswith(".tmp")),
+            key=lambda p: p.name
+        )
+        for old in checkpoints[:-self.KEEP_CHECKPOINTS]:
+            if old.name != self.checkpoint_dir:
+                shutil.rmtree(old, ignore_errors=True)
+    
+    def save_manifest(self, path: str):
+        """manifest만 갱신 (metadata 변경 시 배열을 다시 쓰지 않음)"""
+        directory = Path(path)
+        manifest = {
+            "num_arms": self.num_arms,
+            "context_dim": self.context_dim,
+            "num_active_arms": len(self.arm_index),
+            "checkpoint": self.checkpoint_dir,
+            "metadata": self.metadata,
+        }
+        tmp_manifest = directory / f"{self.MANIFEST_FILE}.tmp"
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_manifest, directory / self.MANIFEST_FILE)
+    
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "c") -> Optional["ContextualBandit"]:
+        """
+        체크포인트 로딩
+        
+        기본 mmap_mode="c"(copy-on-write)는 여러 워커가 같은 파일 페이지를 공유하고,
+        업데이트된 arm의 페이지만 프로세스별로 복사합니다.
+        
+        Returns:
+            ContextualBandit 또는 None (체크포인트 없음)
+        """
+        directory = Path(path)
+        manifest_file = directory / cls.MANIFEST_FILE
+        
+        # manifest를 읽은 직후 다른 워커가 새로 저장하며 이전 디렉터리를 지웠다면 manifest부터 다시
+        for attempt in range(3):
+            try:
+                with open(manifest_file, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except FileNotFoundError:
+                return None
+            
+            # checkpoint가 없으면 예전 형식 (배열이 path 바로 아래)
+            array_dir = directory / manifest["checkpoint"] if manifest.get("checkpoint") else directory
+            try:
+                arrays = {
+                    name: np.load(array_dir / f"{name}.npy", mmap_mode=mmap_mode)
+                    for name in cls.ARRAY_FILES
+                }
+                break
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+        
+        bandit = cls(manifest["num_arms"], manifest["context_dim"], initial_capacity=1)
+        bandit.checkpoint_dir = manifest.get("checkpoint")
+        
+        n = manifest["num_active_arms"]
+        if n > 0:
+            bandit.A_inv = arrays["A_inv"]
+            bandit.b = arrays["b"]
+            bandit.theta = arrays["theta"]
+            bandit.arm_index = {int(arm): row for row, arm in enumerate(arrays["arms"])}
+        bandit.metadata = manifest.get("metadata", {})
+        
+        return bandit
+    
+    @classmethod
+    def checkpoint_version(cls, path: str) -> Optional[int]:
+        """체크포인트 버전 (manifest 수정 시각, 없으면 None)"""
+        try:
+            return os.stat(Path(path) / cls.MANIFEST_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return None
 
 
 class HybridRecommender:
@@ -332,17 +782,70 @@ class HybridRecommender:
             # NCF 모델 로딩 (실제로는 학습된 모델)
             pass
         
+        self.gnn_movie_ids = None
+        self.gnn_movie_embeddings = None
         if settings.ENABLE_GNN:
-            # GNN 모델 로딩
-            pass
+            # GNN 노드 임베딩 로딩 (gnn_pipeline.layerwise_inference 결과)
+            self._load_gnn_embeddings()
+        
+        # RL 컨텍스트 벡터 조립 (사용자 임베딩이 없으면 GNN 영화 임베딩 평균 사용)
+        self.feature_assembler = FeatureAssembler(self.gnn_movie_ids, self.gnn_movie_embeddings)
         
+        self.session_cache = SequentialSessionCache(settings.SEQUENTIAL_SESSION_CACHE_SIZE)
         if settings.ENABLE_SEQUENTIAL:
             # Sequential 모델 로딩
-            pass
+            self.sequential_model = self._load_sequential_model()
         
+        self._rl_version = None
         if settings.ENABLE_RL:
-            # RL Agent 초기화
-            self.rl_agent = ContextualBandit(num_arms=1000, context_dim=128)
+            # RL Agent 초기화 (체크포인트가 있으면 이어서 사용)
+            self.rl_agent = ContextualBandit(num_arms=1000, context_dim=FEATURE_DIM)
+            self.sync_rl_agent()
+    
+    def sync_rl_agent(self) -> bool:
+        """
+        RL_MODEL_PATH의 체크포인트가 현재 로딩된 것보다 새로우면 다시 로딩
+        
+        다른 워커가 온라인 학습 결과를 저장한 경우에도 최신 상태를 사용합니다.
+        
+        Returns:
+            다시 로딩했는지 여부
+        """
+        version = ContextualBandit.checkpoint_version(settings.RL_MODEL_PATH)
+        if version is None or version == self._rl_version:
+            return False
+        
+        bandit = ContextualBandit.load(settings.RL_MODEL_PATH)
+        if bandit is None or bandit.context_dim != self.rl_agent.context_dim:
+            return False
+        
+        self.rl_agent = bandit
+        self._rl_version = version
+        return True
+    
+    def mark_rl_checkpoint(self):
+        """현재 프로세스가 저장한 체크포인트를 최신으로 기록 (불필요한 재로딩 방지)"""
+        self._rl_version = ContextualBandit.checkpoint_version(settings.RL_MODEL_PATH)
+    
+    @property
+    def model_version(self) -> str:
+        """
+        후보 점수를 결정하는 모델 버전 (추천 캐시 키)
+        
+        RL은 요청 컨텍스트로 캐시된 후보를 재정렬하므로 포함하지 않습니다.
+        """
+        from .gnn_pipeline import default_embedding_path
+        
+        parts = [settings.VERSION, settings.RECOMMENDATION_MODEL]
+        for artifact in (
+            Path(default_embedding_path()),
+            Path(settings.RECOMMENDATION_MODEL_PATH) / "sequential.pt",
+        ):
+            try:
+                parts.append(str(artifact.stat().st_mtime_ns))
+            except FileNotFoundError:
+                parts.append("-")
+        return ":".join(parts)
     
     def recommend(
         self,
@@ -361,54 +864,81 @@ class HybridRecommender:
         Returns:
             [(movie_id, score), ...]
         """
+        candidate_movies = self.get_candidates(user_id, num_recommendations * 3)
+        
+        # 5. RL로 최종 선택 (선택사항)
+        if settings.ENABLE_RL and self.rl_agent and context:
+            self.sync_rl_agent()
+            context_vector = self._build_context_vector(user_id, context)
+            movie_scores = dict(candidate_movies)
+            candidate_ids = [m[0] for m in candidate_movies]
+            
+            # 후보 전체를 한 번에 점수화하여 Top-K 선택
+            ranked = self.rl_agent.rank_arms(context_vector, candidate_ids, num_recommendations)
+            return [(movie_id, movie_scores[movie_id]) for movie_id, _ in ranked]
+        else:
+            return candidate_movies[:num_recommendations]
+    
+    def get_candidates(self, user_id: int, num_candidates: int) -> List[Tuple[int, float]]:
+        """
+        Hybrid 후보 (점수 내림차순)
+        
+        ENABLE_RECOMMENDATION_CACHE가 켜져 있으면 사용자별 캐시를 먼저 확인하고,
+        없을 때만 모든 모델을 계산해 RECOMMENDATION_CACHE_SIZE개 이상을 캐시합니다.
+        """
+        if not settings.ENABLE_RECOMMENDATION_CACHE:
+            return self._compute_candidates(user_id, num_candidates)
+        
+        from .recommendation_cache import get_recommendation_cache
+        
+        cache = get_recommendation_cache()
+        model_version = self.model_version
+        # 계산 전에 세대를 읽어 두고, 계산 중 무효화됐으면 set이 오래된 결과를 버림
+        generation = cache.generation(user_id)
+        cached = cache.get(user_id, model_version, num_candidates)
+        if cached is not None:
+            return cached
+        
+        limit = max(num_candidates, settings.RECOMMENDATION_CACHE_SIZE)
+        candidates = self._compute_candidates(user_id, limit)
+        cache.set(user_id, candidates, model_version, limit, generation=generation)
+        return candidates[:num_candidates]
+    
+    def _compute_candidates(self, user_id: int, num_candidates: int) -> List[Tuple[int, float]]:
+        """NCF + GNN + 인기도 + Sequential 가중 합산"""
         recommendations = []
         
         # 1. NCF 추천
         if settings.ENABLE_NCF and self.ncf_model:
-            ncf_recs = self._get_ncf_recommendations(user_id, num_recommendations * 2)
+            ncf_recs = self._get_ncf_recommendations(user_id, num_candidates)
             recommendations.append(("ncf", ncf_recs, 0.3))  # 30% 가중치
         
         # 2. GNN 추천
         if settings.ENABLE_GNN and self.gnn_model:
-            gnn_recs = self._get_gnn_recommendations(user_id, num_recommendations * 2)
+            gnn_recs = self._get_gnn_recommendations(user_id, num_candidates)
             recommendations.append(("gnn", gnn_recs, 0.3))  # 30% 가중치
         
-        # 3. Sequential 추천
+        # 3. 인기도 기반 (fallback)
+        popularity_recs = self._get_popular_movies(num_candidates)
+        recommendations.append(("popularity", popularity_recs, 0.2))  # 20% 가중치
+        
+        # 4. Sequential 추천 (다른 모델의 후보만 재점수화)
         if settings.ENABLE_SEQUENTIAL and self.sequential_model:
-            seq_recs = self._get_sequential_recommendations(user_id, num_recommendations * 2)
+            candidate_ids = list({movie_id for _, recs, _ in recommendations for movie_id, _ in recs})
+            seq_recs = self._get_sequential_recommendations(user_id, num_candidates, candidate_ids)
             recommendations.append(("sequential", seq_recs, 0.2))  # 20% 가중치
         
-        # 4. 인기도 기반 (fallback)
-        popularity_recs = self._get_popular_movies(num_recommendations * 2)
-        recommendations.append(("popularity", popularity_recs, 0.2))  # 20% 가중치
-        
         # Hybrid Score 계산
         movie_scores = {}
         for model_name, recs, weight in recommendations:
             for movie_id, score in recs:
                 if movie_id not in movie_scores:
                     movie_scores[movie_id] = 0.0
-                movie_scores[movie_id] += score * weight
+                movie_scores[movie_id] += float(score) * weight
         
         # 정렬 및 Top-K 선택
         sorted_movies = sorted(movie_scores.items(), key=lambda x: x[1], reverse=True)
-        candidate_movies = sorted_movies[:num_recommendations * 3]
-        
-        # 5. RL로 최종 선택 (선택사항)
-        if settings.ENABLE_RL and self.rl_agent and context:
-            context_vector = self._build_context_vector(user_id, context)
-            candidate_ids = [m[0] for m in candidate_movies]
-            
-            final_recommendations = []
-            for _ in range(num_recommendations):
-                selected_id = self.rl_agent.select_arm(context_vector, candidate_ids)
-                score = movie_scores[selected_id]
-                final_recommendations.append((selected_id, score))
-                candidate_ids.remove(selected_id)
-            
-            return final_recommendations
-        else:
-            return sorted_movies[:num_recommendations]
+        return sorted_movies[:num_candidates]
     
     def _get_ncf_recommendations(self, user_id: int, top_k: int) -> List[Tuple[int, float]]:
         """NCF 기반 추천"""
@@ -420,27 +950,151 @@ class HybridRecommender:
         return [(movie_ids[i], scores[i]) for i in top_indices]
     
     def _get_gnn_recommendations(self, user_id: int, top_k: int) -> List[Tuple[int, float]]:
-        """GNN 기반 추천"""
-        # NOTE: 실제로는 그래프에서 이웃 노드 탐색
-        movie_ids = list(range(1, 101))
-        scores = np.random.rand(len(movie_ids))
-        top_indices = np.argsort(scores)[-top_k:][::-1]
-        return [(movie_ids[i], scores[i]) for i in top_indices]
+        """
+        GNN 기반 추천
+        
+        사용자 임베딩 = 최근 상호작용한 영화 노드 임베딩의 평균
+        """
+        from .feature_store import get_feature_store
+        
+        features = get_feature_store().get_users([user_id]).get(user_id)
+        if features is None:
+            return []
+        
+        seen = np.unique(np.array(features["recent_movie_ids"], dtype=np.int64))
+        index = np.searchsorted(self.gnn_movie_ids, seen)
+        index = index[index < len(self.gnn_movie_ids)]
+        index = index[np.isin(self.gnn_movie_ids[index], seen)]
+        if len(index) == 0:
+            return []
+        
+        user_embedding = torch.from_numpy(self.gnn_movie_embeddings[index].mean(axis=0))
+        top_k = min(top_k, len(self.gnn_movie_ids))
+        top_indices, scores = self.gnn_model.recommend(
+            user_embedding, torch.from_numpy(self.gnn_movie_embeddings), top_k
+        )
+        return [(int(self.gnn_movie_ids[i]), float(score)) for i, score in zip(top_indices, scores)]
     
-    def _get_sequential_recommendations(self, user_id: int, top_k: int) -> List[Tuple[int, float]]:
-        """Sequential 모델 기반 추천"""
-        movie_ids = list(range(1, 101))
-        scores = np.random.rand(len(movie_ids))
-        top_indices = np.argsort(scores)[-top_k:][::-1]
-        return [(movie_ids[i], scores[i]) for i in top_indices]
+    def _load_gnn_embeddings(self):
+        """
+        memory-mapped 노드 임베딩에서 영화 노드만 추려 로딩
+        
+        영화 ID 순으로 정렬해 두어 movie_id → 행 조회는 searchsorted로 처리합니다.
+        """
+        from .gnn_pipeline import load_movie_embeddings
+        
+        loaded = load_movie_embeddings()
+        if loaded is None:
+            return
+        
+        self.gnn_movie_ids, self.gnn_movie_embeddings, feature_dim = loaded
+        self.gnn_model = GraphSAGERecommender(
+            feature_dim, settings.GNN_HIDDEN_DIM, self.gnn_movie_embeddings.shape[1]
+        )
+    
+    def _get_sequential_recommendations(
+        self,
+        user_id: int,
+        top_k: int,
+        candidate_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Sequential 모델 기반 추천
+        
+        캐시된 사용자 인코더 상태로 후보 아이템의 다음 아이템 확률만 계산합니다.
+        """
+        with self.session_cache.user_lock(user_id):
+            state = self._get_session_state(user_id)
+            if state is None or state["encoded"] is None:
+                return []
+            
+            seen = set(state["items"])
+            candidates = [
+                movie_id for movie_id in (candidate_ids or range(self.sequential_model.num_items))
+                if movie_id not in seen and 0 <= movie_id < self.sequential_model.num_items
+            ]
+            if not candidates:
+                return []
+            
+            logits = self.sequential_model.score_candidates(state, candidates)
+        
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        
+        top_indices = np.argsort(probs)[-top_k:][::-1]
+        return [(candidates[i], float(probs[i])) for i in top_indices]
+    
+    def _get_session_state(self, user_id: int) -> Optional[Dict]:
+        """
+        사용자 Sequential 상태 조회 (캐시 + 증분 갱신)
+        
+        - 캐시 없음: 최근 SEQUENCE_LENGTH개 상호작용을 created_at 순으로 prefill
+        - 캐시 있음: 마지막 반영 이후의 상호작용만 step으로 반영
+        
+        호출자가 session_cache.user_lock(user_id)을 잡고 있어야 합니다.
+        """
+        from ..database import SessionLocal
+        from ..models import Interaction
+        
+        num_items = self.sequential_model.num_items
+        cached = self.session_cache.get(user_id)
+        
+        db = SessionLocal()
+        try:
+            query = db.query(Interaction.id, Interaction.movie_id).filter(Interaction.user_id == user_id)
+            if cached is None:
+                rows = query.order_by(
+                    Interaction.created_at.desc(), Interaction.id.desc()
+                ).limit(settings.SEQUENCE_LENGTH).all()
+                rows.reverse()
+            else:
+                rows = query.filter(Interaction.id > cached[1]).order_by(
+                    Interaction.created_at, Interaction.id
+                ).all()
+        finally:
+            db.close()
+        
+        if cached is None and not rows:
+            return None
+        if cached is not None and not rows:
+            return cached[0]
+        
+        items = [movie_id for _, movie_id in rows if 0 <= movie_id < num_items]
+        last_interaction_id = max(row_id for row_id, _ in rows)
+        
+        if cached is None:
+            state = self.sequential_model.init_state(items)
+        else:
+            state = cached[0]
+            for item_id in items:
+                state = self.sequential_model.step(state, item_id)
+        
+        self.session_cache.put(user_id, state, last_interaction_id)
+        return state
+    
+    def _load_sequential_model(self) -> Optional[SequentialRecommender]:
+        """
+        학습된 Sequential 모델 로딩
+        
+        {RECOMMENDATION_MODEL_PATH}/sequential.pt: {"num_items": int, "state_dict": ...}
+        """
+        checkpoint_file = Path(settings.RECOMMENDATION_MODEL_PATH) / "sequential.pt"
+        if not checkpoint_file.exists():
+            print(f"⚠️  Sequential model not found at {checkpoint_file}. Sequential disabled.")
+            return None
+        
+        checkpoint = torch.load(checkpoint_file, map_location=self.device)
+        model = SequentialRecommender(num_items=checkpoint["num_items"], embedding_dim=checkpoint.get("embedding_dim", 128))
+        model.load_state_dict(checkpoint["state_dict"])
+        model.to(self.device)
+        model.eval()
+        return model
     
     def _get_popular_movies(self, top_k: int) -> List[Tuple[int, float]]:
-        """인기 영화 (fallback)"""
-        # NOTE: 실제로는 DB에서 리뷰 수/평점 기반
-        movie_ids = list(range(1, 101))
-        popularity = np.random.rand(len(movie_ids))
-        top_indices = np.argsort(popularity)[-top_k:][::-1]
-        return [(movie_ids[i], popularity[i]) for i in top_indices]
+        """인기 영화 (fallback) - feature store의 영화 popularity (리뷰/상호작용 수 × 감성)"""
+        from .feature_store import get_feature_store
+        
+        return get_feature_store().popular_movies(top_k)
     
     def _build_context_vector(self, user_id: int, context: Dict) -> np.ndarray:
         """
@@ -451,19 +1105,21 @@ class HybridRecommender:
             context: {"time": "evening", "device": "mobile", ...}
             
         Returns:
-            context_vector: [128-dim]
+            context_vector: [128-dim] (레이아웃은 feature_assembler 참고)
         """
-        # NOTE: 실제로는 user embedding + context features
-        return np.random.rand(128)
+        return self.feature_assembler.assemble(user_id, context)
 
 
 # 싱글톤 인스턴스
 _recommender = None
+_recommender_lock = threading.Lock()
 
 
 def get_recommender() -> HybridRecommender:
-    """추천 시스템 싱글톤"""
+    """추천 시스템 싱글톤 (캐시 예열 스레드와 요청이 동시에 처음 호출해도 하나만 생성)"""
     global _recommender
     if _recommender is None:
-        _recommender = HybridRecommender()
+        with _recommender_lock:
+            if _recommender is None:
+                _recommender = HybridRecommender()
     return _recommender
@@ -0,0 +1,457 @@
+"""
+리뷰 분석 엔진 (컬럼 기반, 스트리밍)
+
+ReviewExporter가 만든 Parquet 데이터셋(reviews/)을 pyarrow.dataset으로 배치 단위로 스캔하며
+병합 가능한 부분 집계(개수, 합, 제곱합, 히스토그램)만 유지합니다.
+메모리 사용량은 리뷰 수가 아니라 그룹 수(영화, 기간)에 비례하므로 RAM보다 큰 데이터셋도 처리됩니다.
+
+    analytics = ReviewAnalytics()
+    report = analytics.report()                 # 한 번의 스캔으로 전체 리포트
+    analytics.by_movie(build_filter(start="2024-01-01"))
+    analytics.timeseries("week")
+
+백분위수는 값 범위를 HISTOGRAM_BINS개 구간으로 나눈 히스토그램에서 보간합니다
+(감성 점수 기준 오차 ≤ 0.001).
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+HISTOGRAM_BINS = 2000
+PERCENTILES = (5, 25, 50, 75, 95)
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+TIME_FORMATS = {"day": "%Y-%m-%d", "week": "%Y-%m-%d", "month": "%Y-%m"}
+LATEST_COLUMNS = [
+    "id", "movie_id", "movie_title", "author_name", "content", "sentiment_score",
+    "sentiment_label", "confidence", "aspects", "emotions", "created_at",
+]
+
+
+def build_filter(movie_ids: Sequence[int] = None, start: str = None, end: str = None):
+    """
+    스캔 필터 (movie_id 목록, created_at 구간 [start, end))
+
+    start/end는 "2024-05-01" 형식이며, year_month 파티션 조건도 함께 걸어 파일 단위로 건너뜁니다.
+    """
+    expr = None
+
+    def and_(condition):
+        return condition if expr is None else expr & condition
+
+    if movie_ids:
+        expr = and_(pc.field("movie_id").isin(list(movie_ids)))
+    if start:
+        expr = and_((pc.field("year_month") >= start[:7]) & (pc.field("created_at") >= pd.Timestamp(start).to_datetime64()))
+    if end:
+        expr = and_((pc.field("year_month") <= end[:7]) & (pc.field("created_at") < pd.Timestamp(end).to_datetime64()))
+    return expr
+
+
+class _Moments:
+    """수치 컬럼 하나의 개수/합/제곱합/최소/최대 + 고정 구간 히스토그램"""
+
+    def __init__(self, low: float, high: float):
+        self.low, self.high = low, high
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+
+    def update(self, array):
+        values = pc.drop_null(array).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.total += values.sum()
+        self.total_sq += np.dot(values, values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        index = ((values - self.low) * (HISTOGRAM_BINS / (self.high - self.low))).astype(np.int64)
+        self.histogram += np.bincount(np.clip(index, 0, HISTOGRAM_BINS - 1), minlength=HISTOGRAM_BINS)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        cumulative = np.cumsum(self.histogram)
+        target = q / 100.0 * self.count
+        bin_index = int(np.searchsorted(cumulative, target))
+        bin_index = min(bin_index, HISTOGRAM_BINS - 1)
+        before = cumulative[bin_index - 1] if bin_index else 0
+        in_bin = self.histogram[bin_index]
+        fraction = (target - before) / in_bin if in_bin else 0.0
+        width = (self.high - self.low) / HISTOGRAM_BINS
+        return float(np.clip(self.low + (bin_index + fraction) * width, self.min, self.max))
+
+    def result(self) -> Dict:
+        if self.count == 0:
+            return {"count": 0, "mean": None, "std": None, "min": None, "max": None, "percentiles": {}}
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean * mean, 0.0)
+        return {
+            "count": self.count,
+            "mean": float(mean),
+            "std": float(variance ** 0.5),
+            "min": float(self.min),
+            "max": float(self.max),
+            "percentiles": {f"p{q}": self.percentile(q) for q in PERCENTILES},
+        }
+
+
+class _GroupSums:
+    """
+    정수 키별 합계
+
+    배치마다 키를 np.unique로 슬롯 번호로 바꾼 뒤 np.bincount(weights=...)로 컬럼별 합을 더합니다.
+    상태는 (정렬된 키, 컬럼별 합 배열)뿐이라 그룹 수에만 비례합니다.
+    """
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.sums: Dict[str, np.ndarray] = {}
+
+    def update(self, keys: np.ndarray, values: Dict[str, np.ndarray]):
+        unique, inverse = np.unique(keys, return_inverse=True)
+        self.add(unique, inverse, values)
+
+    def add(self, unique: np.ndarray, inverse: np.ndarray, values: Dict[str, np.ndarray]):
+        """np.unique(keys, return_inverse=True) 결과를 이미 가지고 있을 때"""
+        if not np.isin(unique, self.keys, assume_unique=True).all():
+            merged = np.union1d(self.keys, unique)
+            position = np.searchsorted(merged, self.keys)
+            for name, total in self.sums.items():
+                grown = np.zeros(len(merged))
+                grown[position] = total
+                self.sums[name] = grown
+            self.keys = merged
+
+        slots = np.searchsorted(self.keys, unique)[inverse]
+        for name, value in values.items():
+            counts = np.bincount(slots, weights=value, minlength=len(self.keys))
+            self.sums[name] = self.sums[name] + counts if name in self.sums else counts
+
+    def result(self) -> pd.DataFrame:
+        return pd.DataFrame({"key": self.keys, **self.sums})
+
+
+class _Overall:
+    columns = ["sentiment_score", "confidence", "sentiment_label"]
+
+    def __init__(self):
+        self.score = _Moments(-1.0, 1.0)
+        self.confidence = _Moments(0.0, 1.0)
+        self.labels: Dict[str, int] = {}
+        self.count = 0
+
+    def update(self, batch):
+        self.count += batch.num_rows
+        self.score.update(batch.column("sentiment_score"))
+        self.confidence.update(batch.column("confidence"))
+        counts = pc.value_counts(batch.column("sentiment_label").cast(pa.string()))
+        for label, count in zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()):
+            label = label or "unknown"
+            self.labels[label] = self.labels.get(label, 0) + count
+
+    def result(self) -> Dict:
+        return {
+            "count": self.count,
+            "labels": dict(sorted(self.labels.items(), key=lambda item: -item[1])),
+            "sentiment_score": self.score.result(),
+            "confidence": self.confidence.result(),
+        }
+
+
+def _numbers(array) -> np.ndarray:
+    """Arrow 수치 컬럼 → float64 (null은 NaN)"""
+    return np.asarray(array.to_numpy(zero_copy_only=False), dtype=np.float64)
+
+
+def _label_counts(batch) -> Dict[str, np.ndarray]:
+    """라벨별 0/1 배열 (dictionary 컬럼은 문자열 비교 없이 인덱스로 비교)"""
+    labels = batch.column("sentiment_label")
+    if pa.types.is_dictionary(labels.type):
+        dictionary = labels.dictionary.to_pylist()
+        codes = labels.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        return {
+            label: (codes == dictionary.index(label) if label in dictionary else np.zeros(len(codes), bool)).astype(np.float64)
+            for label in SENTIMENT_LABELS
+        }
+    return {
+        label: pc.equal(labels, label).fill_null(False).to_numpy(zero_copy_only=False).astype(np.float64)
+        for label in SENTIMENT_LABELS
+    }
+
+
+def _struct_sums(struct_array, names: Sequence[str], prefix: str) -> Dict[str, np.ndarray]:
+    """struct 필드별 (합, 유효 개수) 배열"""
+    columns = {}
+    for name, child in zip(names, struct_array.flatten()):
+        values = _numbers(child)
+        valid = ~np.isnan(values)
+        columns[f"{prefix}_{name}_sum"] = np.where(valid, values, 0.0)
+        columns[f"{prefix}_{name}_n"] = valid.astype(np.float64)
+    return columns
+
+
+def _score_sums(batch) -> Dict[str, np.ndarray]:
+    """리뷰 수, 감성 점수 합/제곱합/개수, 신뢰도 합, 라벨 개수"""
+    score = _numbers(batch.column("sentiment_score"))
+    valid = ~np.isnan(score)
+    score = np.where(valid, score, 0.0)
+    return {
+        "reviews": np.ones(batch.num_rows),
+        "score_n": valid.astype(np.float64),
+        "score_sum": score,
+        "score_sq": score * score,
+        "confidence_sum": np.nan_to_num(_numbers(batch.column("confidence"))),
+        **_label_counts(batch),
+    }
+
+
+def _struct_means(frame: pd.DataFrame, names: Sequence[str], prefix: str) -> pd.DataFrame:
+    means = {}
+    for name in names:
+        total, count = frame.pop(f"{prefix}_{name}_sum"), frame.pop(f"{prefix}_{name}_n")
+        means[name] = (total / count.replace(0, np.nan)).astype("float64")
+    return pd.DataFrame(means, index=frame.index)
+
+
+def _score_columns(frame: pd.DataFrame) -> Dict[str, pd.Series]:
+    score_n = frame["score_n"].replace(0, np.nan)
+    mean = frame["score_sum"] / score_n
+    return {
+        "reviews": frame["reviews"].astype(np.int64),
+        "avg_sentiment": mean,
+        "std_sentiment": np.sqrt((frame["score_sq"] / score_n - mean ** 2).clip(lower=0)),
+        "avg_confidence": frame["confidence_sum"] / frame["reviews"],
+    }
+
+
+class _ByMovie:
+    columns = ["movie_id", "movie_title", "sentiment_score", "confidence", "sentiment_label", "aspects", "emotions"]
+
+    def __init__(self):
+        self.sums = _GroupSums()
+        self.titles: Dict[int, str] = {}
+
+    def update(self, batch):
+        movie_ids = batch.column("movie_id").to_numpy(zero_copy_only=False)
+        unique, first, inverse = np.unique(movie_ids, return_index=True, return_inverse=True)
+        self.sums.add(unique, inverse, {
+            **_score_sums(batch),
+            **_struct_sums(batch.column("aspects"), settings.ABSA_ASPECTS, "aspect"),
+            **_struct_sums(batch.column("emotions"), settings.EMOTION_LABELS, "emotion"),
+        })
+
+        # 제목은 영화당 하나라 배치에서 처음 나온 행만 가져옴
+        titles = batch.column("movie_title").take(pa.array(first)).to_pylist()
+        self.titles.update(zip(unique.tolist(), titles))
+
+    def result(self) -> pd.DataFrame:
+        frame = self.sums.result()
+        if frame.empty:
+            return pd.DataFrame(columns=["movie_id", "title", "reviews", "avg_sentiment", "std_sentiment", "avg_confidence"])
+
+        aspects = _struct_means(frame, settings.ABSA_ASPECTS, "aspect").add_prefix("aspect_")
+        emotions = _struct_means(frame, settings.EMOTION_LABELS, "emotion").add_prefix("emotion_")
+        result = pd.DataFrame({
+            "movie_id": frame["key"],
+            "title": frame["key"].map(self.titles),
+            **_score_columns(frame),
+            **{f"{label}_ratio": frame[label] / frame["reviews"] for label in SENTIMENT_LABELS},
+        })
+        result = pd.concat([result, aspects, emotions], axis=1)
+        return result.sort_values(["reviews", "movie_id"], ascending=[False, True]).reset_index(drop=True)
+
+
+class _StructDistribution:
+    """aspects / emotions struct 필드별 분포 (+ 감정은 대표 감정 개수)"""
+
+    def __init__(self, column: str, names: Sequence[str], low: float, high: float, dominant: bool = False):
+        self.columns = [column]
+        self.column = column
+        self.names = list(names)
+        self.moments = {name: _Moments(low, high) for name in self.names}
+        self.dominant = np.zeros(len(self.names), dtype=np.int64) if dominant else None
+
+    def update(self, batch):
+        children = batch.column(self.column).flatten()
+        for name, child in zip(self.names, children):
+            self.moments[name].update(child)
+
+        if self.dominant is not None:
+            matrix = np.column_stack([
+                pc.cast(child, pa.float64()).fill_null(-np.inf).to_numpy(zero_copy_only=False)
+                for child in children
+            ])
+            present = np.isfinite(matrix).any(axis=1)
+            if present.any():
+                self.dominant += np.bincount(matrix[present].argmax(axis=1), minlength=len(self.names))
+
+    def result(self) -> pd.DataFrame:
+        rows = []
+        for name in self.names:
+            stats = self.moments[name].result()
+            rows.append({
+                "name": name,
+                "count": stats["count"],
+                "mean": stats["mean"],
+                "std": stats["std"],
+                **stats["percentiles"],
+            })
+        frame = pd.DataFrame(rows)
+        if self.dominant is not None:
+            frame["dominant"] = self.dominant
+        return frame
+
+
+class _TimeSeries:
+    columns = ["created_at", "sentiment_score", "confidence", "sentiment_label"]
+    MISSING = np.iinfo(np.int32).min
+
+    def __init__(self, freq: str):
+        if freq not in TIME_FORMATS:
+            raise ValueError(f"freq must be one of {list(TIME_FORMATS)}")
+        self.freq = freq
+        self.sums = _GroupSums()
+
+    def update(self, batch):
+        # 기간 시작일(date32의 일 수)로 그룹핑하고 문자열 포맷은 결과 단계에서
+        period = pc.floor_temporal(batch.column("created_at"), unit=self.freq, week_starts_monday=True)
+        days = pc.cast(pc.cast(period, pa.date32()), pa.int32()).fill_null(self.MISSING)
+        self.sums.update(days.to_numpy(zero_copy_only=False), _score_sums(batch))
+
+    def result(self) -> pd.DataFrame:
+        frame = self.sums.result()
+        if frame.empty:
+            return pd.DataFrame(columns=["period", "reviews", "avg_sentiment", "avg_confidence"])
+        period = pd.to_datetime(frame["key"].where(frame["key"] != self.MISSING), unit="D")
+        return pd.DataFrame({
+            "period": period.dt.strftime(TIME_FORMATS[self.freq]).fillna("unknown"),
+            **_score_columns(frame),
+            **{label: frame[label].astype(np.int64) for label in SENTIMENT_LABELS},
+        })
+
+
+class _Latest:
+    """id가 가장 큰(최근) n개 리뷰의 id (본문 컬럼은 스캔 후 해당 id만 다시 읽음)"""
+
+    columns = ["id"]
+
+    def __init__(self, n: int):
+        self.n = n
+        self.ids = np.empty(0, dtype=np.int64)
+
+    def update(self, batch):
+        ids = np.concatenate((self.ids, batch.column("id").to_numpy(zero_copy_only=False)))
+        if len(ids) > self.n:
+            ids = np.partition(ids, len(ids) - self.n)[-self.n:]
+        self.ids = ids
+
+    def result(self) -> List[int]:
+        return sorted(self.ids.tolist(), reverse=True)
+
+
+class ReviewAnalytics:
+    """
+    Parquet 리뷰 데이터셋 분석기
+
+    각 메서드는 필요한 컬럼만 스캔하며, report()는 모든 집계를 한 번의 스캔으로 계산합니다.
+    """
+
+    def __init__(self, path: str = None, batch_size: int = None):
+        self.path = Path(path or Path(settings.REVIEW_EXPORT_PATH) / "reviews")
+        self.batch_size = batch_size or settings.REVIEW_ANALYTICS_BATCH_SIZE
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for review analytics (pip install pyarrow)")
+
+    def summary(self, filter=None) -> Dict:
+        """전체 리뷰 수, 감성 라벨 분포, 감성 점수/신뢰도 통계와 백분위수"""
+        return self._run({"summary": _Overall()}, filter)["summary"]
+
+    def by_movie(self, filter=None) -> pd.DataFrame:
+        """영화별 리뷰 수, 평균/표준편차 감성 점수, 라벨 비율, 측면/감정 평균"""
+        return self._run({"movies": _ByMovie()}, filter)["movies"]
+
+    def aspects(self, filter=None) -> pd.DataFrame:
+        """측면(ABSA)별 분포"""
+        return self._run({"aspects": self._aspects()}, filter)["aspects"]
+
+    def emotions(self, filter=None) -> pd.DataFrame:
+        """감정별 분포와 대표 감정 개수"""
+        return self._run({"emotions": self._emotions()}, filter)["emotions"]
+
+    def timeseries(self, freq: str = "month", filter=None) -> pd.DataFrame:
+        """기간(day | week | month)별 리뷰 수, 평균 감성, 라벨 개수"""
+        return self._run({"timeseries": _TimeSeries(freq)}, filter)["timeseries"]
+
+    def latest(self, n: int = 5, filter=None) -> pd.DataFrame:
+        """최근 리뷰 n개 (본문 포함)"""
+        return self.fetch(self._run({"latest": _Latest(n)}, filter)["latest"])
+
+    def fetch(self, review_ids: Sequence[int]) -> pd.DataFrame:
+        """id 목록의 리뷰 행 (id 내림차순). id 통계로 대부분의 row group을 건너뜁니다."""
+        if not review_ids:
+            return pd.DataFrame(columns=LATEST_COLUMNS)
+        batches = list(self.scan(LATEST_COLUMNS, pc.field("id").isin(list(review_ids))))
+        if not batches:
+            return pd.DataFrame(columns=LATEST_COLUMNS)
+        frame = pa.Table.from_batches(batches).to_pandas()
+        return frame.sort_values("id", ascending=False).reset_index(drop=True)
+
+    def report(self, freq: str = "month", latest: int = 5, filter=None) -> Dict:
+        """summary / movies / aspects / emotions / timeseries / latest 를 한 번의 스캔으로"""
+        result = self._run({
+            "summary": _Overall(),
+            "movies": _ByMovie(),
+            "aspects": self._aspects(),
+            "emotions": self._emotions(),
+            "timeseries": _TimeSeries(freq),
+            "latest": _Latest(latest),
+        }, filter)
+        result["latest"] = self.fetch(result["latest"])
+        return result
+
+    @staticmethod
+    def _aspects():
+        return _StructDistribution("aspects", settings.ABSA_ASPECTS, -1.0, 1.0)
+
+    @staticmethod
+    def _emotions():
+        return _StructDistribution("emotions", settings.EMOTION_LABELS, 0.0, 1.0, dominant=True)
+
+    def scan(self, columns: Iterable[str], filter=None):
+        """필요한 컬럼만 RecordBatch로 스트리밍 (데이터셋이 없으면 빈 스트림)"""
+        if not self.path.exists():
+            return
+        dataset = ds.dataset(self.path, format="parquet", partitioning="hive")
+        yield from dataset.to_batches(columns=sorted(set(columns)), filter=filter, batch_size=self.batch_size)
+
+    def _run(self, aggregators: Dict, filter=None) -> Dict:
+        columns = set()
+        for aggregator in aggregators.values():
+            columns.update(aggregator.columns)
+
+        for batch in self.scan(columns, filter):
+            if batch.num_rows == 0:
+                continue
+            for aggregator in aggregators.values():
+                aggregator.update(batch)
+
+        return {name: aggregator.result() for name, aggregator in aggregators.items()}
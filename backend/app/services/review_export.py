@@ -0,0 +1,306 @@
+"""
+리뷰/평점 Parquet export
+- reviews 테이블을 id keyset 청크 단위로 스트리밍 → year_month로 파티션된 Parquet 데이터셋
+- aspect_sentiments / emotions JSON은 Arrow JSON 리더로 한 번에 파싱해 typed struct 컬럼으로 저장
+- ratings 테이블은 단일 Parquet 파일 (avg_aspects, emotion_distribution → struct)
+- 마지막 review id를 manifest에 기록해 다음 export는 새 리뷰만 추가 (증분)
+- export한 id 범위의 지문(행 수, 최대 id, 컬럼 합계)도 기록해 삭제/재분석으로 DB가 달라졌으면 전체 재export
+
+출력 구조 (REVIEW_EXPORT_PATH):
+    reviews/year_month=2024-05/part-<청크 첫 id>-0.parquet
+    ratings/ratings.parquet
+    _manifest.json
+
+분석은 pyarrow.dataset / pandas로 이 디렉토리를 읽어 컬럼 단위로 처리합니다.
+"""
+
+import io
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def aspect_struct_type() -> "pa.StructType":
+    return pa.struct([(aspect, pa.float32()) for aspect in settings.ABSA_ASPECTS])
+
+
+def emotion_struct_type(value_type=None) -> "pa.StructType":
+    return pa.struct([(emotion, value_type or pa.float32()) for emotion in settings.EMOTION_LABELS])
+
+
+def review_schema() -> "pa.Schema":
+    """reviews 데이터셋 스키마 (year_month는 파티션 컬럼)"""
+    return pa.schema([
+        ("id", pa.int64()),
+        ("movie_id", pa.int64()),
+        ("movie_title", pa.string()),
+        ("author_name", pa.string()),
+        ("content", pa.string()),
+        ("sentiment_score", pa.float32()),
+        ("sentiment_label", pa.dictionary(pa.int8(), pa.string())),
+        ("confidence", pa.float32()),
+        ("aspects", aspect_struct_type()),
+        ("emotions", emotion_struct_type()),
+        ("created_at", pa.timestamp("us")),
+        ("year_month", pa.string()),
+    ])
+
+
+def json_to_struct(values: List[Optional[str]], struct_type: "pa.StructType") -> "pa.StructArray":
+    """
+    JSON 문자열 리스트 → StructArray
+
+    NDJSON 한 덩어리로 이어 붙여 Arrow JSON 리더(C++)로 파싱하므로 행별 json.loads가 없습니다.
+    struct에 없는 키는 무시하고, None/'null'은 null struct가 됩니다.
+    """
+    if not values:
+        return pa.array([], type=struct_type)
+
+    mask = np.array([v is None or v == "null" for v in values])
+    buffer = "\n".join("{}" if missing else v for v, missing in zip(values, mask)).encode("utf-8")
+    try:
+        table = pa_json.read_json(
+            io.BytesIO(buffer),
+            parse_options=pa_json.ParseOptions(
+                explicit_schema=pa.schema(list(struct_type)),
+                unexpected_field_behavior="ignore",
+                newlines_in_values=False,
+            ),
+        )
+        arrays = [table.column(field.name).combine_chunks() for field in struct_type]
+    except pa.ArrowInvalid:
+        # 객체가 아닌 값 등 형식이 맞지 않는 행이 섞여 있으면 행 단위로 처리
+        rows = [None if missing else _loads_object(v) for v, missing in zip(values, mask)]
+        mask = np.array([row is None for row in rows])
+        arrays = [
+            pa.array([None if row is None else _number(row.get(field.name)) for row in rows], type=field.type)
+            for field in struct_type
+        ]
+
+    return pa.StructArray.from_arrays(arrays, fields=list(struct_type), mask=pa.array(mask))
+
+
+def _loads_object(value: str) -> Optional[Dict]:
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+class ReviewExporter:
+    """
+    reviews / ratings → Parquet
+
+    export(db)는 manifest의 last_review_id 이후 리뷰만 추가하고 ratings는 다시 씁니다.
+    rebuild=True이거나 이미 export한 범위가 DB와 달라졌으면(drift) 기존 데이터셋을 지우고 처음부터 export합니다.
+    """
+
+    MANIFEST_FILE = "_manifest.json"
+
+    def __init__(self, output_dir: str = None, chunk_size: int = None):
+        self.output_dir = Path(output_dir or settings.REVIEW_EXPORT_PATH)
+        self.chunk_size = chunk_size or settings.REVIEW_EXPORT_CHUNK_SIZE
+
+    @property
+    def reviews_path(self) -> Path:
+        return self.output_dir / "reviews"
+
+    @property
+    def ratings_path(self) -> Path:
+        return self.output_dir / "ratings" / "ratings.parquet"
+
+    def export(self, db, rebuild: bool = False) -> Dict:
+        """
+        Returns:
+            {"reviews": 이번에 추가한 리뷰 수, "ratings": 평점 행 수, "last_review_id": ...,
+             "rebuilt": 전체 재export 여부, "drift": 재export 사유 (없으면 None), "seconds": ...}
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for review export (pip install pyarrow)")
+
+        start = time.time()
+        manifest = None if rebuild else self.load_manifest()
+        drift = self.detect_drift(db, manifest) if manifest else None
+        if drift:
+            manifest = None
+        if manifest is None and self.reviews_path.exists():
+            shutil.rmtree(self.reviews_path)
+        last_id = manifest["last_review_id"] if manifest else 0
+
+        exported = 0
+        for table in self.iter_review_tables(db, after_id=last_id):
+            pq.write_to_dataset(
+                table,
+                self.reviews_path,
+                partition_cols=["year_month"],
+                basename_template=f"part-{table['id'][0].as_py():012d}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+                compression="zstd",
+            )
+            exported += table.num_rows
+            last_id = table["id"][-1].as_py()
+
+        ratings = self.export_ratings(db)
+
+        result = {
+            "reviews": exported,
+            "ratings": ratings,
+            "last_review_id": last_id,
+            "total_reviews": (manifest["total_reviews"] if manifest else 0) + exported,
+            "snapshot": self.snapshot(db, last_id),
+            "rebuilt": manifest is None,
+            "drift": drift,
+            "seconds": time.time() - start,
+        }
+        self._write_manifest(result)
+        return result
+
+    def snapshot(self, db, up_to_id: int) -> Dict:
+        """
+        id <= up_to_id 리뷰의 지문 (집계 쿼리 한 번)
+
+        행 수/최대 id로 삭제를, 점수·JSON 길이 합계로 재분석(값 변경)을 감지합니다.
+        """
+        from sqlalchemy import Text, cast, func, select
+        from ..models import Review
+
+        row = db.execute(select(
+            func.count(Review.id),
+            func.max(Review.id),
+            func.sum(Review.movie_id),
+            func.sum(Review.sentiment_score),
+            func.sum(Review.confidence),
+            func.sum(func.length(Review.sentiment_label)),
+            func.sum(func.length(cast(Review.aspect_sentiments, Text))),
+            func.sum(func.length(cast(Review.emotions, Text))),
+        ).where(Review.id <= up_to_id)).one()
+
+        return {
+            "count": row[0],
+            "max_id": row[1] or 0,
+            "checksum": [round(float(value or 0), 4) for value in row[2:]],
+        }
+
+    def detect_drift(self, db, manifest: Dict) -> Optional[str]:
+        """이미 export한 범위(id <= last_review_id)가 DB와 다르면 사유 문자열"""
+        expected = manifest.get("snapshot")
+        if expected is None:
+            return "manifest has no snapshot"
+
+        current = self.snapshot(db, manifest["last_review_id"])
+        if current["count"] != expected["count"]:
+            return f"exported reviews {expected['count']:,} → {current['count']:,} (deleted)"
+        if current["max_id"] != expected["max_id"]:
+            return "exported id range changed"
+        if current["checksum"] != expected["checksum"]:
+            return "exported reviews re-analysed"
+        return None
+
+    def iter_review_tables(self, db, after_id: int = 0):
+        """id > after_id인 리뷰를 chunk_size개씩 Arrow 테이블로"""
+        from sqlalchemy import Text, cast, select
+        from ..models import Movie, Review
+
+        schema = review_schema()
+        query = select(
+            Review.id, Review.movie_id, Movie.title, Review.author_name, Review.content,
+            Review.sentiment_score, Review.sentiment_label, Review.confidence,
+            cast(Review.aspect_sentiments, Text), cast(Review.emotions, Text), Review.created_at,
+        ).outerjoin(Movie, Movie.id == Review.movie_id).order_by(Review.id)
+
+        while True:
+            rows = db.execute(query.where(Review.id > after_id).limit(self.chunk_size)).all()
+            if not rows:
+                break
+
+            columns = list(zip(*rows))
+            created_at = pa.array(columns[10], type=pa.timestamp("us"))
+            year_month = pc.strftime(created_at, format="%Y-%m").fill_null("unknown")
+
+            yield pa.Table.from_arrays([
+                pa.array(columns[0], type=pa.int64()),
+                pa.array(columns[1], type=pa.int64()),
+                pa.array(columns[2], type=pa.string()),
+                pa.array(columns[3], type=pa.string()),
+                pa.array(columns[4], type=pa.string()),
+                pa.array(columns[5], type=pa.float32()),
+                pa.array(columns[6], type=pa.string()).dictionary_encode().cast(schema.field("sentiment_label").type),
+                pa.array(columns[7], type=pa.float32()),
+                json_to_struct(list(columns[8]), aspect_struct_type()),
+                json_to_struct(list(columns[9]), emotion_struct_type()),
+                created_at,
+                year_month,
+            ], schema=schema)
+
+            after_id = rows[-1][0]
+
+    def export_ratings(self, db) -> int:
+        """ratings 전체 → ratings.parquet (영화 수만큼이라 작음)"""
+        from sqlalchemy import Text, cast, select
+        from ..models import Rating
+
+        rows = db.execute(select(
+            Rating.movie_id, Rating.avg_sentiment, Rating.review_count,
+            cast(Rating.avg_aspects, Text), cast(Rating.emotion_distribution, Text), Rating.updated_at,
+        ).order_by(Rating.movie_id)).all()
+        columns = list(zip(*rows)) if rows else [[] for _ in range(6)]
+
+        table = pa.table({
+            "movie_id": pa.array(columns[0], type=pa.int64()),
+            "avg_sentiment": pa.array(columns[1], type=pa.float32()),
+            "review_count": pa.array(columns[2], type=pa.int32()),
+            "avg_aspects": json_to_struct(list(columns[3]), aspect_struct_type()),
+            "emotion_distribution": json_to_struct(list(columns[4]), emotion_struct_type(pa.int32())),
+            "updated_at": pa.array(columns[5], type=pa.timestamp("us")),
+        })
+
+        self.ratings_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.ratings_path.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        tmp.replace(self.ratings_path)
+        return table.num_rows
+
+    def load_manifest(self) -> Optional[Dict]:
+        path = self.output_dir / self.MANIFEST_FILE
+        if not path.exists():
+            return None
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        # 설정(ABSA_ASPECTS 등)이 바뀌어 스키마가 달라졌으면 전체 재export
+        if manifest.get("schema") != review_schema().to_string():
+            return None
+        return manifest
+
+    def _write_manifest(self, result: Dict):
+        manifest = {
+            "last_review_id": result["last_review_id"],
+            "total_reviews": result["total_reviews"],
+            "snapshot": result["snapshot"],
+            "schema": review_schema().to_string(),
+            "exported_at": time.time(),
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.output_dir / self.MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
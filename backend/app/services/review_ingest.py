@@ -0,0 +1,268 @@
+"""
+리뷰 대량 등록 (NDJSON)
+
+- 한 줄에 리뷰 하나: {"movie_id": 1, "author_name": "...", "content": "...", "created_at": "2024-05-01T12:00:00"(선택)}
+- 바이트 청크를 feed()로 흘려 넣으면 줄 단위로 파싱 → 요청/파일 전체를 메모리에 올리지 않음
+- REVIEW_INGEST_CHUNK_SIZE개마다 감성/ABSA/감정 분석을 MAX_BATCH_SIZE 배치로 수행하고
+  INSERT executemany + 커밋 (청크 단위 트랜잭션)
+- 평점(Rating)은 finish()에서 영향받은 영화마다 한 번만 다시 집계
+- LLM 요약은 비용 문제로 대량 등록에서는 생략
+
+    ingestor = ReviewIngestor(db)
+    for block in stream:
+        ingestor.feed(block)
+    result = ingestor.finish()
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Movie, Rating, Review, User
+
+# 영화 ID IN 조회 / 평점 재집계 단위
+ID_CHUNK = 500
+
+EMOTIONS = ["joy", "sadness", "anger", "surprise", "fear", "disgust"]
+
+
+def update_movie_ratings(db: Session, movie_ids: Iterable[int]) -> int:
+    """
+    영화별 평점 통계(평균 감성, 리뷰 수, Aspect 평균, 감정 분포) 재집계
+
+    평균/개수는 SQL로, JSON 컬럼(Aspect/감정)만 스트리밍으로 합산합니다.
+
+    Returns:
+        갱신한 Rating 수
+    """
+    movie_ids = sorted(set(movie_ids))
+    updated = []
+
+    for start in range(0, len(movie_ids), ID_CHUNK):
+        chunk = movie_ids[start:start + ID_CHUNK]
+        stats = {
+            movie_id: (avg_sentiment, count)
+            for movie_id, avg_sentiment, count in db.query(
+                Review.movie_id, func.avg(Review.sentiment_score), func.count(Review.id)
+            ).filter(Review.movie_id.in_(chunk)).group_by(Review.movie_id)
+        }
+
+        aspect_sums = {movie_id: {} for movie_id in stats}
+        emotion_counts = {movie_id: dict.fromkeys(EMOTIONS, 0) for movie_id in stats}
+        if settings.ENABLE_ABSA or settings.ENABLE_EMOTION_CLASSIFICATION:
+            rows = db.query(Review.movie_id, Review.aspect_sentiments, Review.emotions).filter(
+                Review.movie_id.in_(chunk)
+            ).yield_per(10000)
+            for movie_id, aspects, emotions in rows:
+                for aspect, score in (aspects or {}).items():
+                    total, count = aspect_sums[movie_id].get(aspect, (0.0, 0))
+                    aspect_sums[movie_id][aspect] = (total + score, count + 1)
+                for emotion in EMOTIONS:
+                    if emotions and emotions.get(emotion, 0) > 0.5:
+                        emotion_counts[movie_id][emotion] += 1
+
+        for rating in db.query(Rating).filter(Rating.movie_id.in_(list(stats))):
+            avg_sentiment, count = stats[rating.movie_id]
+            rating.avg_sentiment = avg_sentiment or 0.0
+            rating.review_count = count
+            rating.avg_aspects = {
+                aspect: total / count for aspect, (total, count) in aspect_sums[rating.movie_id].items()
+            } if settings.ENABLE_ABSA else {}
+            rating.emotion_distribution = emotion_counts[rating.movie_id] if settings.ENABLE_EMOTION_CLASSIFICATION else {}
+            updated.append(rating.movie_id)
+
+    db.commit()
+    if updated:
+        from .feature_store import get_feature_store
+        get_feature_store().refresh_movies(updated)
+    return len(updated)
+
+
+class ReviewIngestor:
+    """
+    NDJSON 리뷰 스트림 → reviews 테이블
+
+    finish() 결과:
+        {"received", "inserted", "failed", "movies_updated", "seconds", "reviews_per_second", "errors": [{"line", "error"}]}
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        chunk_size: int = None,
+        batch_size: int = None,
+        max_errors: int = 100,
+        on_chunk: Optional[Callable[[Dict], None]] = None
+    ):
+        self.db = db
+        self.chunk_size = chunk_size or settings.REVIEW_INGEST_CHUNK_SIZE
+        self.batch_size = batch_size or settings.MAX_BATCH_SIZE
+        self.max_errors = max_errors
+        self.on_chunk = on_chunk
+
+        self.start = time.time()
+        self.line_no = 0
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self.movie_ids = set()  # 이번에 리뷰가 추가된 영화
+        self.authors = set()
+        self._known_movies = set()
+        self._buffer = b""
+        self._pending: List[Dict] = []
+
+    def feed(self, data: bytes):
+        """바이트 청크 입력 (줄 경계와 무관하게 나뉘어 있어도 됨)"""
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            self.add_line(line)
+
+    def add_line(self, line):
+        self.line_no += 1
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        if not line.strip():
+            return
+
+        self.received += 1
+        try:
+            record = json.loads(line)
+            self._pending.append(self._validate(record))
+        except (ValueError, TypeError, KeyError) as e:
+            self._error(self.line_no, str(e) or type(e).__name__)
+            return
+
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def _validate(self, record: Dict) -> Dict:
+        if not isinstance(record, dict):
+            raise ValueError("expected a JSON object")
+        content = record["content"]
+        author_name = record["author_name"]
+        if not isinstance(content, str) or not content.strip():
+            raise ValueError("content must be a non-empty string")
+        if not isinstance(author_name, str) or not author_name.strip() or len(author_name) > 100:
+            raise ValueError("author_name must be a string of 1-100 characters")
+
+        row = {
+            "line": self.line_no,
+            "movie_id": int(record["movie_id"]),
+            "author_name": author_name,
+            "content": content,
+        }
+        if record.get("created_at"):
+            row["created_at"] = datetime.fromisoformat(record["created_at"])
+        return row
+
+    def _error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def flush(self):
+        """대기 중인 리뷰 분석 + 저장 (한 트랜잭션)"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        # 영화 존재 확인 (처음 보는 ID만 IN 조회)
+        unknown = list({row["movie_id"] for row in pending} - self._known_movies)
+        for start in range(0, len(unknown), ID_CHUNK):
+            chunk = unknown[start:start + ID_CHUNK]
+            self._known_movies.update(movie_id for (movie_id,) in self.db.query(Movie.id).filter(Movie.id.in_(chunk)))
+
+        rows = []
+        for row in pending:
+            if row["movie_id"] in self._known_movies:
+                rows.append(row)
+            else:
+                self._error(row["line"], "Movie not found")
+        if not rows:
+            return
+
+        texts = [row["content"] for row in rows]
+        from .sentiment_analyzer import get_absa_analyzer, get_emotion_classifier, get_sentiment_analyzer
+        sentiments = get_sentiment_analyzer().analyze_batch(texts, batch_size=self.batch_size)
+        aspects = get_absa_analyzer().analyze_batch(texts) if settings.ENABLE_ABSA else [{}] * len(rows)
+        emotions = (
+            get_emotion_classifier().analyze_batch(texts, sentiments)
+            if settings.ENABLE_EMOTION_CLASSIFICATION else [{}] * len(rows)
+        )
+
+        values = []
+        for row, sentiment, aspect, emotion in zip(rows, sentiments, aspects, emotions):
+            value = {
+                "movie_id": row["movie_id"],
+                "author_name": row["author_name"],
+                "content": row["content"],
+                "sentiment_score": sentiment["sentiment_score"],
+                "sentiment_label": sentiment["sentiment_label"],
+                "confidence": sentiment["confidence"],
+                "aspect_sentiments": aspect,
+                "emotions": emotion,
+            }
+            if "created_at" in row:
+                value["created_at"] = row["created_at"]
+            values.append(value)
+
+        # created_at 유무에 따라 INSERT 문이 달라지므로 나눠서 executemany
+        for group in (
+            [value for value in values if "created_at" in value],
+            [value for value in values if "created_at" not in value],
+        ):
+            if group:
+                self.db.execute(insert(Review), group)
+        self.db.commit()
+
+        self.inserted += len(values)
+        self.movie_ids.update(row["movie_id"] for row in rows)
+        self.authors.update(row["author_name"] for row in rows)
+        if self.on_chunk:
+            self.on_chunk(self.progress())
+
+    def progress(self) -> Dict:
+        seconds = time.time() - self.start
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "seconds": seconds,
+            "reviews_per_second": self.inserted / seconds if seconds > 0 else 0.0,
+        }
+
+    def finish(self) -> Dict:
+        """남은 입력 처리 + 영화별 평점 재집계 + 작성자 사용자 특징 갱신"""
+        if self._buffer.strip():
+            self.add_line(self._buffer)
+        self._buffer = b""
+        self.flush()
+
+        movies_updated = update_movie_ratings(self.db, self.movie_ids) if self.movie_ids else 0
+
+        if self.authors:
+            from .feature_store import get_feature_store
+            from .recommendation_cache import get_recommendation_cache
+            authors = list(self.authors)
+            user_ids = []
+            for start in range(0, len(authors), ID_CHUNK):
+                user_ids.extend(
+                    user_id for (user_id,) in self.db.query(User.id).filter(User.username.in_(authors[start:start + ID_CHUNK]))
+                )
+            if user_ids:
+                get_feature_store().refresh_users(user_ids)
+                cache = get_recommendation_cache()
+                for user_id in user_ids:
+                    cache.invalidate(user_id)
+
+        result = self.progress()
+        result["movies_updated"] = movies_updated
+        result["errors"] = sorted(self.errors, key=lambda error: error["line"])
+        return result
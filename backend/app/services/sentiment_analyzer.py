@@ -204,6 +204,18 @@ class SentimentAnalyzer:
         }
 
     
+    def analyze_batch(self, texts: List[str], batch_size: int = None) -> List[Dict]:
+        """
+        여러 리뷰 감성 분석 (대량 등록용)
+        
+        batch_size(기본 MAX_BATCH_SIZE)개씩 나눠 처리합니다.
+        """
+        batch_size = batch_size or settings.MAX_BATCH_SIZE
+        results = []
+        for start in range(0, len(texts), batch_size):
+            results.extend(self.analyze(text) for text in texts[start:start + batch_size])
+        return results
+    
     def _single_model_predict(self, text: str, model_name: str) -> Dict:
         """단일 모델 예측"""
         model = self.models.get(model_name)
@@ -363,6 +375,10 @@ class AspectBasedSentimentAnalyzer:
         
         return results
     
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """여러 리뷰의 Aspect별 감성 점수"""
+        return [self.analyze(text) for text in texts]
+    
     def _extract_aspect_sentences(self, text: str, keywords: List[str]) -> List[str]:
         """키워드 포함 문장 추출"""
         sentences = text.split('.')
@@ -417,6 +433,10 @@ class EmotionClassifier:
             results[emotion] = score
         
         return results
+    
+    def analyze_batch(self, texts: List[str], sentiment_results: List[Dict]) -> List[Dict[str, float]]:
+        """여러 리뷰 감정 분석"""
+        return [self.analyze(text, result) for text, result in zip(texts, sentiment_results)]
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,70 @@
+"""
+전체 사용자 오프라인 배치 추천 생성 스크립트
+
+GNN 영화 임베딩과 사용자 임베딩으로 모든 사용자의 Top-K 추천을 계산해
+backend/models/batch/part-*.parquet 에 저장합니다.
+
+실행 방법:
+python export_graph.py && python train_gnn.py   # 임베딩 준비
+python batch_recommend.py --workers 8 --top-k 100
+python batch_recommend.py --resume             # 중단된 작업 이어서
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)  # 상대 경로 설정(DATABASE_URL, MODEL_DIR)을 백엔드 기준으로
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.services.batch_recommender import BatchRecommendationJob
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 사용자 배치 추천 (Top-K → Parquet)")
+    parser.add_argument("--top-k", type=int, default=settings.BATCH_TOP_K)
+    parser.add_argument("--workers", type=int, default=settings.BATCH_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=settings.BATCH_USER_CHUNK_SIZE, help="청크당 사용자 수")
+    parser.add_argument("--block-size", type=int, default=settings.BATCH_ITEM_BLOCK_SIZE, help="점수 블록당 영화 수")
+    parser.add_argument("--output", default=None, help="저장 경로 (기본: BATCH_RECOMMENDATION_PATH)")
+    parser.add_argument("--include-seen", action="store_true", help="이미 상호작용한 영화도 추천에 포함")
+    parser.add_argument("--resume", action="store_true", help="이미 저장된 청크는 건너뜀")
+    args = parser.parse_args()
+
+    job = BatchRecommendationJob(
+        args.output,
+        top_k=args.top_k,
+        user_chunk_size=args.chunk_size,
+        item_block_size=args.block_size,
+        exclude_seen=not args.include_seen,
+    )
+
+    print("=" * 60)
+    print(f"📦 배치 추천 생성 (Top-{args.top_k}, 워커 {args.workers}개)")
+    print("=" * 60)
+
+    init_db()
+    db = SessionLocal()
+    try:
+        result = job.run(db, workers=args.workers, resume=args.resume)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print("\n✅ 완료")
+    print(f"  - 사용자: {result['users']:,}명 (임베딩 없음: {result['skipped']:,}명)")
+    print(f"  - 소요 시간: {result['seconds']:.2f}초")
+    print(f"  - 처리량: {result['users_per_sec']:,.0f} users/sec")
+    print(f"  - 저장 경로: {job.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
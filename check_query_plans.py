@@ -0,0 +1,296 @@
+"""
+쿼리 플랜 회귀 검사
+
+GET 라우트가 실제로 실행하는 SQL을 캡처해, 1k / 100k / 1M 행으로 채운 SQLite DB마다
+EXPLAIN QUERY PLAN과 실행 단계 수(SQLite VM 명령 수)를 확인합니다.
+핫 쿼리가 테이블 전체를 읽거나 핫 라우트가 200이 아니면 실패하고 종료 코드 1을 반환합니다 (CI용).
+
+전체 스캔 판정 (HOT_ROUTES, hot_service_queries만):
+- 플랜에 SCAN이 있는데 LIMIT로 끝나는 순서 스캔이 아님 (LIMIT 없음 또는 TEMP B-TREE 정렬)
+- 가장 작은 DB → 가장 큰 DB에서 실행 단계 수가 MAX_GROWTH배 넘게 증가 (데이터에 비례해 읽음)
+
+실행 방법:
+python check_query_plans.py
+python check_query_plans.py --sizes 1000 100000          # 1M 생략
+python check_query_plans.py --workdir ./.query_plans     # 시드 DB 재사용
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+
+launch_dir = Path.cwd()  # --workdir 상대 경로 기준
+os.chdir(backend_path)
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+MAX_GROWTH = 10.0  # 데이터가 100배 이상 커져도 실행 단계 수는 이 배수 이내여야 함
+PROGRESS_STEP = 10  # VM 명령 N개마다 한 번 카운트
+INSERT_CHUNK = 50_000
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Romance", "Horror", "Sci-Fi", "Animation"]
+
+# 목록/상세 화면과 추천 피드에서 매 요청 실행되는 라우트 (전체 스캔 금지)
+HOT_ROUTES = [
+    "/api/movies/?limit=20",
+    "/api/movies/1",
+    "/api/reviews/?limit=10",
+    "/api/reviews/?movie_id=1&limit=10",
+    "/api/reviews/1",
+    "/api/recommendations/trending?limit=10",
+    "/api/stats/movies/1",
+    "/api/stats/trends?movie_id=1",
+]
+
+# 부분 문자열 검색/전체 집계라 스캔이 불가피한 라우트 (플랜만 보고)
+REPORT_ROUTES = [
+    "/api/movies/?genre=Drama&limit=20",
+    "/api/movies/search/Movie 1",
+    "/api/recommendations/similar/1",
+    "/api/recommendations/by-genre/Drama",
+    "/api/stats/overview",
+    "/api/stats/movies?limit=100",
+    "/api/stats/trends",
+]
+
+
+def hot_service_queries():
+    """라우트 밖(서비스)에서 요청마다 실행되는 핫 쿼리 → {이름: 실행 함수(db)}"""
+    from app.config import settings
+    from app.models import Interaction, Rating
+
+    return {
+        # recommender: 사용자 최근 상호작용 (시퀀스 모델 prefill)
+        "recent_interactions(user_id=1)": lambda db: db.query(Interaction.id, Interaction.movie_id).filter(
+            Interaction.user_id == 1
+        ).order_by(Interaction.created_at.desc(), Interaction.id.desc()).limit(settings.SEQUENCE_LENGTH).all(),
+        # personalized-feed: 리뷰 많은 영화
+        "trending_ids": lambda db: db.query(Rating.movie_id).order_by(Rating.review_count.desc()).limit(10).all(),
+    }
+
+
+def seed(path: Path, rows: int):
+    """rows개의 리뷰/상호작용 (영화 rows/20, 사용자 rows/100)"""
+    from sqlalchemy import create_engine, insert
+
+    from app.database import Base
+    from app.migrations import run_migrations
+    from app.models import Interaction, Movie, Rating, Review, User
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    rng = random.Random(42)
+    movie_count = max(rows // 20, 50)
+    user_count = max(rows // 100, 10)
+    now = datetime.utcnow()
+
+    def created_at():
+        return now - timedelta(seconds=rng.randint(0, 2 * 365 * 24 * 3600))
+
+    def insert_chunks(conn, model, total, make_row):
+        for start in range(0, total, INSERT_CHUNK):
+            conn.execute(insert(model.__table__), [make_row(i) for i in range(start, min(start + INSERT_CHUNK, total))])
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        insert_chunks(conn, Movie, movie_count, lambda i: {
+            "id": i + 1, "title": f"Movie {i + 1}", "director": f"Director {i % 500}",
+            "genre": GENRES[i % len(GENRES)], "release_date": "2020-01-01",
+            "poster_url": "", "description": "",
+        })
+        insert_chunks(conn, Rating, movie_count, lambda i: {
+            "movie_id": i + 1, "avg_sentiment": rng.uniform(-1, 1), "review_count": rng.randint(0, 40),
+        })
+        insert_chunks(conn, User, user_count, lambda i: {
+            "id": i + 1, "username": f"user{i + 1}", "email": f"user{i + 1}@example.com",
+        })
+        insert_chunks(conn, Review, rows, lambda i: {
+            "movie_id": rng.randint(1, movie_count), "author_name": f"user{rng.randint(1, user_count)}",
+            "content": "seed review", "sentiment_score": rng.uniform(-1, 1),
+            "sentiment_label": rng.choice(["positive", "negative", "neutral"]), "confidence": rng.random(),
+            "aspect_sentiments": {}, "emotions": {}, "created_at": created_at(),
+        })
+        insert_chunks(conn, Interaction, rows, lambda i: {
+            "user_id": rng.randint(1, user_count), "movie_id": rng.randint(1, movie_count),
+            "interaction_type": "view", "created_at": created_at(),
+        })
+        conn.commit()
+    engine.dispose()
+
+
+def prepare_databases(workdir: Path, sizes):
+    """크기별 시드 DB (이미 있으면 재사용)"""
+    paths = {}
+    for rows in sizes:
+        path = workdir / f"plans_{rows}.sqlite"
+        if not path.exists():
+            print(f"🌱 {rows:,}행 DB 생성 중...")
+            start = time.time()
+            seed(path, rows)
+            print(f"   ✅ {time.time() - start:.1f}초")
+        paths[rows] = path
+    return paths
+
+
+def capture_queries():
+    """라우트/서비스 쿼리를 실행하며 SQL 캡처 → ([(이름, 핫 여부, SQL, 파라미터)], 실패한 핫 라우트 목록)"""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from app.database import SessionLocal
+    from app.main import app
+
+    captured = []
+    current = {}
+    broken = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if current and not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((current["name"], current["hot"], statement, tuple(parameters or ())))
+
+    event.listen(Engine, "before_cursor_execute", on_execute)
+    try:
+        with TestClient(app, raise_server_exceptions=False) as client:
+            for routes, hot in ((HOT_ROUTES, True), (REPORT_ROUTES, False)):
+                for route in routes:
+                    current.update(name=route, hot=hot)
+                    response = client.get(route)
+                    if response.status_code != 200:
+                        print(f"   {'❌' if hot else '⚠️ '} {route}: HTTP {response.status_code}")
+                        if hot:
+                            broken.append(route)
+                    current.clear()
+
+        db = SessionLocal()
+        try:
+            for name, run in hot_service_queries().items():
+                current.update(name=name, hot=True)
+                run(db)
+                current.clear()
+        finally:
+            db.close()
+    finally:
+        event.remove(Engine, "before_cursor_execute", on_execute)
+
+    # 같은 라우트에서 같은 SQL은 한 번만
+    unique = {}
+    for name, hot, statement, parameters in captured:
+        unique.setdefault((name, statement, parameters), hot)
+    return [(name, hot, statement, parameters) for (name, statement, parameters), hot in unique.items()], broken
+
+
+def explain(conn: sqlite3.Connection, statement: str, parameters):
+    """(플랜 줄 목록, 실행 단계 수)"""
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+    steps = 0
+
+    def tick():
+        nonlocal steps
+        steps += PROGRESS_STEP
+        return 0
+
+    conn.set_progress_handler(tick, PROGRESS_STEP)
+    try:
+        conn.execute(statement, parameters).fetchall()
+    finally:
+        conn.set_progress_handler(None, PROGRESS_STEP)
+    return plan, steps
+
+
+def plan_problem(statement: str, plan) -> str:
+    """LIMIT로 끝나지 않는 SCAN이 있으면 설명 문자열"""
+    scans = [line for line in plan if line.startswith("SCAN ") and "CONSTANT ROW" not in line]
+    if not scans:
+        return ""
+    sorted_in_temp = any("TEMP B-TREE" in line for line in plan)
+    if " LIMIT " in statement.upper() and not sorted_in_temp:
+        return ""  # 인덱스/rowid 순서대로 읽다가 LIMIT에서 멈춤
+    return "full scan: " + "; ".join(scans) + ("; TEMP B-TREE" if sorted_in_temp else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="쿼리 플랜 회귀 검사 (EXPLAIN QUERY PLAN)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="시드 데이터 행 수")
+    parser.add_argument("--workdir", default=None, help="시드 DB 저장 위치 (기본: 임시 디렉터리)")
+    parser.add_argument("--verbose", action="store_true", help="통과한 쿼리의 플랜도 출력")
+    args = parser.parse_args()
+
+    sizes = sorted(set(args.sizes))
+    workdir = launch_dir / args.workdir if args.workdir else Path(tempfile.mkdtemp(prefix="query_plans_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    # 앱은 가장 작은 DB로 실행 (SQL 캡처용) - app 모듈 import 전에 설정
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / f'plans_{sizes[0]}.sqlite'}"
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("ENABLE_RECOMMENDATION_CACHE", "false")
+
+    print("=" * 60)
+    print("🔍 쿼리 플랜 회귀 검사")
+    print("=" * 60)
+    print(f"📁 {workdir}")
+
+    paths = prepare_databases(workdir, sizes)
+
+    print("\n📡 라우트 SQL 캡처 중...")
+    queries, broken = capture_queries()
+    print(f"   ✅ {len(queries)}개 쿼리")
+
+    connections = {rows: sqlite3.connect(str(path)) for rows, path in paths.items()}
+    failures = 0
+    try:
+        for name, hot, statement, parameters in queries:
+            results = {rows: explain(conn, statement, parameters) for rows, conn in connections.items()}
+            plan = results[sizes[-1]][0]
+            steps = {rows: result[1] for rows, result in results.items()}
+
+            problems = []
+            problem = plan_problem(statement, plan)
+            if problem:
+                problems.append(problem)
+            if len(sizes) > 1 and sizes[-1] >= sizes[0] * 100:
+                growth = steps[sizes[-1]] / max(steps[sizes[0]], PROGRESS_STEP)
+                if growth > MAX_GROWTH:
+                    problems.append(f"steps grow x{growth:,.0f} with data")
+
+            failed = hot and bool(problems)
+            failures += failed
+            mark = "❌" if failed else ("⚠️ " if problems else "✅")
+            step_text = " / ".join(f"{steps[rows]:,}" for rows in sizes)
+            print(f"\n{mark} {name}  [{'hot' if hot else 'report'}]  steps {step_text}")
+            if problems or args.verbose:
+                print(f"   {' '.join(statement.split())[:200]}")
+                for line in plan:
+                    print(f"     - {line}")
+                for problem in problems:
+                    print(f"   → {problem}")
+    finally:
+        for conn in connections.values():
+            conn.close()
+
+    print(f"\n{'=' * 60}")
+    if broken:
+        print(f"❌ 핫 라우트 {len(broken)}개가 200이 아님 (SQL 캡처 누락): {', '.join(broken)}")
+    if failures:
+        print(f"❌ 핫 쿼리 {failures}개가 전체 스캔")
+    elif not broken:
+        print("✅ 모든 핫 쿼리가 인덱스 사용")
+    print("=" * 60)
+    sys.exit(1 if failures or broken else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+GNN 그래프 export 스크립트
+
+GraphNode/GraphEdge 테이블을 CSR NumPy 배열로 변환하여
+backend/models/gnn/graph 에 저장합니다 (기본: 증분 빌드).
+
+실행 방법:
+python export_graph.py            # 새 노드/엣지만 반영
+python export_graph.py --rebuild  # 전체 재빌드
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)  # 상대 경로 설정(DATABASE_URL, MODEL_DIR)을 백엔드 기준으로
+
+from app.database import SessionLocal, init_db
+from app.services.graph_store import GraphExporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphNode/GraphEdge → CSR export")
+    parser.add_argument("--rebuild", action="store_true", help="기존 그래프를 무시하고 전체 재빌드")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="DB 스트리밍 청크 크기")
+    parser.add_argument("--output", default=None, help="저장 경로 (기본: GNN_MODEL_PATH/graph)")
+    args = parser.parse_args()
+
+    init_db()  # 테이블 생성 + 마이그레이션 (임베딩 BLOB 변환 등)
+
+    db = SessionLocal()
+    try:
+        start = time.time()
+        store = GraphExporter(args.output, chunk_size=args.chunk_size).export(db, rebuild=args.rebuild)
+        elapsed = time.time() - start
+    finally:
+        db.close()
+
+    print("=" * 60)
+    print("🕸️  그래프 export 완료")
+    print("=" * 60)
+    print(f"  - 노드: {store.num_nodes:,}개 ({', '.join(store.manifest['node_types']) or '-'})")
+    print(f"  - 엣지: {store.num_edges:,}개 (양방향)")
+    if store.manifest.get("dropped_edges"):
+        print(f"  - 버린 엣지: {store.manifest['dropped_edges']:,}개 (없는 노드를 가리킴)")
+    print(f"  - 특징 차원: {store.feature_dim}")
+    print(f"  - 저장 경로: {store.path}")
+    print(f"  - 소요 시간: {elapsed:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
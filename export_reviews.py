@@ -0,0 +1,60 @@
+"""
+리뷰/평점 Parquet export 스크립트
+
+reviews 테이블을 청크 단위로 스트리밍하여 backend/exports/reviews (year_month 파티션),
+ratings 테이블을 backend/exports/ratings/ratings.parquet 로 저장합니다.
+aspect_sentiments / emotions JSON은 struct 컬럼으로 변환됩니다.
+
+실행 방법:
+python export_reviews.py            # 새 리뷰만 추가 (증분)
+python export_reviews.py --rebuild  # 전체 재export
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)  # 상대 경로 설정(DATABASE_URL, REVIEW_EXPORT_PATH)을 백엔드 기준으로
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.services.review_export import ReviewExporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="reviews/ratings → Parquet export")
+    parser.add_argument("--rebuild", action="store_true", help="기존 export를 지우고 전체 재export")
+    parser.add_argument("--chunk-size", type=int, default=settings.REVIEW_EXPORT_CHUNK_SIZE, help="DB 스트리밍 청크 크기")
+    parser.add_argument("--output", default=None, help="저장 경로 (기본: REVIEW_EXPORT_PATH)")
+    args = parser.parse_args()
+
+    init_db()
+    exporter = ReviewExporter(args.output, chunk_size=args.chunk_size)
+
+    db = SessionLocal()
+    try:
+        result = exporter.export(db, rebuild=args.rebuild)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print("=" * 60)
+    print("📤 리뷰 export 완료")
+    print("=" * 60)
+    if result["drift"]:
+        print(f"  ⚠️  DB와 달라져 전체 재export: {result['drift']}")
+    print(f"  - 새 리뷰: {result['reviews']:,}개 (누적 {result['total_reviews']:,}개)")
+    print(f"  - 평점: {result['ratings']:,}개 영화")
+    print(f"  - 저장 경로: {exporter.output_dir.resolve()}")
+    print(f"  - 소요 시간: {result['seconds']:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -133,12 +133,15 @@ st.subheader("📊 시스템 통계")
 
 try:
     if backend_available:
-        movies = api.get_movies(limit=1000)
-        reviews = api.get_reviews(limit=1000)
+        overview = api.get_stats_overview(top=0)
     else:
         # 데모 데이터
-        movies = [{"id": i, "title": f"영화 {i}"} for i in range(1, 31)]
-        reviews = [{"id": i, "sentiment_score": 0.5 + (i % 10) * 0.05} for i in range(1, 301)]
+        overview = {"movie_count": 30, "review_count": 300, "avg_sentiment": 0.72, "positive_rate": 1.0}
+    
+    movie_count = overview.get("movie_count", 0)
+    review_count = overview.get("review_count", 0)
+    avg_sentiment = overview.get("avg_sentiment", 0)
+    rate = overview.get("positive_rate", 0) * 100
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -148,7 +151,7 @@ try:
             <h2 style="color: #667eea;">{}</h2>
             <p>등록된 영화</p>
         </div>
-        """.format(len(movies)), unsafe_allow_html=True)
+        """.format(movie_count), unsafe_allow_html=True)
     
     with col2:
         st.markdown("""
@@ -156,10 +159,9 @@ try:
             <h2 style="color: #764ba2;">{}</h2>
             <p>작성된 리뷰</p>
         </div>
-        """.format(len(reviews)), unsafe_allow_html=True)
+        """.format(review_count), unsafe_allow_html=True)
     
     with col3:
-        avg_sentiment = sum(r.get("sentiment_score", 0) for r in reviews) / len(reviews) if reviews else 0
         st.markdown("""
         <div class="metric-card">
             <h2 style="color: #f093fb;">{:.2f}</h2>
@@ -168,8 +170,6 @@ try:
         """.format(avg_sentiment), unsafe_allow_html=True)
     
     with col4:
-        positive_count = sum(1 for r in reviews if r.get("sentiment_score", 0) > 0)
-        rate = (positive_count / len(reviews) * 100) if reviews else 0
         st.markdown("""
         <div class="metric-card">
             <h2 style="color: #4facfe;">{:.1f}%</h2>
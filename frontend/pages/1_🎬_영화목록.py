@@ -114,14 +114,12 @@ with st.sidebar:
     st.subheader("📊 통계")
     
     try:
-        all_movies = api.get_movies(limit=1000)
-        all_reviews = api.get_reviews(limit=10000)
+        overview = api.get_stats_overview(top=0)
         
-        st.metric("등록된 영화", len(all_movies))
-        st.metric("전체 리뷰", len(all_reviews))
+        st.metric("등록된 영화", overview.get("movie_count", 0))
+        st.metric("전체 리뷰", overview.get("review_count", 0))
         
-        if all_reviews:
-            avg_sentiment = sum(r.get("sentiment_score", 0) for r in all_reviews) / len(all_reviews)
-            st.metric("평균 감성", f"{avg_sentiment:.2f}")
+        if overview.get("review_count"):
+            st.metric("평균 감성", f"{overview['avg_sentiment']:.2f}")
     except:
         pass
@@ -5,9 +5,11 @@
 import streamlit as st
 from utils.api_client import api
 from utils.visualizations import (
-    create_review_timeline,
+    create_trend_chart,
+    create_sentiment_histogram,
     create_movie_rating_distribution,
     create_aspect_radar_chart,
+    create_emotion_bar_chart,
     sentiment_to_emoji
 )
 import pandas as pd
@@ -16,9 +18,9 @@ st.set_page_config(page_title="분석 대시보드", page_icon="📊", layout="w
 
 st.title("📊 분석 대시보드")
 
-# 데이터 로딩
-movies = api.get_movies(limit=1000)
-all_reviews = api.get_reviews(limit=10000)
+# 데이터 로딩 (서버에서 집계된 요약만 가져옴)
+overview = api.get_stats_overview(top=10)
+movies = api.get_movie_stats_list(limit=1000)
 
 if not movies:
     st.warning("등록된 영화가 없습니다!")
@@ -30,26 +32,30 @@ st.subheader("🌐 전체 통계")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("등록된 영화", len(movies))
+    st.metric("등록된 영화", overview.get("movie_count", len(movies)))
 
 with col2:
-    st.metric("전체 리뷰", len(all_reviews))
+    st.metric("전체 리뷰", overview.get("review_count", 0))
 
 with col3:
-    if all_reviews:
-        avg_sentiment = sum(r.get("sentiment_score", 0) for r in all_reviews) / len(all_reviews)
-        st.metric("평균 감성", f"{avg_sentiment:.2f}")
+    if overview.get("review_count"):
+        st.metric("평균 감성", f"{overview['avg_sentiment']:.2f}")
     else:
         st.metric("평균 감성", "N/A")
 
 with col4:
-    if all_reviews:
-        positive_count = sum(1 for r in all_reviews if r.get("sentiment_score", 0) > 0)
-        rate = positive_count / len(all_reviews) * 100
-        st.metric("긍정 비율", f"{rate:.1f}%")
+    if overview.get("review_count"):
+        st.metric("긍정 비율", f"{overview['positive_rate'] * 100:.1f}%")
     else:
         st.metric("긍정 비율", "N/A")
 
+# 전체 추이
+bucket_labels = {"일별": "day", "주별": "week", "월별": "month"}
+bucket = st.radio("추이 단위", list(bucket_labels.keys()), index=1, horizontal=True)
+fig = create_trend_chart(api.get_trends(bucket=bucket_labels[bucket]), title="전체 리뷰 추이")
+if fig:
+    st.plotly_chart(fig, use_container_width=True)
+
 st.markdown("---")
 
 # 영화별 분석
@@ -57,13 +63,20 @@ st.subheader("🎬 영화별 분석")
 
 # 영화 선택
 movie_options = {f"{m['title']} ({m['review_count']}개 리뷰)": m['id'] for m in movies}
+movie_ids = list(movie_options.values())
+default_id = st.session_state.get("selected_movie_id")
 selected_movie_str = st.selectbox(
     "분석할 영화 선택",
-    options=list(movie_options.keys())
+    options=list(movie_options.keys()),
+    index=movie_ids.index(default_id) if default_id in movie_ids else 0
 )
 
 selected_movie_id = movie_options[selected_movie_str]
-selected_movie = next(m for m in movies if m['id'] == selected_movie_id)
+selected_movie = api.get_movie_stats(selected_movie_id)
+
+if not selected_movie:
+    st.error("영화 통계를 불러올 수 없습니다!")
+    st.stop()
 
 # 영화 정보
 col1, col2 = st.columns([1, 3])
@@ -77,8 +90,8 @@ with col1:
 
 with col2:
     st.subheader(selected_movie['title'])
-    st.markdown(f"**감독**: {selected_movie['director']}")
-    st.markdown(f"**장르**: {selected_movie['genre']}")
+    st.markdown(f"**감독**: {selected_movie.get('director') or 'Unknown'}")
+    st.markdown(f"**장르**: {selected_movie.get('genre') or 'Unknown'}")
     
     avg_rating = selected_movie.get('avg_rating', 0)
     review_count = selected_movie.get('review_count', 0)
@@ -89,14 +102,16 @@ with col2:
 st.markdown("---")
 
 # 해당 영화의 리뷰
-movie_reviews = api.get_reviews(movie_id=selected_movie_id, limit=1000)
-
-if not movie_reviews:
+if not review_count:
     st.info("이 영화에 대한 리뷰가 없습니다. 첫 리뷰를 작성해보세요!")
 else:
     # 시간대별 감성 변화
     st.subheader("📈 시간대별 감성 변화")
-    fig = create_review_timeline(movie_reviews)
+    fig = create_trend_chart(api.get_trends(bucket="day", movie_id=selected_movie_id))
+    if fig:
+        st.plotly_chart(fig, use_container_width=True)
+    
+    fig = create_sentiment_histogram(selected_movie.get("sentiment_histogram"))
     if fig:
         st.plotly_chart(fig, use_container_width=True)
     
@@ -104,18 +119,10 @@ else:
     st.markdown("---")
     st.subheader("🎯 Aspect 평균 분석")
     
-    # 모든 리뷰의 aspect 평균
-    all_aspects = {}
-    for review in movie_reviews:
-        if review.get('aspect_sentiments'):
-            for aspect, score in review['aspect_sentiments'].items():
-                if aspect not in all_aspects:
-                    all_aspects[aspect] = []
-                all_aspects[aspect].append(score)
+    # 리뷰 작성 시 갱신되는 Rating 테이블의 aspect 평균
+    avg_aspects = selected_movie.get("avg_aspects") or {}
     
-    if all_aspects:
-        avg_aspects = {k: sum(v)/len(v) for k, v in all_aspects.items()}
-        
+    if avg_aspects:
         col1, col2 = st.columns([1, 1])
         
         with col1:
@@ -143,11 +150,22 @@ else:
                 st.markdown(f"{aspect_kr}: {emoji}")
                 st.progress(normalized_score, text=f"{score:.2f}")
     
+    # 감정 분포 (감정 강도 0.5 초과 리뷰 비율)
+    emotion_distribution = selected_movie.get("emotion_distribution") or {}
+    if any(emotion_distribution.values()):
+        st.markdown("---")
+        st.subheader("😊 감정 분포")
+        fig = create_emotion_bar_chart({k: v / review_count for k, v in emotion_distribution.items()})
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+    
     # 최근 리뷰
     st.markdown("---")
     st.subheader("📝 최근 리뷰 (최대 10개)")
     
-    for review in movie_reviews[:10]:
+    movie_reviews = api.get_reviews(movie_id=selected_movie_id, limit=10)
+    
+    for review in movie_reviews:
         with st.expander(f"✍️ {review.get('author_name', 'Anonymous')} - {sentiment_to_emoji(review.get('sentiment_score', 0))}", expanded=False):
             col1, col2 = st.columns([2, 1])
             
@@ -172,8 +190,8 @@ else:
 st.markdown("---")
 st.subheader("🏆 영화 평점 순위")
 
-if movies:
-    fig = create_movie_rating_distribution(movies)
+if overview.get("top_movies"):
+    fig = create_movie_rating_distribution(overview["top_movies"])
     if fig:
         st.plotly_chart(fig, use_container_width=True)
 
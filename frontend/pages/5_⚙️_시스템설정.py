@@ -35,6 +35,7 @@ def save_settings(settings_data):
     try:
         response = requests.put(SETTINGS_API, json=settings_data, timeout=5)
         if response.status_code == 200:
+            api.invalidate("/config")
             return True
         else:
             st.error(f"설정 저장 실패: {response.status_code}")
@@ -49,6 +50,7 @@ def reset_settings():
     try:
         response = requests.post("http://localhost:8000/api/settings/config/reset", timeout=5)
         if response.status_code == 200:
+            api.invalidate("/config")
             return True
         else:
             st.error(f"설정 초기화 실패: {response.status_code}")
@@ -1,19 +1,137 @@
 """
 API 클라이언트 - 백엔드와 통신
+
+- requests.Session 연결 풀 (keep-alive) 재사용
+- GET 응답은 (경로, 파라미터) 키로 TTL + LRU 캐시 → Streamlit rerun마다 같은 데이터를 다시 받지 않음
+- TTL이 지난 항목은 ETag가 있으면 If-None-Match로 재검증 (304면 본문 없이 캐시 재사용)
+- 영화/리뷰를 쓰는 호출은 관련 경로의 캐시를 무효화
 """
 
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
 
 # API Base URL
 API_URL = "http://localhost:8000"
 
+# 캐시 설정
+CACHE_TTL = 30  # 초 (이후에는 ETag로 재검증)
+CACHE_MAX_ENTRIES = 256
+REQUEST_TIMEOUT = 30  # 초
+
+# 쓰기 작업별 무효화할 경로 접두사
+MOVIE_WRITE_PATHS = ("/api/movies", "/api/stats", "/api/recommendations")
+REVIEW_WRITE_PATHS = ("/api/reviews", "/api/movies", "/api/stats", "/api/recommendations")
+
+
+class ResponseCache:
+    """GET 응답 캐시 (TTL + LRU, 스레드 안전 - Streamlit 세션들이 공유)"""
+    
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[Any, Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+    
+    def get(self, key: Tuple) -> Optional[Tuple[Any, Optional[str], bool]]:
+        """(데이터, ETag, 신선 여부) 또는 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            data, etag, stored_at = entry
+            return data, etag, time.monotonic() - stored_at <= self.ttl
+    
+    def put(self, key: Tuple, data: Any, etag: Optional[str] = None):
+        with self._lock:
+            self._entries[key] = (data, etag, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, *prefixes: str):
+        """경로가 prefixes로 시작하는 항목 삭제 (인자가 없으면 전체)"""
+        with self._lock:
+            if not prefixes:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0].startswith(prefixes)]:
+                del self._entries[key]
+    
+    def info(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
 
 class APIClient:
     """FastAPI 백엔드와 통신하는 클라이언트"""
     
-    def __init__(self, base_url: str = API_URL):
+    def __init__(self, base_url: str = API_URL, cache_ttl: float = CACHE_TTL):
         self.base_url = base_url
+        self.cache = ResponseCache(ttl=cache_ttl)
+        
+        # 연결 풀 (Streamlit 세션 스레드들이 함께 사용)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def _get(self, path: str, params: Dict = None, cache: bool = True, timeout: float = REQUEST_TIMEOUT):
+        """
+        GET 요청 (캐시 적용)
+        
+        신선한 캐시가 있으면 요청하지 않고, 오래된 캐시는 ETag로 재검증합니다.
+        반환값은 복사본이라 호출 측에서 수정해도 캐시에 영향이 없습니다.
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        key = (path, tuple(sorted(params.items())))
+        cached = self.cache.get(key) if cache else None
+        
+        if cached and cached[2]:
+            self.cache.hits += 1
+            return copy.deepcopy(cached[0])
+        
+        headers = {"If-None-Match": cached[1]} if cached and cached[1] else {}
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=timeout)
+        
+        if response.status_code == 304 and cached:
+            self.cache.revalidated += 1
+            self.cache.put(key, cached[0], cached[1])
+            return copy.deepcopy(cached[0])
+        
+        response.raise_for_status()
+        data = response.json()
+        self.cache.misses += 1
+        if cache:
+            self.cache.put(key, data, response.headers.get("ETag"))
+        return copy.deepcopy(data) if cache else data
+    
+    def _send(self, method: str, path: str, invalidate: Tuple[str, ...] = (), **kwargs) -> requests.Response:
+        """쓰기 요청 (성공하면 관련 경로 캐시 무효화)"""
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        response.raise_for_status()
+        if invalidate:
+            self.cache.invalidate(*invalidate)
+        return response
+    
+    def invalidate(self, *prefixes: str):
+        """캐시 무효화 (다른 경로로 데이터를 바꾼 경우 호출)"""
+        self.cache.invalidate(*prefixes)
     
     # ========== Movies ==========
     
@@ -24,9 +142,7 @@ class APIClient:
             params["genre"] = genre
         
         try:
-            response = requests.get(f"{self.base_url}/api/movies", params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get("/api/movies/", params)
         except Exception as e:
             print(f"Error getting movies: {e}")
             return []
@@ -34,9 +150,7 @@ class APIClient:
     def get_movie(self, movie_id: int) -> Optional[Dict]:
         """특정 영화 조회"""
         try:
-            response = requests.get(f"{self.base_url}/api/movies/{movie_id}")
-            response.raise_for_status()
-            return response.json()
+            return self._get(f"/api/movies/{movie_id}")
         except Exception as e:
             print(f"Error getting movie: {e}")
             return None
@@ -44,18 +158,23 @@ class APIClient:
     def create_movie(self, movie_data: Dict) -> Optional[Dict]:
         """영화 등록"""
         try:
-            response = requests.post(f"{self.base_url}/api/movies", json=movie_data)
-            response.raise_for_status()
-            return response.json()
+            return self._send("POST", "/api/movies/", MOVIE_WRITE_PATHS, json=movie_data).json()
         except Exception as e:
             print(f"Error creating movie: {e}")
             return None
     
+    def create_movies_bulk(self, movies: List[Dict]) -> Optional[Dict]:
+        """영화 일괄 등록 → {"created", "duplicates", "results": [{"index", "title", "status", "id"}]}"""
+        try:
+            return self._send("POST", "/api/movies/bulk", MOVIE_WRITE_PATHS, json=movies).json()
+        except Exception as e:
+            print(f"Error creating movies: {e}")
+            return None
+    
     def delete_movie(self, movie_id: int) -> bool:
         """영화 삭제"""
         try:
-            response = requests.delete(f"{self.base_url}/api/movies/{movie_id}")
-            response.raise_for_status()
+            self._send("DELETE", f"/api/movies/{movie_id}", MOVIE_WRITE_PATHS + ("/api/reviews",))
             return True
         except Exception as e:
             print(f"Error deleting movie: {e}")
@@ -64,9 +183,7 @@ class APIClient:
     def search_movies(self, query: str) -> List[Dict]:
         """영화 검색"""
         try:
-            response = requests.get(f"{self.base_url}/api/movies/search/{query}")
-            response.raise_for_status()
-            return response.json()
+            return self._get(f"/api/movies/search/{query}")
         except Exception as e:
             print(f"Error searching movies: {e}")
             return []
@@ -80,9 +197,7 @@ class APIClient:
             params["movie_id"] = movie_id
         
         try:
-            response = requests.get(f"{self.base_url}/api/reviews", params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get("/api/reviews/", params)
         except Exception as e:
             print(f"Error getting reviews: {e}")
             return []
@@ -109,22 +224,27 @@ class APIClient:
             }
         """
         try:
-            response = requests.post(f"{self.base_url}/api/reviews", json=review_data)
-            response.raise_for_status()
-            return response.json()
+            return self._send("POST", "/api/reviews/", REVIEW_WRITE_PATHS, json=review_data).json()
         except Exception as e:
             print(f"Error creating review: {e}")
             return None
     
+    def create_reviews_bulk(self, reviews: List[Dict]) -> Optional[Dict]:
+        """리뷰 대량 등록 (NDJSON) → {"inserted", "failed", "reviews_per_second", "errors", ...}"""
+        try:
+            body = "\n".join(json.dumps(review, ensure_ascii=False) for review in reviews).encode("utf-8")
+            return self._send(
+                "POST", "/api/reviews/bulk", REVIEW_WRITE_PATHS,
+                data=body, headers={"Content-Type": "application/x-ndjson"}
+            ).json()
+        except Exception as e:
+            print(f"Error creating reviews: {e}")
+            return None
+    
     def analyze_text(self, text: str) -> Optional[Dict]:
         """텍스트 감성 분석 (리뷰 저장 없이)"""
         try:
-            response = requests.post(
-                f"{self.base_url}/api/reviews/analyze",
-                params={"text": text}
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._send("POST", "/api/reviews/analyze", params={"text": text}).json()
         except Exception as e:
             print(f"Error analyzing text: {e}")
             return None
@@ -137,7 +257,7 @@ class APIClient:
         num_recommendations: int = 10,
         context: Dict = None
     ) -> List[Dict]:
-        """개인화 추천"""
+        """개인화 추천 (컨텍스트마다 달라지므로 캐시하지 않음)"""
         data = {
             "user_id": user_id,
             "num_recommendations": num_recommendations,
@@ -145,9 +265,7 @@ class APIClient:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/api/recommendations", json=data)
-            response.raise_for_status()
-            return response.json()
+            return self._send("POST", "/api/recommendations/", json=data).json()
         except Exception as e:
             print(f"Error getting recommendations: {e}")
             return []
@@ -155,12 +273,7 @@ class APIClient:
     def get_similar_movies(self, movie_id: int, limit: int = 10) -> List[Dict]:
         """유사 영화 추천"""
         try:
-            response = requests.get(
-                f"{self.base_url}/api/recommendations/similar/{movie_id}",
-                params={"limit": limit}
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get(f"/api/recommendations/similar/{movie_id}", {"limit": limit})
         except Exception as e:
             print(f"Error getting similar movies: {e}")
             return []
@@ -168,12 +281,7 @@ class APIClient:
     def get_trending_movies(self, limit: int = 10) -> List[Dict]:
         """인기 영화"""
         try:
-            response = requests.get(
-                f"{self.base_url}/api/recommendations/trending",
-                params={"limit": limit}
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("/api/recommendations/trending", {"limit": limit})
         except Exception as e:
             print(f"Error getting trending movies: {e}")
             return []
@@ -181,21 +289,57 @@ class APIClient:
     def get_personalized_feed(self, user_id: int) -> Dict:
         """개인화 피드"""
         try:
-            response = requests.get(
-                f"{self.base_url}/api/recommendations/personalized-feed/{user_id}"
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get(f"/api/recommendations/personalized-feed/{user_id}")
         except Exception as e:
             print(f"Error getting personalized feed: {e}")
             return {"top_picks": [], "trending": [], "because_you_watched": []}
     
+    # ========== Stats ==========
+    
+    def get_stats_overview(self, top: int = 10) -> Dict:
+        """전체 요약 통계 (서버 집계)"""
+        try:
+            return self._get("/api/stats/overview", {"top": top})
+        except Exception as e:
+            print(f"Error getting stats overview: {e}")
+            return {}
+    
+    def get_movie_stats_list(self, skip: int = 0, limit: int = 1000) -> List[Dict]:
+        """영화별 평점/리뷰 수 목록 (id, title, avg_rating, review_count)"""
+        try:
+            return self._get("/api/stats/movies", {"skip": skip, "limit": limit})
+        except Exception as e:
+            print(f"Error getting movie stats list: {e}")
+            return []
+    
+    def get_movie_stats(self, movie_id: int, bins: int = 10) -> Optional[Dict]:
+        """영화별 상세 통계 (Aspect 평균, 감정 분포, 감성 히스토그램)"""
+        try:
+            return self._get(f"/api/stats/movies/{movie_id}", {"bins": bins})
+        except Exception as e:
+            print(f"Error getting movie stats: {e}")
+            return None
+    
+    def get_trends(self, bucket: str = "day", movie_id: int = None, days: int = None) -> List[Dict]:
+        """기간별 리뷰 수 / 평균 감성 추이"""
+        params = {"bucket": bucket}
+        if movie_id:
+            params["movie_id"] = movie_id
+        if days:
+            params["days"] = days
+        
+        try:
+            return self._get("/api/stats/trends", params)
+        except Exception as e:
+            print(f"Error getting trends: {e}")
+            return []
+    
     # ========== Health Check ==========
     
     def health_check(self) -> bool:
         """백엔드 연결 확인"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self.session.get(f"{self.base_url}/health", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -203,12 +347,14 @@ class APIClient:
     def get_config(self) -> Dict:
         """백엔드 설정 조회"""
         try:
-            response = requests.get(f"{self.base_url}/config")
-            response.raise_for_status()
-            return response.json()
+            return self._get("/config")
         except Exception as e:
             print(f"Error getting config: {e}")
             return {}
+    
+    def cache_info(self) -> Dict:
+        """캐시 통계 (entries, hits, misses, revalidated)"""
+        return self.cache.info()
 
 
 # 싱글톤 인스턴스
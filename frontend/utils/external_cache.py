@@ -0,0 +1,177 @@
+"""
+외부 영화 API(OMDb / TMDB) 응답 디스크 캐시
+
+- SQLite 파일 하나에 (네임스페이스, URL, 정규화된 파라미터) 키로 JSON 응답 저장
+  → Streamlit rerun / 앱 재시작 후에도 같은 검색은 네트워크 없이 응답
+- 정상 응답은 EXTERNAL_CACHE_TTL, "찾을 수 없음" 응답은 EXTERNAL_CACHE_NEGATIVE_TTL 동안 유지 (네거티브 캐시)
+- 네트워크 오류 시 만료된 항목이라도 있으면 그대로 사용
+- EXTERNAL_API_OFFLINE=1: 네트워크를 전혀 쓰지 않고 캐시에 있는 응답만 재생 (오프라인 데모/테스트)
+
+API 키(apikey, api_key)는 키와 파일에 저장하지 않습니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 캐시 설정 (환경 변수로 변경 가능)
+CACHE_PATH = os.getenv(
+    "EXTERNAL_CACHE_PATH",
+    str(Path(__file__).resolve().parent.parent / ".cache" / "external_api.sqlite")
+)
+CACHE_TTL = int(os.getenv("EXTERNAL_CACHE_TTL", 7 * 24 * 3600))  # 초
+NEGATIVE_TTL = int(os.getenv("EXTERNAL_CACHE_NEGATIVE_TTL", 24 * 3600))  # 초
+OFFLINE = os.getenv("EXTERNAL_API_OFFLINE", "").lower() in ("1", "true", "yes")
+
+# 캐시 키에서 제외할 파라미터
+SECRET_PARAMS = {"apikey", "api_key"}
+
+OK = "ok"
+NEGATIVE = "negative"
+
+
+class ExternalResponseCache:
+    """OMDb/TMDB 클라이언트가 공유하는 SQLite 응답 캐시"""
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        ttl: int = CACHE_TTL,
+        negative_ttl: int = NEGATIVE_TTL,
+        offline: bool = OFFLINE
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.offline = offline
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=8))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=8))
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 연결 (Streamlit 세션은 서로 다른 스레드에서 실행)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, namespace TEXT NOT NULL, status TEXT NOT NULL,"
+                " body TEXT, stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(namespace: str, url: str, params: Dict) -> str:
+        """대소문자/공백/파라미터 순서와 무관한 캐시 키"""
+        normalized = sorted(
+            (name, str(value).strip().lower())
+            for name, value in params.items()
+            if name not in SECRET_PARAMS and value not in (None, "")
+        )
+        raw = json.dumps([namespace, url, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """{"status", "data", "fresh"} 또는 None"""
+        row = self._connect().execute(
+            "SELECT status, body, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, body, expires_at = row
+        return {"status": status, "data": json.loads(body) if body else None, "fresh": time.time() < expires_at}
+
+    def store(self, key: str, namespace: str, status: str, data: Any):
+        now = time.time()
+        ttl = self.ttl if status == OK else self.negative_ttl
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, namespace, status, body, stored_at, expires_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, namespace, status, None if data is None else json.dumps(data, ensure_ascii=False), now, now + ttl)
+        )
+        conn.commit()
+
+    def fetch(
+        self,
+        namespace: str,
+        url: str,
+        params: Dict,
+        classify: Callable[[Any], Optional[str]] = lambda data: OK,
+        timeout: float = 5
+    ) -> Any:
+        """
+        캐시 우선 GET (JSON)
+
+        Args:
+            namespace: "omdb" / "tmdb"
+            classify: 응답 → OK / NEGATIVE("찾을 수 없음", 짧은 TTL) / None(저장 안 함 - 키 오류, 한도 초과 등)
+
+        Returns:
+            JSON 응답 (404는 None). 오프라인 모드에서 캐시에 없으면 None
+
+        Raises:
+            requests.exceptions.RequestException: 네트워크 오류이고 캐시에도 없을 때
+        """
+        key = self.make_key(namespace, url, params)
+        cached = self.lookup(key)
+
+        if cached and (cached["fresh"] or self.offline):
+            self.hits += 1
+            return cached["data"]
+        if self.offline:
+            self.misses += 1
+            return None
+
+        self.misses += 1
+        try:
+            response = self.session.get(url, params=params, timeout=timeout)
+            if response.status_code == 404:
+                self.store(key, namespace, NEGATIVE, None)
+                return None
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException:
+            if cached:
+                # 만료된 응답이라도 오류보다는 낫다
+                return cached["data"]
+            raise
+
+        status = classify(data)
+        if status == OK or (status == NEGATIVE and self.negative_ttl > 0):
+            self.store(key, namespace, status, data)
+        return data
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """캐시 삭제 (namespace 지정 시 해당 API만)"""
+        conn = self._connect()
+        if namespace:
+            cursor = conn.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+        else:
+            cursor = conn.execute("DELETE FROM responses")
+        conn.commit()
+        return cursor.rowcount
+
+    def info(self) -> Dict:
+        counts = dict(self._connect().execute(
+            "SELECT namespace, COUNT(*) FROM responses GROUP BY namespace"
+        ).fetchall())
+        return {"path": str(self.path), "entries": counts, "hits": self.hits, "misses": self.misses, "offline": self.offline}
+
+
+# 싱글톤 인스턴스 (OMDb/TMDB 클라이언트 공유)
+external_cache = ExternalResponseCache()
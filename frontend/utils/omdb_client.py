@@ -7,18 +7,38 @@ import requests
 from typing import Optional, List, Dict
 import os
 
+from .external_cache import NEGATIVE, OK, ExternalResponseCache, external_cache
+
+
+def _cache_status(data: Dict) -> Optional[str]:
+    """OMDb 응답 캐시 분류 (키 오류/한도 초과 등은 저장하지 않음)"""
+    if data.get("Response") == "True":
+        return OK
+    error = data.get("Error", "").lower()
+    if "not found" in error or "too many results" in error:
+        return NEGATIVE
+    return None
+
 
 class OMDbClient:
     """OMDb API 클라이언트"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ExternalResponseCache] = None):
         """
         Args:
             api_key: OMDb API 키 (없으면 환경 변수에서 읽기)
+            cache: 응답 디스크 캐시 (기본: TMDB 클라이언트와 공유하는 external_cache)
         """
         self.api_key = api_key or os.getenv("OMDB_API_KEY", "")
         self.base_url = "http://www.omdbapi.com"
-        self.enabled = bool(self.api_key)
+        self.cache = cache or external_cache
+        # 오프라인 재생 모드에서는 API 키 없이도 캐시된 응답 사용
+        self.enabled = bool(self.api_key) or self.cache.offline
+    
+    def _get(self, params: Dict) -> Dict:
+        """캐시 우선 요청"""
+        data = self.cache.fetch("omdb", self.base_url, params, classify=_cache_status)
+        return data or {"Response": "False", "Error": "캐시된 응답 없음 (오프라인 모드)"}
     
     def search_movie(self, query: str, year: Optional[str] = None) -> List[Dict]:
         """
@@ -44,10 +64,7 @@ class OMDbClient:
             if year:
                 params["y"] = year
             
-            response = requests.get(self.base_url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get(params)
             
             # OMDb는 Response: "True" 또는 "False"로 성공 여부 표시
             if data.get("Response") == "True":
@@ -81,10 +98,7 @@ class OMDbClient:
                 "plot": "full"  # 전체 줄거리
             }
             
-            response = requests.get(self.base_url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get(params)
             
             if data.get("Response") == "True":
                 return data
@@ -120,10 +134,7 @@ class OMDbClient:
             if year:
                 params["y"] = year
             
-            response = requests.get(self.base_url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get(params)
             
             if data.get("Response") == "True":
                 return data
@@ -7,19 +7,29 @@ import requests
 from typing import Optional, List, Dict
 import os
 
+from .external_cache import NEGATIVE, OK, ExternalResponseCache, external_cache
+
+
+def _search_cache_status(data: Dict) -> Optional[str]:
+    """검색 결과가 비어 있으면 네거티브 캐시"""
+    return OK if data.get("results") else NEGATIVE
+
 
 class TMDBClient:
     """TMDB API 클라이언트"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ExternalResponseCache] = None):
         """
         Args:
             api_key: TMDB API 키 (없으면 환경 변수에서 읽기)
+            cache: 응답 디스크 캐시 (기본: OMDb 클라이언트와 공유하는 external_cache)
         """
         self.api_key = api_key or os.getenv("TMDB_API_KEY", "")
         self.base_url = "https://api.themoviedb.org/3"
         self.image_base_url = "https://image.tmdb.org/t/p"
-        self.enabled = bool(self.api_key)
+        self.cache = cache or external_cache
+        # 오프라인 재생 모드에서는 API 키 없이도 캐시된 응답 사용
+        self.enabled = bool(self.api_key) or self.cache.offline
     
     def search_movie(self, query: str, language: str = "ko-KR") -> List[Dict]:
         """
@@ -44,10 +54,7 @@ class TMDBClient:
                 "page": 1
             }
             
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.cache.fetch("tmdb", url, params, classify=_search_cache_status) or {}
             results = data.get("results", [])[:10]  # 최대 10개
             
             return results
@@ -78,10 +85,8 @@ class TMDBClient:
                 "append_to_response": "credits"  # 감독 정보 포함
             }
             
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            return response.json()
+            # 존재하지 않는 ID(404)는 네거티브 캐시 후 None
+            return self.cache.fetch("tmdb", url, params)
             
         except requests.exceptions.RequestException as e:
             print(f"TMDB 영화 상세 정보 오류: {e}")
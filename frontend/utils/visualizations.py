@@ -184,6 +184,88 @@ def create_review_timeline(reviews: List[Dict]) -> go.Figure:
     return fig
 
 
+def create_trend_chart(trends: List[Dict], title: str = "기간별 감성 변화") -> go.Figure:
+    """
+    기간별 추이 (리뷰 수 막대 + 평균 감성 라인)
+    
+    Args:
+        trends: /api/stats/trends 응답 [{"period", "review_count", "avg_sentiment", ...}]
+    """
+    if not trends:
+        return None
+    
+    df = pd.DataFrame(trends)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=df['period'],
+        y=df['review_count'],
+        name='리뷰 수',
+        marker_color='lightsteelblue',
+        yaxis='y2',
+        opacity=0.6
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=df['period'],
+        y=df['avg_sentiment'],
+        mode='lines+markers',
+        name='평균 감성 점수',
+        line=dict(color='royalblue', width=2),
+        marker=dict(size=8)
+    ))
+    
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title="기간",
+        yaxis=dict(title="평균 감성 점수", range=[-1.1, 1.1]),
+        yaxis2=dict(title="리뷰 수", overlaying='y', side='right', showgrid=False),
+        height=400,
+        hovermode='x unified',
+        legend=dict(orientation="h", y=1.1)
+    )
+    
+    return fig
+
+
+def create_sentiment_histogram(histogram: List[Dict]) -> go.Figure:
+    """
+    감성 점수 분포
+    
+    Args:
+        histogram: [{"start": -1.0, "end": -0.8, "count": 3}, ...]
+    """
+    if not histogram or not any(b["count"] for b in histogram):
+        return None
+    
+    df = pd.DataFrame(histogram)
+    df["center"] = (df["start"] + df["end"]) / 2
+    
+    fig = px.bar(
+        df,
+        x="center",
+        y="count",
+        color="center",
+        color_continuous_scale="RdYlGn",
+        range_color=[-1, 1],
+        title="감성 점수 분포"
+    )
+    
+    fig.update_traces(width=float(df["end"].iloc[0] - df["start"].iloc[0]) * 0.9)
+    fig.update_layout(
+        xaxis_title="감성 점수",
+        yaxis_title="리뷰 수",
+        xaxis_range=[-1, 1],
+        coloraxis_showscale=False,
+        height=400
+    )
+    
+    return fig
+
+
 def create_movie_rating_distribution(movies: List[Dict]) -> go.Figure:
     """영화별 평점 분포"""
     if not movies:
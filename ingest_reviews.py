@@ -0,0 +1,81 @@
+"""
+리뷰 대량 등록 스크립트 (NDJSON)
+
+크롤링한 리뷰를 API 한 건씩 호출하지 않고 DB에 직접 적재합니다.
+POST /api/reviews/bulk 와 같은 로직(배치 분석, 청크 단위 트랜잭션, 영화별 평점 1회 갱신)을 사용합니다.
+
+입력 형식 (한 줄에 리뷰 하나):
+{"movie_id": 1, "author_name": "user1", "content": "정말 재미있어요", "created_at": "2024-05-01T12:00:00"}
+
+실행 방법:
+python ingest_reviews.py reviews.ndjson
+cat reviews.ndjson | python ingest_reviews.py -
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+
+launch_dir = Path.cwd()  # 입력 파일 상대 경로 기준
+os.chdir(backend_path)  # 상대 경로 설정(DATABASE_URL 등)을 백엔드 기준으로
+
+from app.database import SessionLocal, init_db
+from app.services.review_ingest import ReviewIngestor
+
+
+def print_progress(progress):
+    print(
+        f"  ✅ {progress['inserted']:,}개 저장 (실패 {progress['failed']:,}) "
+        f"- {progress['reviews_per_second']:,.0f} reviews/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NDJSON 리뷰 대량 등록")
+    parser.add_argument("input", help="NDJSON 파일 경로 (- 이면 표준 입력)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="트랜잭션당 리뷰 수 (기본: REVIEW_INGEST_CHUNK_SIZE)")
+    parser.add_argument("--batch-size", type=int, default=None, help="분석 배치 크기 (기본: MAX_BATCH_SIZE)")
+    parser.add_argument("--read-size", type=int, default=1 << 20, help="한 번에 읽을 바이트 수")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📝 리뷰 대량 등록")
+    print("=" * 60)
+
+    init_db()
+    db = SessionLocal()
+    stream = sys.stdin.buffer if args.input == "-" else open(launch_dir / args.input, "rb")
+    try:
+        ingestor = ReviewIngestor(db, chunk_size=args.chunk_size, batch_size=args.batch_size, on_chunk=print_progress)
+        while True:
+            block = stream.read(args.read_size)
+            if not block:
+                break
+            ingestor.feed(block)
+
+        print("\n📊 영화별 평점 재집계 중...")
+        result = ingestor.finish()
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        db.close()
+
+    print(f"\n{'=' * 60}")
+    print(f"✅ 저장: {result['inserted']:,}개 / 입력: {result['received']:,}개")
+    print(f"🎬 평점 갱신 영화: {result['movies_updated']:,}개")
+    print(f"⚡ 처리량: {result['reviews_per_second']:,.0f} reviews/s ({result['seconds']:.1f}초)")
+    if result["failed"]:
+        print(f"\n⚠️  건너뛴 줄 ({result['failed']:,}개):")
+        for error in result["errors"][:20]:
+            print(f"  - {error['line']}번째 줄: {error['error']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Feature Store materialize 스크립트
+
+사용자/영화 특징을 계산해 backend/models/features/*.parquet (offline)과
+online store(ONLINE_STORE_TYPE)에 저장합니다.
+
+실행 방법:
+python materialize_features.py
+python materialize_features.py --offline-only   # Parquet만 생성
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)  # 상대 경로 설정(DATABASE_URL, MODEL_DIR)을 백엔드 기준으로
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.services.feature_store import get_feature_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자/영화 특징 materialize (Parquet + online store)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="한 번에 계산할 엔티티 수")
+    parser.add_argument("--offline-only", action="store_true", help="online store에는 쓰지 않음")
+    args = parser.parse_args()
+
+    init_db()
+    store = get_feature_store()
+
+    print("=" * 60)
+    print(f"🧮 Feature materialize (online: {type(store.online).__name__})")
+    print("=" * 60)
+
+    db = SessionLocal()
+    try:
+        start = time.time()
+        counts = store.materialize(db, chunk_size=args.chunk_size, online=not args.offline_only)
+        elapsed = time.time() - start
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"  - 사용자: {counts['user']:,}명")
+    print(f"  - 영화: {counts['movie']:,}편")
+    print(f"  - 저장 경로: {store.offline_path}")
+    print(f"  - 소요 시간: {elapsed:.2f}초")
+    if not settings.ENABLE_FEATURE_STORE and not args.offline_only:
+        print("⚠️  ENABLE_FEATURE_STORE=False: online store가 프로세스 내 메모리라 API 서버와 공유되지 않습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+스키마/데이터 마이그레이션 실행 스크립트
+
+서버 시작(init_db) 때 자동으로 실행되는 마이그레이션을 따로 실행합니다.
+리뷰 수백만 건 같은 대용량 DB에서는 RUN_MIGRATIONS_ON_STARTUP=False로 두고
+서버를 띄운 채 이 스크립트로 백필하세요. 배치마다 커밋하고 체크포인트를 남기므로
+중단(Ctrl+C)해도 다시 실행하면 이어서 진행합니다.
+
+실행 방법:
+python migrate.py                           # 미적용 마이그레이션 실행
+python migrate.py --status                  # 적용 현황 + 백필 진행 상황
+python migrate.py --batch-size 5000 --pause-ms 50
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+
+os.chdir(backend_path)  # 상대 경로 설정(DATABASE_URL 등)을 백엔드 기준으로
+
+from app.config import settings
+from app.database import Base, engine
+from app.migrations import migration_status, run_migrations
+
+
+def print_status():
+    for migration in migration_status(engine):
+        applied_at = migration["applied_at"]
+        mark = "✅" if applied_at else "⏳"
+        print(f"  {mark} {migration['version']:03d} {migration['name']}"
+              + (f" ({applied_at:%Y-%m-%d %H:%M})" if applied_at else " - 미적용"))
+        for checkpoint in migration["checkpoints"]:
+            print(f"      └ {checkpoint['name']}: {checkpoint['rows_done']:,}행 (id {checkpoint['last_id']:,}까지)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마/데이터 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    parser.add_argument("--batch-size", type=int, default=None, help="백필 배치 크기 (기본: MIGRATION_BATCH_SIZE)")
+    parser.add_argument("--pause-ms", type=int, default=None, help="배치 사이 대기 (기본: MIGRATION_BATCH_PAUSE_MS)")
+    args = parser.parse_args()
+
+    if args.batch_size:
+        settings.MIGRATION_BATCH_SIZE = args.batch_size
+    if args.pause_ms is not None:
+        settings.MIGRATION_BATCH_PAUSE_MS = args.pause_ms
+
+    print("=" * 60)
+    print("🛠️  데이터베이스 마이그레이션")
+    print("=" * 60)
+    print(f"🗄️  {settings.DATABASE_URL}")
+
+    if args.status:
+        print_status()
+        print("=" * 60)
+        return
+
+    Base.metadata.create_all(bind=engine)
+    print(f"📦 배치 {settings.MIGRATION_BATCH_SIZE:,}행, 대기 {settings.MIGRATION_BATCH_PAUSE_MS}ms\n")
+    applied = run_migrations(engine)
+
+    print(f"\n{'=' * 60}")
+    print(f"✅ {len(applied)}개 적용" if applied else "✅ 적용할 마이그레이션 없음")
+    print_status()
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -88,33 +88,104 @@ if response_times:
     print(f"      최소: {min_response_time:.2f}ms")
     print(f"      최대: {max_response_time:.2f}ms")
 
-# 3. 동시 요청 테스트
-print(f"\n3️⃣  동시성 테스트 (10개 동시 요청)")
+# 3. 동시 요청 테스트 (읽기 전용 → 읽기 + 쓰기 혼합)
+CONCURRENT_WORKERS = 10
+READ_REQUESTS = 100
+WRITE_REQUESTS = 20
+SCALING_WORKERS = [1, 4, 16]  # 읽기 처리량이 동시 실행 수에 비례해 늘어나는지 (비동기 라우트 + 연결 풀)
+
+print(f"\n3️⃣  동시성 테스트 ({CONCURRENT_WORKERS}개 동시 실행, 읽기 {READ_REQUESTS}회 + 쓰기 {WRITE_REQUESTS}회)")
 print("-"*70)
 
 import concurrent.futures
+from sqlalchemy import text
+
+# 현재 SQLite 프로필 (database.py에서 연결 시 적용)
+db = SessionLocal()
+try:
+    if db.bind.dialect.name == "sqlite":
+        pragmas = {name: db.execute(text(f"PRAGMA {name}")).scalar() for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size")}
+        print(f"   🗄️  SQLite: journal_mode={pragmas['journal_mode']}, synchronous={pragmas['synchronous']}, "
+              f"busy_timeout={pragmas['busy_timeout']}ms, mmap={pragmas['mmap_size'] // 1024 // 1024}MB")
+finally:
+    db.close()
+
+READ_ENDPOINTS = ["/api/movies/", "/api/reviews/", "/api/stats/overview", "/api/movies/1"]
+write_movie_id = movies_with_ratings[0].id if movies_with_ratings else 1
+created_review_ids = []
 
 def make_request(i):
+    """i < WRITE_REQUESTS면 리뷰 작성, 나머지는 읽기 → (종류, ms, 상태 코드)"""
     start = time.time()
     try:
-        response = requests.get(f"{BASE_URL}/api/movies", timeout=10)
-        return (time.time() - start) * 1000, response.status_code
+        if i < WRITE_REQUESTS:
+            response = requests.post(f"{BASE_URL}/api/reviews/", json={
+                "movie_id": write_movie_id,
+                "author_name": "perf_test",
+                "content": f"성능 테스트 리뷰 {i} 재미있어요"
+            }, timeout=30)
+            if response.status_code == 201:
+                created_review_ids.append(response.json()["id"])
+            return "write", (time.time() - start) * 1000, response.status_code
+        endpoint = READ_ENDPOINTS[i % len(READ_ENDPOINTS)]
+        response = requests.get(f"{BASE_URL}{endpoint}", timeout=30)
+        return "read", (time.time() - start) * 1000, response.status_code
     except:
-        return 0, 0
+        return ("write" if i < WRITE_REQUESTS else "read"), 0, 0
 
-start = time.time()
-with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-    results = list(executor.map(make_request, range(10)))
-total_time = (time.time() - start) * 1000
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0
 
-successful = sum(1 for _, status in results if status == 200)
-times = [t for t, _ in results if t > 0]
+def run_phase(name, request_ids, workers=CONCURRENT_WORKERS):
+    start = time.time()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(make_request, request_ids))
+    total_time = (time.time() - start) * 1000
+    
+    print(f"\n   [{name}] 총 시간: {total_time:.2f}ms, 처리량: {len(results) * 1000 / total_time:.2f} req/s")
+    for kind, label in (("read", "읽기"), ("write", "쓰기")):
+        kind_results = [(t, code) for k, t, code in results if k == kind]
+        if not kind_results:
+            continue
+        ok = sum(1 for _, code in kind_results if code in (200, 201))
+        times = [t for t, code in kind_results if t > 0]
+        print(f"   {'✅' if ok == len(kind_results) else '❌'} {label}: {ok}/{len(kind_results)} 성공, "
+              f"p50 {percentile(times, 0.5):.2f}ms, p95 {percentile(times, 0.95):.2f}ms")
+    return results
+
+read_results = run_phase("읽기 전용", range(WRITE_REQUESTS, WRITE_REQUESTS + READ_REQUESTS))
+# 쓰기를 읽기 사이에 고르게 분산
+write_step = READ_REQUESTS / max(WRITE_REQUESTS, 1)
+mixed_order = sorted(
+    range(WRITE_REQUESTS + READ_REQUESTS),
+    key=lambda i: i * write_step if i < WRITE_REQUESTS else i - WRITE_REQUESTS + 0.5
+)
+mixed_results = run_phase("읽기 + 쓰기", mixed_order)
+
+# 동시 실행 수별 읽기 처리량 (요청이 직렬화되면 동시 실행 수를 늘려도 그대로)
+print(f"\n   📈 동시 실행 수별 읽기 처리량")
+scaling = []
+for workers in SCALING_WORKERS:
+    start = time.time()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(make_request, range(WRITE_REQUESTS, WRITE_REQUESTS + READ_REQUESTS)))
+    throughput = len(results) / (time.time() - start)
+    scaling.append(throughput)
+    ok = sum(1 for _, _, code in results if code == 200)
+    print(f"      {workers:>3}개: {throughput:8.2f} req/s (x{throughput / scaling[0]:.2f}), {ok}/{len(results)} 성공")
+
+# 테스트 리뷰 정리
+for review_id in created_review_ids:
+    try:
+        requests.delete(f"{BASE_URL}/api/reviews/{review_id}", timeout=10)
+    except:
+        pass
 
-print(f"   ✅ 성공: {successful}/10")
-print(f"   ⏱️  총 시간: {total_time:.2f}ms")
-if times:
-    print(f"   📊 평균 응답: {sum(times)/len(times):.2f}ms")
-    print(f"   📊 처리량: {10000/total_time:.2f} req/s")
+all_results = read_results + mixed_results
+concurrent_total = len(all_results)
+successful = sum(1 for _, _, code in all_results if code in (200, 201))
+success_rate = successful / concurrent_total if concurrent_total else 0
 
 # 4. 메모리 사용량 (추정)
 print(f"\n4️⃣  메모리 사용량 추정")
@@ -178,14 +249,14 @@ else:
 
 # 동시성 평가
 max_score += 20
-if successful == 10:
-    print(f"   ⭐⭐⭐ 동시성 처리: 우수 (10/10)")
+if success_rate == 1:
+    print(f"   ⭐⭐⭐ 동시성 처리: 우수 ({successful}/{concurrent_total})")
     total_score += 20
-elif successful >= 8:
-    print(f"   ⭐⭐ 동시성 처리: 양호 ({successful}/10)")
+elif success_rate >= 0.8:
+    print(f"   ⭐⭐ 동시성 처리: 양호 ({successful}/{concurrent_total})")
     total_score += 15
 else:
-    print(f"   ⭐ 동시성 처리: 보통 ({successful}/10)")
+    print(f"   ⭐ 동시성 처리: 보통 ({successful}/{concurrent_total})")
     total_score += 10
 
 # 데이터 규모 평가
@@ -240,8 +311,8 @@ if movie_count < 20:
 if review_count == 0:
     recommendations.append("• 리뷰 데이터가 없습니다. 테스트 리뷰 추가 권장")
 
-if successful < 10:
-    recommendations.append("• 동시 요청 처리에 문제가 있습니다. 서버 설정 확인 권장")
+if success_rate < 1:
+    recommendations.append("• 동시 요청 처리에 문제가 있습니다. 서버 설정 및 SQLite 프로필(SQLITE_WAL, SQLITE_BUSY_TIMEOUT_MS) 확인 권장")
 
 if recommendations:
     for rec in recommendations:
@@ -1,7 +1,20 @@
 """
 OMDb API를 사용하여 포스터가 있는 인기 영화 30개를 데이터베이스에 자동 등록
+
+--titles 파일을 주면 수천~수만 편도 동시 요청(비동기) + 배치 저장으로 가져옵니다.
+중단되어도 체크포인트(IMPORT_CHECKPOINT_PATH)부터 이어서 진행합니다.
+
+실행 방법:
+python populate_movies.py                                  # 기존 영화 삭제 후 인기 영화 30개
+python populate_movies.py --titles titles.txt --keep       # 목록 추가 (기존 데이터 유지, 이어하기)
+python populate_movies.py --source tmdb --titles titles.txt --keep
+python populate_movies.py --stub omdb_stub.jsonl --titles titles.txt --keep   # API 없이 로컬 테스트
+
+titles 파일: 한 줄에 "제목" 또는 "제목|연도", 또는 {"title", "year"} 객체의 JSON 배열/JSONL
 """
 
+import argparse
+import json
 import sys
 from pathlib import Path
 
@@ -10,14 +23,14 @@ project_root = Path(__file__).parent
 backend_path = project_root / "backend"
 sys.path.insert(0, str(backend_path))
 
+from app.config import settings
 from app.database import SessionLocal, Base, engine
 from app.models import Movie, Rating
-from datetime import datetime
-import requests
+from app.services.movie_importer import BulkMovieImporter, FileSource, OMDbSource, TMDBSource
 
 # OMDb API 설정
-OMDB_API_KEY = "d5c11b9c"
-OMDB_BASE_URL = "http://www.omdbapi.com"
+OMDB_API_KEY = settings.OMDB_API_KEY or "d5c11b9c"
+OMDB_BASE_URL = settings.OMDB_BASE_URL
 
 # 포스터가 확실히 있는 인기 영화 30개
 POPULAR_MOVIES = [
@@ -59,30 +72,6 @@ POPULAR_MOVIES = [
 ]
 
 
-def get_movie_from_omdb(title, year=None):
-    """OMDb API에서 영화 정보 가져오기"""
-    params = {
-        "apikey": OMDB_API_KEY,
-        "t": title,
-        "plot": "full"
-    }
-    
-    if year:
-        params["y"] = year
-    
-    try:
-        response = requests.get(OMDB_BASE_URL, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        
-        if data.get("Response") == "True":
-            return data
-        return None
-    except Exception as e:
-        print(f"API 오류: {e}")
-        return None
-
-
 def clear_existing_movies():
     """기존 영화 데이터 모두 삭제"""
     db = SessionLocal()
@@ -102,93 +91,76 @@ def clear_existing_movies():
         db.close()
 
 
-def populate_movies():
-    """영화 데이터 채우기"""
-    db = SessionLocal()
-    saved_count = 0
-    failed_movies = []
-    
-    try:
-        print(f"\n🎬 {len(POPULAR_MOVIES)}개 영화 정보를 OMDb에서 가져오는 중...\n")
-        
-        for idx, movie_info in enumerate(POPULAR_MOVIES, 1):
-            title = movie_info["title"]
-            year = movie_info.get("year")
-            
-            print(f"[{idx}/{len(POPULAR_MOVIES)}] {title} ({year})...", end=" ")
-            
-            try:
-                # OMDb에서 영화 정보 가져오기
-                omdb_data = get_movie_from_omdb(title, year)
-                
-                if not omdb_data:
-                    print("❌ 검색 실패")
-                    failed_movies.append(f"{title} ({year})")
-                    continue
-                
-                # 포스터 확인 - 포스터가 없으면 건너뛰기
-                poster_url = omdb_data.get("Poster", "")
-                if not poster_url or poster_url == "N/A":
-                    print("❌ 포스터 없음 - 건너뜀")
-                    failed_movies.append(f"{title} ({year}) - No Poster")
-                    continue
-                
-                # 개봉일 처리
-                released = omdb_data.get("Released", "N/A")
-                release_date_str = None
-                
-                if released != "N/A":
-                    try:
-                        release_date_str = datetime.strptime(released, "%d %b %Y").strftime("%Y-%m-%d")
-                    except:
-                        if year and year != "N/A":
-                            release_date_str = f"{year}-01-01"
-                
-                # 데이터베이스에 저장
-                movie = Movie(
-                    title=omdb_data.get("Title", title),
-                    release_date=release_date_str or f"{year}-01-01",
-                    director=omdb_data.get("Director", "N/A").replace("N/A", "감독 정보 없음"),
-                    genre=omdb_data.get("Genre", "N/A").replace("N/A", "장르 정보 없음"),
-                    poster_url=poster_url,  # 포스터 URL 확인됨
-                    description=omdb_data.get("Plot", "").replace("N/A", "")
-                )
-                
-                db.add(movie)
-                db.flush()  # ID 생성
-                
-                # Rating 레코드도 생성
-                rating = Rating(movie_id=movie.id)
-                db.add(rating)
-                
-                db.commit()
-                
-                saved_count += 1
-                print(f"✅ 저장 완료 (포스터: O)")
-                
-            except Exception as e:
-                print(f"❌ 오류: {e}")
-                failed_movies.append(f"{title} ({year})")
-                db.rollback()
-                continue
-        
-        print(f"\n{'='*60}")
-        print(f"✅ 총 {saved_count}개 영화 저장 완료 (모두 포스터 포함)!")
-        
-        if failed_movies:
-            print(f"\n⚠️  실패하거나 건너뛴 영화 ({len(failed_movies)}개):")
-            for movie in failed_movies:
-                print(f"  - {movie}")
-        
-        print(f"{'='*60}\n")
-        
-        return saved_count
-        
-    finally:
-        db.close()
+def load_titles(path):
+    """titles 파일 → [{"title", "year"}]"""
+    text = Path(path).read_text(encoding="utf-8")
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        return json.loads(text)
+    if stripped.startswith("{"):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
 
+    items = []
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        title, _, year = line.partition("|")
+        items.append({"title": title.strip(), "year": year.strip() or None})
+    return items
+
+
+def build_source(args):
+    if args.stub:
+        return FileSource(args.stub, latency=args.stub_latency)
+    if args.source == "tmdb":
+        if not settings.TMDB_API_KEY:
+            raise SystemExit("❌ TMDB_API_KEY가 설정되지 않았습니다.")
+        return TMDBSource(settings.TMDB_API_KEY)
+    return OMDbSource(OMDB_API_KEY, OMDB_BASE_URL)
+
+
+def populate_movies(items=None, source=None, resume=True, **options):
+    """영화 데이터 채우기 (동시 요청 + 배치 저장)"""
+    items = POPULAR_MOVIES if items is None else items
+    source = source or OMDbSource(OMDB_API_KEY, OMDB_BASE_URL)
+
+    print(f"\n🎬 {len(items)}개 영화 정보를 {source.name}에서 가져오는 중...\n")
+    importer = BulkMovieImporter(source, **options)
+    result = importer.run(items, resume=resume)
+
+    print(f"\n{'='*60}")
+    print(f"✅ 총 {result['inserted']}개 영화 저장 완료 (모두 포스터 포함)! ({result['seconds']:.1f}초)")
+    if result["skipped"]:
+        print(f"⏭️  이미 처리됨 (체크포인트/중복 입력): {result['skipped']}개")
+    if result["duplicates"]:
+        print(f"⏭️  이미 DB에 있는 영화: {result['duplicates']}개")
+    if result["not_found"] or result["no_poster"]:
+        print(f"⚠️  검색 실패: {result['not_found']}개, 포스터 없음: {result['no_poster']}개")
+    if importer.failures:
+        print(f"\n❌ 요청 실패 ({len(importer.failures)}개, 다시 실행하면 재시도):")
+        for failure in importer.failures[:20]:
+            print(f"  - {failure}")
+        if len(importer.failures) > 20:
+            print(f"  ... 외 {len(importer.failures) - 20}개")
+    print(f"{'='*60}\n")
+
+    return result["inserted"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OMDb/TMDB 영화 일괄 등록")
+    parser.add_argument("--titles", help="가져올 영화 목록 파일 (기본: 인기 영화 30개)")
+    parser.add_argument("--source", choices=["omdb", "tmdb"], default="omdb", help="영화 정보 API")
+    parser.add_argument("--stub", help="API 대신 사용할 OMDb 응답 JSON/JSONL 파일 (로컬 테스트)")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="스텁 요청당 지연 (초)")
+    parser.add_argument("--keep", action="store_true", help="기존 영화를 삭제하지 않고 추가 (체크포인트 이어하기)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    parser.add_argument("--concurrency", type=int, default=settings.IMPORT_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--rate", type=float, default=settings.IMPORT_RATE_LIMIT, help="초당 최대 요청 수 (0: 제한 없음)")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE, help="트랜잭션당 저장 항목 수")
+    parser.add_argument("--allow-no-poster", action="store_true", help="포스터 없는 영화도 저장")
+    args = parser.parse_args()
 
-if __name__ == "__main__":
     print("="*60)
     print("🎬 영화 데이터베이스 초기화 및 OMDb 데이터 로딩")
     print("="*60)
@@ -196,13 +168,27 @@ if __name__ == "__main__":
     # 데이터베이스 테이블 생성
     Base.metadata.create_all(bind=engine)
     
-    # 1. 기존 데이터 삭제
-    print("\n1️⃣  기존 영화 데이터 삭제 중...")
-    clear_existing_movies()
+    # 1. 기존 데이터 삭제 (삭제하면 체크포인트도 의미가 없으므로 처음부터)
+    resume = args.keep and not args.restart
+    if not args.keep:
+        print("\n1️⃣  기존 영화 데이터 삭제 중...")
+        clear_existing_movies()
     
     # 2. 새 데이터 가져오기
-    print("\n2️⃣  OMDb API에서 영화 데이터 가져오기...")
-    saved_count = populate_movies()
+    print(f"\n2️⃣  {'스텁 파일' if args.stub else args.source.upper() + ' API'}에서 영화 데이터 가져오기...")
+    saved_count = populate_movies(
+        load_titles(args.titles) if args.titles else None,
+        source=build_source(args),
+        resume=resume,
+        concurrency=args.concurrency,
+        rate_limit=args.rate,
+        batch_size=args.batch_size,
+        require_poster=not args.allow_no_poster,
+    )
     
     print(f"🎉 성공! {saved_count}개 영화가 포스터와 함께 등록되었습니다!")
     print("\n💡 Streamlit 앱을 새로고침하여 확인하세요!")
+
+
+if __name__ == "__main__":
+    main()
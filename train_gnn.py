@@ -0,0 +1,77 @@
+"""
+GraphSAGE 학습 및 노드 임베딩 생성 스크립트
+
+1. export_graph.py로 만든 CSR 그래프를 memory-map으로 로딩
+2. 이웃 샘플링(GNN_FANOUTS) mini-batch로 학습
+3. 레이어 단위 청크 추론으로 전체 노드 임베딩을
+   backend/models/gnn/embeddings.npy 에 저장 (추천 API가 사용)
+
+실행 방법:
+python export_graph.py
+python train_gnn.py --epochs 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 설정
+project_root = Path(__file__).parent
+backend_path = project_root / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)  # 상대 경로 설정(MODEL_DIR)을 백엔드 기준으로
+
+import torch
+
+from app.config import settings
+from app.services.graph_store import GraphStore
+from app.services.recommender import GraphSAGERecommender
+from app.services.gnn_pipeline import GNNTrainer, layerwise_inference, default_model_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphSAGE 이웃 샘플링 학습")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--lr", type=float, default=0.001)
+    parser.add_argument("--batch-size", type=int, default=settings.GNN_BATCH_SIZE)
+    parser.add_argument("--fanouts", type=int, nargs="+", default=settings.GNN_FANOUTS)
+    parser.add_argument("--chunk-size", type=int, default=settings.GNN_INFERENCE_CHUNK_SIZE)
+    parser.add_argument("--inference-only", action="store_true", help="저장된 가중치로 임베딩만 다시 계산")
+    args = parser.parse_args()
+
+    store = GraphStore.load()
+    if store is None:
+        print("❌ 그래프가 없습니다. 먼저 python export_graph.py 를 실행하세요.")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"🕸️  GraphSAGE 학습 (노드 {store.num_nodes:,}개, 엣지 {store.num_edges:,}개)")
+    print("=" * 60)
+
+    model = GraphSAGERecommender(
+        store.feature_dim, settings.GNN_HIDDEN_DIM, settings.GNN_HIDDEN_DIM, num_layers=len(args.fanouts)
+    )
+    model_file = Path(default_model_path())
+
+    if args.inference_only:
+        model.load_state_dict(torch.load(model_file, map_location="cpu"))
+    else:
+        trainer = GNNTrainer(model, store, fanouts=args.fanouts, batch_size=args.batch_size, lr=args.lr)
+        for epoch in range(1, args.epochs + 1):
+            start = time.time()
+            loss = trainer.train_epoch()
+            print(f"  Epoch {epoch}/{args.epochs} - loss: {loss:.4f} ({time.time() - start:.1f}초)")
+
+        model_file.parent.mkdir(parents=True, exist_ok=True)
+        torch.save(model.state_dict(), model_file)
+        print(f"\n💾 모델 저장: {model_file}")
+
+    start = time.time()
+    embeddings = layerwise_inference(model, store, chunk_size=args.chunk_size)
+    print(f"✅ 노드 임베딩 {embeddings.shape} 저장 완료 ({time.time() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()